@@ -0,0 +1,46 @@
+"""
+압축 FAISS 인덱스(param.index) 비교: recall@k / 쿼리 지연 시간 / 인덱스 크기.
+
+오프라인 HashingEmbedding으로 합성 코퍼스를 임베딩한 뒤, flat(정확한 검색) 대비
+각 압축 설정의 recall과 크기를 출력한다.
+
+    python benchmarks/bench_faiss_compression.py [num_docs]
+"""
+
+import sys
+
+import numpy as np
+
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.vector_store.index_report import compare_index_configs, format_report
+
+CONFIGS = {
+    "flat": None,
+    "sq_fp16": {"type": "sq_fp16"},
+    "sq8": {"type": "sq8"},
+    "pq48x8": {"type": "pq", "m": 48},
+    "pq24x8": {"type": "pq", "m": 24},
+    "ivf256_pq48": {"type": "ivf_pq", "nlist": 256, "m": 48, "nprobe": 16},
+}
+
+
+def make_corpus(num_docs: int, vocab_size: int = 5000, words_per_doc: int = 40):
+    rng = np.random.default_rng(0)
+    # Zipf 분포 단어로 실제 텍스트와 비슷한 토큰 빈도를 흉내낸다
+    words = rng.zipf(1.3, size=(num_docs, words_per_doc)) % vocab_size
+    return [" ".join(f"w{w}" for w in row) for row in words]
+
+
+def main(num_docs: int = 50_000, num_queries: int = 200):
+    embedding = HashingEmbedding(dimension=384, seed=0)
+    corpus = make_corpus(num_docs + num_queries)
+    vectors = embedding.embed_matrix(corpus[:num_docs])
+    queries = embedding.embed_matrix(corpus[num_docs:])
+
+    rows = compare_index_configs(vectors, queries, CONFIGS, k=10)
+    print(f"docs={num_docs}  queries={num_queries}  dim={vectors.shape[1]}")
+    print(format_report(rows))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
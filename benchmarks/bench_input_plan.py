@@ -0,0 +1,67 @@
+"""
+BaseNode.get_inputs 호출당 오버헤드 micro-benchmark.
+
+기존 방식(dict(state) 복사 + 매 호출마다 "src -> dest" 파싱 + 검증용 키 집합 재계산)과
+build() 시점에 컴파일한 InputPlan 방식을 비교한다.
+
+    python benchmarks/bench_input_plan.py
+"""
+
+import timeit
+
+from agentblock.base import BaseNode, InputPlan
+
+INPUT_KEYS = ["documents -> docs", "query", "top_k -> k"]
+
+
+def legacy_get_inputs(state, input_keys):
+    state_dict = dict(state)
+    inputs = dict()
+    for k in input_keys:
+        src_key, dest_key = BaseNode.parse_input_keys(k)
+        inputs[dest_key] = state_dict[src_key]
+
+    expected_keys = set()
+    for k in input_keys:
+        _, dest_key = BaseNode.parse_input_keys(k)
+        expected_keys.add(dest_key)
+    missing_keys = expected_keys - set(inputs.keys())
+    assert not missing_keys
+    return inputs
+
+
+def planned_get_inputs(state, plan):
+    inputs = plan.read(state)
+    missing_keys = plan.dest_keys - inputs.keys()
+    assert not missing_keys
+    return inputs
+
+
+def make_state(num_extra_keys: int, num_docs: int):
+    state = {f"key_{i}": i for i in range(num_extra_keys)}
+    state.update(
+        {"documents": [f"doc {i}" for i in range(num_docs)], "query": "q", "top_k": 5}
+    )
+    return state
+
+
+def main(number: int = 100_000):
+    plan = InputPlan.compile(INPUT_KEYS)
+    for num_extra_keys in (0, 50, 500):
+        state = make_state(num_extra_keys, num_docs=10_000)
+        assert legacy_get_inputs(state, INPUT_KEYS) == planned_get_inputs(state, plan)
+
+        legacy = timeit.timeit(
+            lambda: legacy_get_inputs(state, INPUT_KEYS), number=number
+        )
+        planned = timeit.timeit(lambda: planned_get_inputs(state, plan), number=number)
+        print(
+            f"state keys={len(state):4d}  "
+            f"legacy={legacy / number * 1e6:7.2f}us  "
+            f"planned={planned / number * 1e6:7.2f}us  "
+            f"speedup={legacy / planned:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
-from typing import Dict, Any
+import asyncio
+import inspect
+from typing import Dict, Any, Callable, FrozenSet, Iterable, Mapping, Tuple
+from dataclasses import dataclass
 
 
 from abc import ABC, abstractmethod
@@ -20,11 +23,47 @@ class BaseComponent(ABC):
         pass
 
 
+async def call_maybe_async(func: Callable, *args, **kwargs) -> Any:
+    """
+    async 함수는 이벤트 루프에서 바로 await하고,
+    동기(blocking) 함수는 스레드 풀로 넘겨 이벤트 루프를 막지 않는다.
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    result = await asyncio.to_thread(func, *args, **kwargs)
+    if inspect.isawaitable(result):
+        # 동기 함수가 coroutine을 반환하는 경우 (예: 래핑된 async 함수)
+        result = await result
+    return result
+
+
+@dataclass(frozen=True)
+class InputPlan:
+    """
+    input_keys("src -> dest" 문자열)를 미리 파싱해 둔 불변 매핑.
+    - mappings: (state에서 읽을 키, 노드 내부에서 사용할 키) 튜플
+    - dest_keys: 입력 검증에 사용할 내부 키 집합
+    """
+
+    mappings: Tuple[Tuple[str, str], ...]
+    dest_keys: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, input_keys: Iterable[str]) -> "InputPlan":
+        mappings = tuple(BaseNode.parse_input_keys(k) for k in input_keys or [])
+        return cls(mappings=mappings, dest_keys=frozenset(d for _, d in mappings))
+
+    def read(self, state: Mapping[str, Any]) -> Dict[str, Any]:
+        # state 전체를 복사하지 않고 필요한 키만 직접 읽는다
+        return {dest_key: state[src_key] for src_key, dest_key in self.mappings}
+
+
 class BaseNode(BaseComponent):
     def __init__(self, name: str):
         super().__init__(name)
         self.input_keys = []
         self.output_key = None
+        self._input_plan = None
 
     @staticmethod
     @abstractmethod
@@ -35,15 +74,35 @@ class BaseNode(BaseComponent):
     def build(self) -> callable:
         pass
 
+    def abuild(self) -> callable:
+        """
+        async 그래프(GraphBuilder.build(async_mode=True))용 node_fn을 반환.
+        기본 구현은 동기 node_fn을 스레드 풀에서 실행한다.
+        네이티브 async API가 있는 노드는 이 메서드를 오버라이드한다.
+        """
+        node_fn = self.build()
+
+        async def anode_fn(state: Dict[str, Any]) -> Dict[str, Any]:
+            return await asyncio.to_thread(node_fn, state)
+
+        return anode_fn
+
+    def compile_input_plan(self) -> InputPlan:
+        """
+        build() 시점에 한 번 호출하여 input_keys 파싱 결과를 고정한다.
+        """
+        self._input_plan = InputPlan.compile(self.input_keys)
+        return self._input_plan
+
+    @property
+    def input_plan(self) -> InputPlan:
+        if self._input_plan is None:
+            return self.compile_input_plan()
+        return self._input_plan
+
     def get_inputs(self, state):
-        state_dict = dict(state)
-
-        inputs = dict()
-        for k in self.input_keys:
-            src_key, dest_key = self.parse_input_keys(k)
-            # 내부적으로 반환된 internal_key를 사용하여 inputs에 값을 추가
-            inputs[dest_key] = state_dict[src_key]
-        return inputs
+        # 내부적으로 반환된 internal_key(dest)를 사용하여 inputs에 값을 추가
+        return self.input_plan.read(state)
 
     @staticmethod
     def parse_input_keys(input_key):
@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from agentblock.graph_builder import GraphBuilder
+
+
+@dataclass
+class BatchResult:
+    """
+    배치 실행 결과 한 건.
+    - index: 입력 iterable에서의 순번 (결과는 완료 순서로 나오므로 원래 순서 복원에 사용)
+    - output: 성공 시 그래프의 최종 state
+    - error: 실패 시 발생한 예외 (다른 입력의 실행에는 영향을 주지 않음)
+    """
+
+    index: int
+    input: Dict[str, Any]
+    output: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchRunner:
+    """
+    컴파일된 그래프 하나를 여러 입력 state에 대해 동시에 실행한다.
+
+    - 같은 그래프 객체를 사용하므로 references(embedding, vector_store 등)는 모든 입력이 공유한다.
+    - 동시에 실행되는 입력 수는 max_concurrency로 제한되고,
+      입력 iterable은 필요한 만큼만 읽는다(수만 건의 입력도 메모리에 한 번에 올리지 않음).
+    - 결과는 완료되는 대로 BatchResult로 스트리밍된다.
+
+    runner = BatchRunner.from_yaml("ingest.yaml", max_concurrency=16)
+    for res in runner.run({"file_path": p} for p in paths):
+        if not res.ok:
+            print(res.index, res.error)
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        max_concurrency: int = 8,
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        graph: GraphBuilder.build()로 컴파일된 그래프
+        max_concurrency: 동시에 실행할 최대 입력 수
+        config: graph.invoke / ainvoke에 그대로 전달할 RunnableConfig
+        """
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency는 1 이상이어야 합니다: {max_concurrency}"
+            )
+        self.graph = graph
+        self.max_concurrency = max_concurrency
+        self.config = config
+
+    @staticmethod
+    def from_yaml(
+        path: str, max_concurrency: int = 8, use_cache: bool = True, **builder_options
+    ) -> "BatchRunner":
+        """
+        YAML에서 그래프를 빌드해 BatchRunner를 만든다.
+        builder_options는 GraphBuilder 생성자 옵션(async_mode 등)과 동일.
+        """
+        graph = GraphBuilder(path, **builder_options).build(use_cache=use_cache)
+        return BatchRunner(graph, max_concurrency=max_concurrency)
+
+    def _invoke(self, index: int, state: Dict[str, Any]) -> BatchResult:
+        try:
+            output = self.graph.invoke(state, config=self.config)
+        except Exception as e:
+            return BatchResult(index=index, input=state, error=e)
+        return BatchResult(index=index, input=state, output=output)
+
+    async def _ainvoke(self, index: int, state: Dict[str, Any]) -> BatchResult:
+        try:
+            output = await self.graph.ainvoke(state, config=self.config)
+        except Exception as e:
+            return BatchResult(index=index, input=state, error=e)
+        return BatchResult(index=index, input=state, output=output)
+
+    def run(self, inputs: Iterable[Dict[str, Any]]) -> Iterator[BatchResult]:
+        """
+        스레드 풀에서 graph.invoke를 실행하고, 완료되는 순서대로 결과를 yield.
+        """
+        items = enumerate(inputs)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            pending = set()
+
+            def fill():
+                # 실행 중인 입력이 max_concurrency개가 되도록 다음 입력을 채워 넣는다
+                free = self.max_concurrency - len(pending)
+                for index, state in itertools.islice(items, free):
+                    pending.add(executor.submit(self._invoke, index, state))
+
+            try:
+                fill()
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    pending.difference_update(done)
+                    # yield 전에 채워야 소비자가 느려도 동시 실행 수가 유지된다
+                    fill()
+                    for future in done:
+                        yield future.result()
+            finally:
+                # 소비자가 중간에 멈춘 경우 아직 시작하지 않은 작업은 취소
+                for future in pending:
+                    future.cancel()
+
+    async def arun(
+        self, inputs: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+    ) -> AsyncIterator[BatchResult]:
+        """
+        run()의 async 버전. graph.ainvoke를 이벤트 루프에서 동시에 실행한다.
+        (GraphBuilder.build(async_mode=True)로 빌드한 그래프와 함께 사용하면 스레드 점유가 없다)
+        """
+        if hasattr(inputs, "__aiter__"):
+            items = _aenumerate(inputs)
+        else:
+            items = _aenumerate(_as_async_iter(inputs))
+
+        pending = set()
+        exhausted = False
+
+        async def fill():
+            nonlocal exhausted
+            while not exhausted and len(pending) < self.max_concurrency:
+                try:
+                    index, state = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(self._ainvoke(index, state)))
+
+        try:
+            await fill()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending.difference_update(done)
+                # yield 전에 채워야 소비자가 느려도 동시 실행 수가 유지된다
+                await fill()
+                for task in done:
+                    yield task.result()
+        finally:
+            # 소비자가 중간에 멈춘 경우 실행 중인 작업을 정리
+            for task in pending:
+                task.cancel()
+
+    def run_all(self, inputs: Iterable[Dict[str, Any]]) -> List[BatchResult]:
+        """모든 결과를 입력 순서대로 정렬해 반환"""
+        return sorted(self.run(inputs), key=lambda r: r.index)
+
+
+async def _as_async_iter(iterable: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in iterable:
+        yield item
+
+
+async def _aenumerate(aiterable: AsyncIterable[Any]) -> AsyncIterator[Any]:
+    index = 0
+    async for item in aiterable:
+        yield index, item
+        index += 1
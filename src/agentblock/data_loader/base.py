@@ -1,4 +1,5 @@
 import abc
+import asyncio
 from typing import Dict, Any, List
 from langchain.schema import Document
 from agentblock.data_loader.loader_registry import LOADER_IMPL_MAP
@@ -67,3 +68,10 @@ class GenericLoaderNode(AbstractDataLoaderNode):
             return self.invoke(state)
 
         return node_fn
+
+    def abuild(self):
+        # 로더 함수는 파일/네트워크 I/O를 하는 동기 함수이므로 스레드 풀에서 실행
+        async def node_fn(state: dict):
+            return await asyncio.to_thread(self.invoke, state)
+
+        return node_fn
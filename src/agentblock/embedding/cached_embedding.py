@@ -0,0 +1,293 @@
+import os
+import json
+import array
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# model identity 계산 시 제외할 param 키 (자격 증명은 벡터 값에 영향을 주지 않음)
+_SECRET_PARAM_MARKERS = ("key", "token", "secret", "password")
+
+# sqlite IN (...) 한 번에 조회할 최대 키 수 (SQLITE_MAX_VARIABLE_NUMBER 기본값 이하)
+_SQLITE_LOOKUP_CHUNK = 500
+
+
+def model_identity(provider: str, param: Optional[Dict[str, Any]] = None) -> str:
+    """
+    임베딩 모델을 식별하는 문자열. provider + (자격 증명을 제외한) param으로 결정된다.
+    모델이 바뀌면 identity가 바뀌므로 다른 모델의 벡터가 캐시에서 섞이지 않는다.
+    """
+    param = {
+        k: v
+        for k, v in (param or {}).items()
+        if not any(marker in k.lower() for marker in _SECRET_PARAM_MARKERS)
+    }
+    return f"{provider}:{json.dumps(param, sort_keys=True, ensure_ascii=False, default=str)}"
+
+
+class CachedEmbedding(Embeddings):
+    """
+    content-addressed 임베딩 캐시.
+    - key: sha256(model identity + 용도(document/query) + text)
+    - 1단계: 프로세스 메모리 LRU (memory_items개)
+    - 2단계: sqlite 파일 (backend="sqlite"인 경우, 프로세스 재시작 후에도 유지)
+    - 두 단계 모두 miss인 텍스트만 중복 제거 후 한 번의 배치 호출로 provider에 보낸다.
+
+    YAML 예시 (EmbeddingReference):
+      config:
+        provider: openai
+        param:
+          model: text-embedding-3-small
+        cache:
+          backend: sqlite
+          path: embedding_cache.sqlite
+          memory_items: 10000
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        model_id: str,
+        backend: str = "sqlite",
+        path: Optional[str] = None,
+        memory_items: int = 10000,
+        namespace: Optional[str] = None,
+    ):
+        if backend not in ("sqlite", "memory"):
+            raise ValueError(f"Unsupported embedding cache backend: {backend}")
+        if backend == "sqlite" and not path:
+            raise ValueError("sqlite embedding cache requires 'path'.")
+        if memory_items < 0:
+            raise ValueError(f"memory_items must be >= 0, got {memory_items}")
+
+        self.embedding = embedding
+        self.model_id = model_id
+        self.backend = backend
+        self.path = path
+        self.memory_items = memory_items
+        # 캐시 key에만 쓰는 identity (model_id는 벡터 스토어 메타데이터와 비교하는 모델 identity로 유지)
+        self.namespace = namespace
+
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if backend == "sqlite":
+            self._conn = self._open_sqlite(path)
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._provider_calls = 0
+
+    @staticmethod
+    def _open_sqlite(path: str) -> sqlite3.Connection:
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        # 여러 스레드(병렬 노드, BatchRunner)에서 호출되므로 직접 lock으로 보호
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    # ---------- key / 직렬화 ----------
+
+    def _key(self, kind: str, text: str) -> str:
+        h = hashlib.sha256()
+        h.update((self.namespace or self.model_id).encode("utf-8"))
+        h.update(b"\0")
+        h.update(kind.encode("utf-8"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _to_blob(vector: Sequence[float]) -> bytes:
+        # float64로 저장해 캐시 히트와 provider 호출 결과가 완전히 같도록 한다
+        return array.array("d", vector).tobytes()
+
+    @staticmethod
+    def _from_blob(blob: bytes) -> List[float]:
+        vector = array.array("d")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    # ---------- tier 조회/저장 ----------
+
+    def _memory_put(self, key: str, vector: List[float]) -> None:
+        if self.memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """메모리 -> 디스크 순으로 조회. 찾은 {key: vector} 반환 (디스크 히트는 메모리로 승격)"""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            disk_keys = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self._memory_hits += 1
+                else:
+                    disk_keys.append(key)
+
+            if self._conn is not None and disk_keys:
+                for i in range(0, len(disk_keys), _SQLITE_LOOKUP_CHUNK):
+                    chunk = disk_keys[i : i + _SQLITE_LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = self._from_blob(blob)
+                        found[key] = vector
+                        self._memory_put(key, vector)
+                        self._disk_hits += 1
+        return found
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._memory_put(key, vector)
+            if self._conn is not None and items:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, self._to_blob(vector)) for key, vector in items.items()],
+                )
+                self._conn.commit()
+
+    def _plan(self, texts: List[str], kind: str):
+        """
+        texts -> (위치별 key, 캐시에서 찾은 벡터, provider에 보낼 (key, text) 목록(중복 제거))
+        """
+        keys = [self._key(kind, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = self._lookup(unique_keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        with self._lock:
+            self._misses += len(missing)
+            if missing:
+                self._provider_calls += 1
+        return keys, found, missing
+
+    # ---------- Embeddings 인터페이스 ----------
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._plan(texts, "document")
+        if missing:
+            vectors = self.embedding.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        texts -> (len(texts), dimension) float32 행렬. embed_documents와 같은 캐시를 사용하며,
+        miss는 원본의 embed_matrix(없으면 embed_documents)로 한 번에 계산한다.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        keys, found, missing = self._plan(texts, "document")
+        if missing:
+            inner_matrix = getattr(self.embedding, "embed_matrix", None)
+            if callable(inner_matrix):
+                matrix = np.asarray(
+                    inner_matrix(list(missing.values())), dtype=np.float32
+                )
+            else:
+                matrix = np.asarray(
+                    self.embedding.embed_documents(list(missing.values())),
+                    dtype=np.float32,
+                )
+            self._store({key: row.tolist() for key, row in zip(missing, matrix)})
+            # miss는 계산된 float32 행을 그대로 사용 (리스트로 되돌리지 않음)
+            found.update(zip(missing, matrix))
+        return np.array([found[key] for key in keys], dtype=np.float32)
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._plan([text], "query")
+        if missing:
+            computed = {keys[0]: self.embedding.embed_query(text)}
+            self._store(computed)
+            found.update(computed)
+        return found[keys[0]]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._plan(texts, "document")
+        if missing:
+            vectors = await self.embedding.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._plan([text], "query")
+        if missing:
+            computed = {keys[0]: await self.embedding.aembed_query(text)}
+            self._store(computed)
+            found.update(computed)
+        return found[keys[0]]
+
+    # ---------- 통계 / 관리 ----------
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계. 중복 텍스트는 한 번만 집계된다.
+        hit_ratio = (memory_hits + disk_hits) / (memory_hits + disk_hits + misses)
+        """
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            disk_items = None
+            if self._conn is not None:
+                disk_items = self._conn.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+            return {
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "memory_hit_ratio": self._memory_hits / lookups if lookups else 0.0,
+                "provider_calls": self._provider_calls,
+                "memory_items": len(self._memory),
+                "disk_items": disk_items,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._memory_hits = self._disk_hits = self._misses = (
+                self._provider_calls
+            ) = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __getattr__(self, item):
+        # dimension 등 원본 임베딩 객체의 속성은 그대로 노출
+        if item.startswith("_") or item == "embedding":
+            raise AttributeError(item)
+        return getattr(self.embedding, item)
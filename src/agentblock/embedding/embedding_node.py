@@ -1,11 +1,50 @@
+import asyncio
 import inspect
-from typing import Dict, Any, List, TypedDict, Union, Optional, Tuple
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, TypedDict, Union, Optional, Tuple
+import numpy as np
 from langchain.schema import Document
 from langchain_core.embeddings import Embeddings
-from agentblock.function.base import FunctionNode  # FunctionNode 상속
+from agentblock.function.base import FunctionNode, FunctionResult  # FunctionNode 상속
+
+# 임베딩 벡터 출력: output_format에 따라 List[List[float]] 또는 float32 행렬
+Vectors = Union[List[List[float]], np.ndarray]
 
 
 class EmbeddingNode(FunctionNode):
+    """
+    Document 리스트를 임베딩하는 실행 노드.
+
+    config.param:
+      method: 호출할 reference 메서드 (embed_documents / embed_query 등)
+      batch_size: List[str] 메서드에 한 번에 보낼 텍스트 수 (기본: 전체를 한 번에)
+      max_concurrency: 동시에 실행할 호출 수 (기본 1)
+        - List[str] 메서드: batch_size 단위 배치들을 동시에 호출
+        - str 메서드: 문서별 호출을 동시에 수행
+      dedup: true이면 page_content가 같은 문서는 한 번만 임베딩하고
+        결과 벡터를 원래 위치 모두에 채워 넣는다 (기본 false)
+      output_format: 벡터 출력 형식 (기본 list)
+        - list: List[List[float]]
+        - numpy: (문서 수, 차원) 모양의 C-contiguous numpy.float32 행렬.
+          provider 응답을 호출 단위로 바로 float32로 변환하므로 boxed float 리스트가
+          전체 문서 분량으로 쌓이지 않는다. DataSaverNode는 이 행렬을 복사 없이 FAISS에 넣는다.
+          method가 embed_documents이고 reference에 embed_matrix가 있으면 (HashingEmbedding,
+          ProcessPoolEmbedding, CachedEmbedding) 동기 실행에서는 embed_matrix를 대신 호출해
+          리스트 변환 자체를 건너뛴다. async 실행은 aembed_documents를 그대로 사용한다.
+      stream_batch_size: 지정하면 스트리밍 모드로 동작한다.
+        입력으로 Document 리스트뿐 아니라 iterator / generator도 받을 수 있고,
+        출력은 (doc_batch, vector_batch) 튜플을 stream_batch_size개 문서 단위로 내보내는
+        generator가 된다. 임베딩은 generator를 소비하는 시점(DataSaverNode 등)에 배치별로 수행되므로
+        메모리 사용량은 전체 문서 수가 아니라 stream_batch_size에 비례한다.
+        (batch_size / max_concurrency / dedup은 스트림 배치 안에서 적용)
+      출력 순서는 항상 입력 문서 순서와 같다.
+
+    metadata_key (선택, 노드 최상위 키):
+      지정하면 임베딩 통계(num_texts, num_embedded, dedup_ratio)를 해당 state 키에 기록한다.
+      스트리밍 모드에서는 스트림이 소비되는 동안 같은 dict가 갱신된다.
+    """
+
     def __init__(
         self,
         name: str,
@@ -13,6 +52,12 @@ class EmbeddingNode(FunctionNode):
         reference: Embeddings,
         input_keys: list,
         output_key: str,
+        batch_size: Optional[int] = None,
+        max_concurrency: int = 1,
+        dedup: bool = False,
+        metadata_key: Optional[str] = None,
+        output_format: str = "list",
+        stream_batch_size: Optional[int] = None,
     ):
         super().__init__(name, input_keys, output_key)
         self.method = method
@@ -20,6 +65,22 @@ class EmbeddingNode(FunctionNode):
         self.input_keys = input_keys
         self.output_key = output_key
 
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency는 1 이상이어야 합니다: {max_concurrency}")
+        if stream_batch_size is not None and stream_batch_size < 1:
+            raise ValueError(f"stream_batch_size는 1 이상이어야 합니다: {stream_batch_size}")
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.stream_batch_size = stream_batch_size
+        if output_format not in ("list", "numpy"):
+            raise ValueError(f"지원하지 않는 output_format입니다: {output_format}")
+        self.dedup = dedup
+        self.output_format = output_format
+        self.metadata_key = metadata_key
+        self._signature = None  # build() 시점에 결정되는 호출 전략 (str / List[str] / int)
+
     @staticmethod
     def from_yaml(
         config: dict, base_dir: str, references_map: Dict[str, Any]
@@ -28,7 +89,8 @@ class EmbeddingNode(FunctionNode):
         output_key = config["output_key"]
 
         cfg = config["config"]
-        method = cfg["param"]["method"]
+        param = cfg["param"]
+        method = param["method"]
         reference_name = cfg["reference"]["embedding"]
         reference = references_map.get(reference_name)
 
@@ -44,6 +106,12 @@ class EmbeddingNode(FunctionNode):
             reference=reference,
             input_keys=input_keys,
             output_key=output_key,
+            batch_size=param.get("batch_size"),
+            max_concurrency=param.get("max_concurrency", 1),
+            dedup=param.get("dedup", False),
+            metadata_key=config.get("metadata_key"),
+            output_format=param.get("output_format", "list"),
+            stream_batch_size=param.get("stream_batch_size"),
         )
 
     def parse_config(self, config: dict, base_dir: str = None):
@@ -72,6 +140,9 @@ class EmbeddingNode(FunctionNode):
             # 바운드되지 않은 경우, reference 객체에 바인딩
             self._func = method.__get__(self.reference, type(self.reference))
 
+        # async 모드용: embed_documents -> aembed_documents 처럼 "a" 접두사 메서드가 있으면 사용
+        self._afunc = getattr(self.reference, f"a{self.method}", None)
+
     def _get_method_signature(self):
         """메서드의 실제 시그니처를 확인하여 입력 타입을 반환"""
         if not hasattr(self, '_func'):
@@ -115,28 +186,200 @@ class EmbeddingNode(FunctionNode):
             
         raise ValueError(f"지원하지 않는 파라미터 타입입니다: {param_type}")
 
-    def call_target_function(self, inputs: Dict[str, List[Document]]) -> Tuple[List[Document], List[List[float]]]:
+    def _prepare(self) -> None:
+        super()._prepare()
+        # inspect.signature 기반 호출 전략은 build() 시점에 한 번만 결정한다
+        self._signature = self._get_method_signature()
+
+    def _split_calls(self, texts: List[str]) -> List[Any]:
+        """
+        텍스트를 호출 단위로 나눈다.
+        - str 메서드: 텍스트 하나가 호출 하나
+        - List[str] 메서드: batch_size 단위 배치 (batch_size가 없으면 전체가 한 배치)
+        """
+        if self._signature == str:
+            return list(texts)
+        if not texts:
+            return []
+        size = self.batch_size or len(texts)
+        return [texts[i : i + size] for i in range(0, len(texts), size)]
+
+    def _convert_call(self, result: Any) -> Any:
+        # numpy 모드: 호출 하나의 결과를 바로 float32 배열로 변환해 boxed float를 오래 들고 있지 않는다
+        if self.output_format == "numpy":
+            return np.asarray(result, dtype=np.float32)
+        return result
+
+    def _matrix_func(self) -> Optional[Any]:
+        """numpy 모드의 embed_documents 호출을 대신할 reference.embed_matrix (없으면 None)"""
+        if self.output_format != "numpy" or self.method != "embed_documents":
+            return None
+        # 호출 시점에 찾는다 (lazy reference를 build() 단계에서 생성하지 않도록)
+        return getattr(self.reference, "embed_matrix", None)
+
+    def _call(self, arg: Any) -> Any:
+        matrix_func = self._matrix_func()
+        if matrix_func is not None:
+            return np.ascontiguousarray(matrix_func(arg), dtype=np.float32)
+        return self._convert_call(self._func(arg))
+
+    def _merge_calls(self, results: List[Any]) -> Vectors:
+        if self.output_format == "numpy":
+            if not results:
+                return np.empty((0, 0), dtype=np.float32)
+            if self._signature == str:
+                return np.ascontiguousarray(np.stack(results))
+            if len(results) == 1:
+                return np.ascontiguousarray(results[0])
+            return np.concatenate(results)
+        if self._signature == str:
+            return list(results)
+        vectors = []
+        for batch_vectors in results:
+            vectors.extend(batch_vectors)
+        return vectors
+
+    def _embed_texts(self, texts: List[str]) -> Vectors:
+        """텍스트 리스트 -> 같은 순서의 벡터 리스트 (배치 / 동시 호출 적용)"""
+        if self._signature == int:
+            # method가 int를 처리하는 경우 (예: __init__)
+            # 이 경우에는 임베딩을 생성하지 않고 빈 리스트를 반환
+            return []
+        if self._signature not in (str, List[str]):
+            raise ValueError(f"지원하지 않는 메서드 시그니처입니다: {self._signature}")
+
+        calls = self._split_calls(texts)
+        if self.max_concurrency == 1 or len(calls) <= 1:
+            results = [self._call(arg) for arg in calls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(calls))) as executor:
+                # executor.map은 입력 순서대로 결과를 반환
+                results = list(executor.map(self._call, calls))
+        return self._merge_calls(results)
+
+    async def _aembed_texts(self, texts: List[str]) -> Vectors:
+        """_embed_texts의 async 버전. 동시 호출 수는 max_concurrency로 제한"""
+        if self._signature == int:
+            return []
+        if self._signature not in (str, List[str]):
+            raise ValueError(f"지원하지 않는 메서드 시그니처입니다: {self._signature}")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def call(arg):
+            async with semaphore:
+                return self._convert_call(await self._acall_method(arg))
+
+        results = await asyncio.gather(*(call(arg) for arg in self._split_calls(texts)))
+        return self._merge_calls(list(results))
+
+    @staticmethod
+    def _collect_documents(inputs: Dict[str, List[Document]]) -> List[Document]:
         # 문서 리스트 가져오기
         docs = list()
         for docs_each in inputs.values():
             docs.extend(docs_each)
+        return docs
 
-        method_signature = self._get_method_signature()
-        if method_signature == str:
-            # method가 단일 string을 처리하는 경우
-            embedding_vectors = [self._func(doc.page_content) for doc in docs]
-        elif method_signature == List[str]:
-            # method가 List[str]을 처리하는 경우
-            embedding_vectors = self._func([doc.page_content for doc in docs])
-        elif method_signature == int:
-            # method가 int를 처리하는 경우 (예: __init__)
-            # 이 경우에는 임베딩을 생성하지 않고 빈 리스트를 반환
-            embedding_vectors = []
-        else:
-            raise ValueError(f"지원하지 않는 메서드 시그니처입니다: {method_signature}")
-            
+    def _unique_texts(self, texts: List[str]) -> Tuple[List[str], Optional[List[int]]]:
+        """
+        dedup 옵션이 켜져 있으면 (중복 제거된 텍스트, 원래 위치 -> 고유 텍스트 인덱스)를 반환.
+        꺼져 있으면 (texts, None).
+        """
+        if not self.dedup:
+            return texts, None
+        index_of: Dict[str, int] = {}
+        positions = [index_of.setdefault(text, len(index_of)) for text in texts]
+        return list(index_of), positions
+
+    @staticmethod
+    def _scatter(vectors: Any, positions: Optional[List[int]]) -> Any:
+        # 고유 텍스트의 벡터를 원래 위치 모두에 채워 넣는다 (list 모드는 같은 벡터 객체를 공유)
+        if positions is None or len(vectors) == 0:
+            return vectors
+        if isinstance(vectors, np.ndarray):
+            return vectors[np.asarray(positions, dtype=np.intp)]
+        return [vectors[i] for i in positions]
+
+    def _metadata(self, num_texts: int, num_embedded: int) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "output_format": self.output_format,
+            "num_texts": num_texts,
+            "num_embedded": num_embedded,
+            # 중복 제거로 provider 호출에서 빠진 텍스트 비율
+            "dedup_ratio": 1 - num_embedded / num_texts if num_texts else 0.0,
+        }
+
+    def _make_result(
+        self, docs: List[Document], vectors: Vectors, num_embedded: int
+    ) -> FunctionResult[Tuple[List[Document], Vectors]]:
+        metadata = self._metadata(len(docs), num_embedded)
         # 튜플로 결과 반환 (docs와 embedding_vectors)
-        return (docs, embedding_vectors)
+        return FunctionResult(value=(docs, vectors), metadata=metadata)
+
+    @staticmethod
+    def _iter_documents(inputs: Dict[str, Iterable[Document]]) -> Iterator[Document]:
+        # 입력 값(리스트 또는 iterator)을 순서대로 이어서 하나씩 꺼낸다 (전체를 리스트로 만들지 않음)
+        for docs_each in inputs.values():
+            yield from docs_each
+
+    def _stream(
+        self, inputs: Dict[str, Iterable[Document]], metadata: Dict[str, Any]
+    ) -> Iterator[Tuple[List[Document], Vectors]]:
+        """stream_batch_size개 문서씩 임베딩해서 (doc_batch, vector_batch)를 내보낸다."""
+        documents = self._iter_documents(inputs)
+        num_texts = num_embedded = 0
+        while True:
+            doc_batch = list(itertools.islice(documents, self.stream_batch_size))
+            if not doc_batch:
+                return
+            texts, positions = self._unique_texts([doc.page_content for doc in doc_batch])
+            vectors = self._scatter(self._embed_texts(texts), positions)
+            num_texts += len(doc_batch)
+            num_embedded += len(texts)
+            metadata.update(self._metadata(num_texts, num_embedded))
+            yield doc_batch, vectors
+
+    def _make_stream_result(
+        self, inputs: Dict[str, Iterable[Document]]
+    ) -> FunctionResult[Iterator[Tuple[List[Document], Vectors]]]:
+        # metadata는 스트림이 소비될 때마다 갱신된다
+        metadata = self._metadata(0, 0)
+        return FunctionResult(value=self._stream(inputs, metadata), metadata=metadata)
+
+    def call_target_function(
+        self, inputs: Dict[str, List[Document]]
+    ) -> FunctionResult[Tuple[List[Document], Vectors]]:
+        if self.stream_batch_size:
+            return self._make_stream_result(inputs)
+        docs = self._collect_documents(inputs)
+        texts, positions = self._unique_texts([doc.page_content for doc in docs])
+        embedding_vectors = self._scatter(self._embed_texts(texts), positions)
+        return self._make_result(docs, embedding_vectors, len(texts))
+
+    async def _acall_method(self, arg: Any) -> Any:
+        if self._afunc is not None:
+            return await self._afunc(arg)
+        # async 버전이 없는 메서드는 스레드 풀에서 실행
+        return await asyncio.to_thread(self._func, arg)
+
+    async def acall_target_function(
+        self, inputs: Dict[str, List[Document]]
+    ) -> FunctionResult[Tuple[List[Document], Vectors]]:
+        if self.stream_batch_size:
+            # 스트림은 소비하는 쪽에서 배치별로 실행된다 (DataSaverNode는 스레드 풀에서 소비)
+            return self._make_stream_result(inputs)
+        docs = self._collect_documents(inputs)
+        texts, positions = self._unique_texts([doc.page_content for doc in docs])
+        embedding_vectors = self._scatter(await self._aembed_texts(texts), positions)
+        return self._make_result(docs, embedding_vectors, len(texts))
+
+    def _wrap_result(self, result: FunctionResult) -> Dict[str, Any]:
+        output = super()._wrap_result(result.value)
+        if self.metadata_key:
+            output[self.metadata_key] = result.metadata
+        return output
 
     def build(self):
         """
@@ -156,7 +399,26 @@ class EmbeddingNode(FunctionNode):
                 # 2) 함수 실행
                 result = self.call_target_function(inputs)
 
-                # 3) 결과를 dict로 변환 (FunctionResult 검증 건너뛰기)
+                # 3) 결과를 dict로 변환
+                return self._wrap_result(result)
+            except Exception as e:
+                raise RuntimeError(f"Error in node {self.name}: {str(e)}") from e
+
+        return node_fn
+
+    def abuild(self):
+        """
+        build()의 async 버전. reference의 aembed_* 메서드를 사용한다.
+        """
+        self._prepare()
+
+        async def node_fn(state: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                inputs = self.get_inputs(state)
+                self._validate_inputs(inputs)
+
+                result = await self.acall_target_function(inputs)
+
                 return self._wrap_result(result)
             except Exception as e:
                 raise RuntimeError(f"Error in node {self.name}: {str(e)}") from e
@@ -1,8 +1,11 @@
-from typing import Dict
+import os
+from typing import Dict, Optional
 
 from agentblock.base import BaseReference
-from agentblock.embedding.dummy_embedding import DummyEmbedding
-from langchain.embeddings import OpenAIEmbeddings, HuggingFaceEmbeddings
+from agentblock.embedding.cached_embedding import CachedEmbedding, model_identity
+from agentblock.embedding.process_pool_embedding import ProcessPoolEmbedding
+from agentblock.embedding.providers import create_embedding
+from agentblock.embedding.rate_limited_embedding import RateLimitedEmbedding
 
 
 class EmbeddingReference(BaseReference):
@@ -12,12 +15,44 @@ class EmbeddingReference(BaseReference):
     내부에도 저장(_embedding)에 보관할 수 있음.
     """
 
-    def __init__(self, name: str, provider: str, config: Dict = None):
+    # config.cache에 허용되는 키
+    CACHE_KEYS = {"backend", "path", "memory_items", "namespace"}
+
+    # config.process_pool에 허용되는 키
+    PROCESS_POOL_KEYS = {"workers", "batch_size", "start_method"}
+
+    # config.rate_limit에 허용되는 키
+    RATE_LIMIT_KEYS = {
+        "requests_per_minute",
+        "tokens_per_minute",
+        "max_batch_size",
+        "max_concurrency",
+        "max_retries",
+        "initial_backoff",
+        "max_backoff",
+    }
+
+    def __init__(
+        self,
+        name: str,
+        provider: str,
+        config: Dict = None,
+        base_dir: Optional[str] = None,
+    ):
         super().__init__(name)
         self.provider = provider  # 예: "openai", "huggingface"
         self.config = config
+        self.base_dir = base_dir  # cache.path 등 상대경로의 기준 디렉토리
         self._embedding = None  # build() 완료 후, langchain Embeddings 객체
 
+    @property
+    def model_id(self) -> str:
+        """
+        벡터 스토어 메타데이터에 기록되는 모델 identity (provider + param).
+        cache / rate_limit / process_pool / lazy 설정과 무관하게 같은 값이다.
+        """
+        return model_identity(self.provider, (self.config or {}).get("param", {}))
+
     @staticmethod
     def from_yaml(
         config: dict, base_dir: str, references_map: Dict[str, "BaseReference"]
@@ -30,6 +65,7 @@ class EmbeddingReference(BaseReference):
             name=ref_name,
             provider=provider,
             config=cfg,
+            base_dir=base_dir,
         )
 
     def build(self):
@@ -42,15 +78,97 @@ class EmbeddingReference(BaseReference):
             return self._embedding
 
         param_dict = self.config.get("param", {})
-        if self.provider == "openai":
-            # openai_api_key가 필요한 경우
-            self._embedding = OpenAIEmbeddings(**param_dict)
-        elif self.provider == "huggingface":
-            # 예: huggingface_hub_api_key, 또는 로컬 모델 경로 등
-            self._embedding = HuggingFaceEmbeddings(**param_dict)
-        elif self.provider == "dummy":
-            self._embedding = DummyEmbedding(**param_dict)
+        process_pool_cfg = self.config.get("process_pool")
+        if process_pool_cfg:
+            # 워커 프로세스마다 모델을 한 번씩 로드 (현재 프로세스에는 모델을 올리지 않음)
+            self._embedding = self._create_process_pool(param_dict, process_pool_cfg)
         else:
-            raise ValueError(f"Unsupported embedding provider: {self.provider}")
+            self._embedding = create_embedding(self.provider, param_dict)
+
+        # provider -> rate_limit -> cache 순서로 감싸 캐시 히트는 예산을 소모하지 않게 한다
+        rate_limit_cfg = self.config.get("rate_limit")
+        if rate_limit_cfg:
+            self._embedding = self._wrap_rate_limit(self._embedding, rate_limit_cfg)
+
+        cache_cfg = self.config.get("cache")
+        if cache_cfg:
+            self._embedding = self._wrap_cache(self._embedding, cache_cfg, param_dict)
 
+        # pydantic 기반 provider(OpenAIEmbeddings 등)는 선언되지 않은 필드 대입을 막으므로 직접 설정
+        object.__setattr__(self._embedding, "model_id", self.model_id)
         return self._embedding
+
+    def _wrap_cache(
+        self, embedding, cache_cfg: Dict, param_dict: Dict
+    ) -> CachedEmbedding:
+        """
+        config.cache 설정으로 임베딩 객체를 CachedEmbedding으로 감싼다.
+          cache:
+            backend: sqlite        # sqlite(기본) | memory
+            path: cache.sqlite     # backend=sqlite일 때 필수 (base_dir 기준 상대경로 허용)
+            memory_items: 10000    # 메모리 LRU 크기
+            namespace: my-model-v2 # (선택) 캐시 key용 identity 직접 지정
+        """
+        if not isinstance(cache_cfg, dict):
+            raise ValueError(f"Embedding '{self.name}': 'cache' must be a dict.")
+        unknown = set(cache_cfg) - self.CACHE_KEYS
+        if unknown:
+            raise ValueError(
+                f"Embedding '{self.name}': unsupported cache options {unknown}. "
+                f"Allowed: {sorted(self.CACHE_KEYS)}"
+            )
+
+        path = cache_cfg.get("path")
+        if path and self.base_dir and not os.path.isabs(path):
+            path = os.path.join(self.base_dir, path)
+
+        return CachedEmbedding(
+            embedding,
+            model_id=model_identity(self.provider, param_dict),
+            backend=cache_cfg.get("backend", "sqlite"),
+            path=path,
+            memory_items=cache_cfg.get("memory_items", 10000),
+            namespace=cache_cfg.get("namespace"),
+        )
+
+    def _create_process_pool(
+        self, param_dict: Dict, pool_cfg: Dict
+    ) -> ProcessPoolEmbedding:
+        """
+        config.process_pool 설정으로 여러 프로세스에서 모델을 실행하는 임베딩을 만든다.
+          process_pool:
+            workers: 8             # 워커 프로세스 수 (기본 os.cpu_count())
+            batch_size: 64         # 워커 하나가 한 번에 처리할 텍스트 수
+            start_method: spawn    # multiprocessing start method
+        """
+        if not isinstance(pool_cfg, dict):
+            raise ValueError(f"Embedding '{self.name}': 'process_pool' must be a dict.")
+        unknown = set(pool_cfg) - self.PROCESS_POOL_KEYS
+        if unknown:
+            raise ValueError(
+                f"Embedding '{self.name}': unsupported process_pool options {unknown}. "
+                f"Allowed: {sorted(self.PROCESS_POOL_KEYS)}"
+            )
+        return ProcessPoolEmbedding(self.provider, param_dict, **pool_cfg)
+
+    def _wrap_rate_limit(self, embedding, rate_limit_cfg: Dict) -> RateLimitedEmbedding:
+        """
+        config.rate_limit 설정으로 임베딩 객체를 RateLimitedEmbedding으로 감싼다.
+          rate_limit:
+            requests_per_minute: 3000
+            tokens_per_minute: 1000000
+            max_batch_size: 256    # 요청 하나에 담을 최대 텍스트 수
+            max_concurrency: 8     # 동시에 보낼 최대 요청 수
+            max_retries: 6         # 429/503 재시도 횟수
+            initial_backoff: 1.0   # 재시도 대기 시간 상한의 시작값(초), 매 재시도마다 2배
+            max_backoff: 60.0
+        """
+        if not isinstance(rate_limit_cfg, dict):
+            raise ValueError(f"Embedding '{self.name}': 'rate_limit' must be a dict.")
+        unknown = set(rate_limit_cfg) - self.RATE_LIMIT_KEYS
+        if unknown:
+            raise ValueError(
+                f"Embedding '{self.name}': unsupported rate_limit options {unknown}. "
+                f"Allowed: {sorted(self.RATE_LIMIT_KEYS)}"
+            )
+        return RateLimitedEmbedding(embedding, **rate_limit_cfg)
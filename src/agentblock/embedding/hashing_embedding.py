@@ -0,0 +1,160 @@
+import re
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# 해시 계산용 상수 (uint64 연산은 numpy에서 2^64로 wrap-around 된다)
+_HASH_BASE = np.uint64(1099511628211)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+# 투영 행렬에서 한 번에 gather할 최대 토큰 수 (임시 메모리 = 토큰 수 x dimension x 4 bytes)
+_TOKEN_CHUNK = 16384
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: 다항식 해시의 하위 비트 편향을 제거한다."""
+    h = h ^ (h >> np.uint64(30))
+    h = h * _MIX_1
+    h = h ^ (h >> np.uint64(27))
+    h = h * _MIX_2
+    return h ^ (h >> np.uint64(31))
+
+
+def hash_tokens(tokens: Sequence[str], seed: int = 0) -> np.ndarray:
+    """
+    토큰 리스트 -> uint64 해시 배열.
+    모든 토큰의 UTF-8 바이트를 이어 붙인 뒤 다항식 해시를 reduceat으로 한 번에 계산한다.
+    (Python hash()와 달리 프로세스 / 플랫폼에 관계없이 결정적)
+    """
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+
+    encoded = [t.encode("utf-8") for t in tokens]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(
+        np.uint64
+    ) + np.uint64(1)
+
+    starts = np.zeros(len(encoded), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    ends = starts + lengths
+
+    # 각 바이트의 "토큰 끝에서부터의 위치" -> base^pos 가중치
+    token_index = np.repeat(np.arange(len(encoded)), lengths)
+    pos_from_end = ends[token_index] - 1 - np.arange(len(data))
+    powers = np.empty(int(lengths.max()), dtype=np.uint64)
+    powers[0] = 1
+    if len(powers) > 1:
+        powers[1:] = _HASH_BASE
+        powers = np.cumprod(powers, dtype=np.uint64)
+
+    with np.errstate(over="ignore"):
+        hashes = np.add.reduceat(data * powers[pos_from_end], starts)
+        hashes = hashes + lengths.astype(np.uint64) * _GOLDEN + np.uint64(seed) * _MIX_2
+        return _mix64(hashes)
+
+
+class HashingEmbedding(Embeddings):
+    """
+    네트워크 없이 동작하는 결정적 임베딩 (부하 테스트 / 인덱스 벤치마크용).
+
+    1) 텍스트를 소문자 단어 토큰(ngram_range 범위의 단어 n-gram)으로 나눈다.
+    2) feature hashing: 토큰 해시 -> (n_features 중 bucket, ±1 부호)
+    3) seed로 고정된 Gaussian random projection (n_features x dimension)으로 투영 후 L2 정규화
+
+    같은 (seed, dimension, n_features, ngram_range)이면 항상 같은 벡터를 만들고,
+    토큰이 많이 겹치는 텍스트일수록 cosine 유사도가 높다.
+
+    YAML 예시 (EmbeddingReference):
+      config:
+        provider: hashing
+        param:
+          dimension: 384
+          seed: 42
+    """
+
+    def __init__(
+        self,
+        dimension: int = 256,
+        n_features: int = 2**14,
+        seed: int = 0,
+        ngram_range: Tuple[int, int] = (1, 1),
+        normalize: bool = True,
+    ):
+        min_n, max_n = ngram_range
+        if dimension < 1:
+            raise ValueError(f"dimension must be >= 1, got {dimension}")
+        if n_features < 1:
+            raise ValueError(f"n_features must be >= 1, got {n_features}")
+        if not 1 <= min_n <= max_n:
+            raise ValueError(f"Invalid ngram_range: {ngram_range}")
+
+        self.dimension = dimension
+        self.n_features = n_features
+        self.seed = seed
+        self.ngram_range = (min_n, max_n)
+        self.normalize = normalize
+
+        rng = np.random.default_rng(seed)
+        self._projection = rng.standard_normal(
+            (n_features, dimension), dtype=np.float32
+        )
+        self._projection /= np.float32(np.sqrt(dimension))
+
+    def _tokenize(self, text: str) -> List[str]:
+        words = _TOKEN_PATTERN.findall(text.lower())
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return words
+        tokens = words if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            tokens.extend(" ".join(words[i : i + n]) for i in range(len(words) - n + 1))
+        return tokens
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        texts -> (len(texts), dimension) float32 행렬.
+        EmbeddingNode에서 method: embed_matrix, output_format: numpy로 사용하면
+        Python float 리스트를 거치지 않는다.
+        """
+        token_lists = [self._tokenize(text) for text in texts]
+        counts = np.fromiter(
+            (len(t) for t in token_lists), dtype=np.int64, count=len(texts)
+        )
+        tokens = [token for token_list in token_lists for token in token_list]
+
+        out = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if tokens:
+            hashes = hash_tokens(tokens, self.seed)
+            buckets = (hashes % np.uint64(self.n_features)).astype(np.intp)
+            # 최상위 비트로 부호 결정 (bucket 충돌의 편향을 상쇄)
+            signs = np.where(hashes >> np.uint64(63), np.float32(-1), np.float32(1))
+            text_ids = np.repeat(np.arange(len(texts)), counts)
+
+            for start in range(0, len(tokens), _TOKEN_CHUNK):
+                stop = min(start + _TOKEN_CHUNK, len(tokens))
+                ids = text_ids[start:stop]
+                contrib = self._projection[buckets[start:stop]]
+                contrib *= signs[start:stop, None]
+                # text_ids는 정렬되어 있으므로 텍스트 경계마다 reduceat으로 합산
+                boundaries = np.flatnonzero(np.diff(ids)) + 1
+                segment_starts = np.concatenate(([0], boundaries))
+                out[ids[segment_starts]] += np.add.reduceat(
+                    contrib, segment_starts, axis=0
+                )
+
+        if self.normalize:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_matrix([text])[0].tolist()
@@ -0,0 +1,150 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from agentblock.embedding.cached_embedding import model_identity
+from agentblock.embedding.providers import create_embedding
+
+# 워커 프로세스마다 한 번 로드되는 임베딩 모델 (initializer에서 설정)
+_worker_embedding: Optional[Embeddings] = None
+
+
+def _init_worker(provider: str, param: Dict[str, Any]) -> None:
+    global _worker_embedding
+    _worker_embedding = create_embedding(provider, param)
+
+
+def _embed_shard(texts: List[str]) -> np.ndarray:
+    """워커에서 texts 한 묶음을 float32 행렬로 임베딩 (pickle 크기가 list[float]보다 작다)"""
+    embed_matrix = getattr(_worker_embedding, "embed_matrix", None)
+    if callable(embed_matrix):
+        vectors = embed_matrix(texts)
+    else:
+        vectors = _worker_embedding.embed_documents(texts)
+    return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+
+def _embed_query(text: str) -> List[float]:
+    return _worker_embedding.embed_query(text)
+
+
+def _worker_dimension() -> int:
+    # sentence-transformers 모델은 로드된 모델에서 차원을 바로 알 수 있다
+    client = getattr(_worker_embedding, "client", None)
+    get_dimension = getattr(client, "get_sentence_embedding_dimension", None)
+    if callable(get_dimension) and get_dimension():
+        return int(get_dimension())
+    dimension = getattr(_worker_embedding, "dimension", None)
+    if isinstance(dimension, int):
+        return dimension
+    return len(_worker_embedding.embed_query("dimension probe"))
+
+
+class ProcessPoolEmbedding(Embeddings):
+    """
+    로컬 모델(HuggingFace / sentence-transformers 등)을 여러 프로세스에서 실행하는 임베딩.
+
+    - 워커 프로세스마다 create_embedding(provider, param)으로 모델을 한 번만 로드한다.
+      (부모 프로세스에는 모델을 올리지 않음)
+    - texts를 batch_size개씩 나눠 워커에 분배하고, 결과 float32 블록을 입력 순서대로 이어 붙인다.
+    - CPU 추론은 GIL / 스레드 수 제한 때문에 스레드 풀보다 프로세스 풀이 코어를 더 잘 활용한다.
+    - 기본 start_method는 spawn (fork 후 torch 스레드 풀이 멈추는 문제를 피함)
+
+    YAML 예시 (EmbeddingReference):
+      config:
+        provider: huggingface
+        param:
+          model_name: sentence-transformers/all-MiniLM-L6-v2
+        process_pool:
+          workers: 4
+          batch_size: 64
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        param: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+        batch_size: int = 64,
+        start_method: str = "spawn",
+    ):
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if start_method not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Unsupported start_method: {start_method}")
+
+        self.provider = provider
+        self.param = dict(param or {})
+        self.workers = workers
+        self.batch_size = batch_size
+        self.start_method = start_method
+        # CachedEmbedding / 벡터 스토어 meta와 같은 identity (워커에 묻지 않아도 결정된다)
+        self.model_id = model_identity(provider, self.param)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dimension: Optional[int] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # 첫 호출 시점에 워커를 띄운다 (YAML 로드만으로 모델을 올리지 않도록)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.provider, self.param),
+            )
+        return self._executor
+
+    def _shards(self, texts: List[str]) -> List[List[str]]:
+        return [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """texts -> (len(texts), dimension) float32 행렬. 순서는 입력과 같다."""
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        # executor.map은 제출 순서대로 결과를 돌려준다
+        blocks = list(self._pool().map(_embed_shard, self._shards(list(texts))))
+        return np.vstack(blocks)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._pool().submit(_embed_query, text).result()
+
+    @property
+    def known_dimension(self) -> Optional[int]:
+        """워커를 띄우지 않고 알 수 있는 차원 (param.dimension 또는 이미 확인한 값, 없으면 None)"""
+        if self._dimension is None:
+            dimension = self.param.get("dimension")
+            if isinstance(dimension, int):
+                self._dimension = dimension
+        return self._dimension
+
+    @property
+    def dimension(self) -> int:
+        if self.known_dimension is None:
+            # 워커에 모델을 로드해서 확인한다
+            self._dimension = self._pool().submit(_worker_dimension).result()
+        return self._dimension
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __getstate__(self):
+        # executor는 pickle 할 수 없으므로 설정만 넘긴다
+        state = dict(self.__dict__)
+        state["_executor"] = None
+        return state
@@ -0,0 +1,28 @@
+from typing import Any, Dict
+
+from agentblock.embedding.dummy_embedding import DummyEmbedding
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from langchain.embeddings import OpenAIEmbeddings, HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+
+
+def create_embedding(provider: str, param: Dict[str, Any]) -> Embeddings:
+    """
+    provider 이름 + param으로 LangChain Embeddings 객체를 생성.
+    EmbeddingReference와 process pool 워커 프로세스가 같은 방식으로 모델을 만들 때 사용한다.
+    """
+    if provider == "openai":
+        # openai_api_key가 필요한 경우
+        return OpenAIEmbeddings(**param)
+    if provider == "huggingface":
+        # 예: huggingface_hub_api_key, 또는 로컬 모델 경로 등
+        return HuggingFaceEmbeddings(**param)
+    if provider == "dummy":
+        return DummyEmbedding(**param)
+    if provider == "hashing":
+        # 네트워크 없이 내용 기반 벡터를 만드는 벤치마크용 임베딩
+        param = dict(param)
+        if "ngram_range" in param:
+            param["ngram_range"] = tuple(param["ngram_range"])
+        return HashingEmbedding(**param)
+    raise ValueError(f"Unsupported embedding provider: {provider}")
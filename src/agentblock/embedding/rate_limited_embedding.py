@@ -0,0 +1,279 @@
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+# 재시도 대상 HTTP 상태 코드 (429 Too Many Requests, 503 Service Unavailable)
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """openai / httpx / urllib 예외에서 HTTP 상태 코드를 꺼낸다."""
+    for candidate in (error, getattr(error, "response", None)):
+        if candidate is None:
+            continue
+        for attr in ("status_code", "status", "code"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Retry-After 헤더(초)가 있으면 반환"""
+    for candidate in (error, getattr(error, "response", None)):
+        headers = getattr(candidate, "headers", None)
+        if headers is None:
+            continue
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def is_throttled(error: BaseException) -> bool:
+    if _status_code(error) in THROTTLE_STATUS_CODES:
+        return True
+    # 상태 코드를 노출하지 않는 클라이언트 (예: openai.RateLimitError 하위 클래스)
+    return "RateLimit" in type(error).__name__
+
+
+def approximate_tokens(text: str) -> int:
+    """tokenizer 없이 쓰는 토큰 수 근사치 (영문 기준 약 4글자 = 1토큰)"""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    분당 허용량(per_minute) token bucket.
+    - reserve(amount)는 lock 안에서 즉시 예약하고 기다려야 할 시간(초)을 반환한다.
+      (잔량이 음수가 될 수 있으므로 먼저 온 요청 순서대로 대기 시간이 늘어난다)
+    - 동기 호출은 time.sleep, async 호출은 asyncio.sleep으로 대기하므로 두 경로가 같은 예산을 공유한다.
+    - pause(seconds): 429 응답 시 모든 호출자가 함께 물러나도록 bucket을 일정 시간 비운다.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError(f"per_minute must be > 0, got {per_minute}")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # 초당 충전량
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        # 한 번에 capacity보다 큰 요청은 capacity만큼만 예약 (영원히 기다리지 않도록)
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return max(0.0, self._updated - now)
+            return (self._updated - now) + (-self._tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + seconds)
+
+
+class RateLimitedEmbedding(Embeddings):
+    """
+    분당 요청 수(RPM) / 분당 토큰 수(TPM) 예산 안에서 임베딩 배치를 동시에 호출하는 래퍼.
+
+    - 텍스트를 max_batch_size개 / TPM 이하 토큰 단위 배치로 나눠 max_concurrency개까지 동시에 호출
+      (async: aembed_documents + gather, 동기: 스레드 풀)
+    - 429/503 응답은 지수 backoff + full jitter로 재시도하고, Retry-After 헤더가 있으면 그 값을 따른다.
+      재시도 대기 동안 RPM bucket을 비워 다른 동시 요청도 함께 속도를 늦춘다.
+    - 결과 순서는 입력 순서와 같다.
+
+    YAML 예시 (EmbeddingReference):
+      config:
+        provider: openai
+        rate_limit:
+          requests_per_minute: 3000
+          tokens_per_minute: 1000000
+          max_batch_size: 256
+          max_concurrency: 8
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_batch_size: int = 256,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        token_counter: Callable[[str], int] = approximate_tokens,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+
+        self.embedding = embedding
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.token_counter = token_counter
+
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+
+    # ---------- 배치 / 예산 ----------
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        """max_batch_size와 TPM capacity를 넘지 않도록 텍스트를 순서대로 배치로 나눈다."""
+        token_limit = self.token_bucket.capacity if self.token_bucket else None
+        batches: List[List[str]] = []
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = self.token_counter(text)
+            if batch and (
+                len(batch) >= self.max_batch_size
+                or (token_limit is not None and batch_tokens + tokens > token_limit)
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _reserve(self, texts: List[str]) -> float:
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            tokens = sum(self.token_counter(text) for text in texts)
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        return wait
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        delay = _retry_after(error)
+        if delay is None:
+            # full jitter: [0, min(max_backoff, initial * 2^attempt)]
+            delay = random.uniform(
+                0, min(self.max_backoff, self.initial_backoff * (2**attempt))
+            )
+        if self.request_bucket is not None:
+            self.request_bucket.pause(delay)
+        with self._lock:
+            self._retries += 1
+        return delay
+
+    def _should_retry(self, attempt: int, error: BaseException) -> bool:
+        return attempt < self.max_retries and is_throttled(error)
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    # ---------- 배치 호출 ----------
+
+    def _embed_batch(self, texts: List[str], query: bool = False) -> List[List[float]]:
+        attempt = 0
+        while True:
+            time.sleep(self._reserve(texts))
+            self._count_request()
+            try:
+                if query:
+                    return [self.embedding.embed_query(texts[0])]
+                return self.embedding.embed_documents(texts)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                time.sleep(self._backoff(attempt, e))
+                attempt += 1
+
+    async def _aembed_batch(
+        self, texts: List[str], query: bool = False
+    ) -> List[List[float]]:
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._reserve(texts))
+            self._count_request()
+            try:
+                if query:
+                    return [await self.embedding.aembed_query(texts[0])]
+                return await self.embedding.aembed_documents(texts)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                await asyncio.sleep(self._backoff(attempt, e))
+                attempt += 1
+
+    # ---------- Embeddings 인터페이스 ----------
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        batches = self._batches(texts)
+        if self.max_concurrency == 1 or len(batches) <= 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(batches))
+            ) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text], query=True)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def call(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._aembed_batch(batch)
+
+        results = await asyncio.gather(*(call(batch) for batch in self._batches(texts)))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self._aembed_batch([text], query=True))[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self._requests, "retries": self._retries}
+
+    def __getattr__(self, item: str) -> Any:
+        # dimension 등 원본 임베딩 객체의 속성은 그대로 노출
+        if item.startswith("_") or item == "embedding":
+            raise AttributeError(item)
+        return getattr(self.embedding, item)
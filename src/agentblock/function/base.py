@@ -1,4 +1,5 @@
 # agentblock/function/function_node.py
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Union, Optional, TypeVar, Generic
 from dataclasses import dataclass
@@ -59,18 +60,20 @@ class FunctionNode(BaseNode, ABC, Generic[T]):
         """
         pass
 
+    async def acall_target_function(self, inputs: Dict[str, Any]) -> FunctionResult[T]:
+        """
+        async 모드에서의 함수 호출.
+        기본 구현은 call_target_function을 스레드 풀에서 실행한다.
+        """
+        return await asyncio.to_thread(self.call_target_function, inputs)
+
     def _validate_inputs(self, inputs: Dict[str, Any]) -> None:
         """입력값 검증"""
         if not self.validate_inputs:
             return
             
-        # 매핑된 키를 파싱하여 검증
-        expected_keys = set()
-        for k in self.input_keys:
-            _, dest_key = self.parse_input_keys(k)
-            expected_keys.add(dest_key)
-
-        missing_keys = expected_keys - set(inputs.keys())
+        # build() 시점에 미리 계산한 매핑 키 집합으로 검증
+        missing_keys = self.input_plan.dest_keys - inputs.keys()
         if missing_keys:
             raise ValueError(f"Missing required input keys: {missing_keys}")
 
@@ -110,12 +113,34 @@ class FunctionNode(BaseNode, ABC, Generic[T]):
 
         return node_fn
 
+    def abuild(self):
+        """
+        build()의 async 버전. 함수 호출은 acall_target_function으로 수행한다.
+        """
+        self._prepare()
+
+        async def node_fn(state: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                inputs = self.get_inputs(state)
+                self._validate_inputs(inputs)
+
+                result = await self.acall_target_function(inputs)
+                self._validate_output(result)
+
+                return self._wrap_result(result.value)
+            except Exception as e:
+                e.args = (f"Error in node {self.name}: {str(e)}",) + e.args[1:]
+                raise
+
+        return node_fn
+
     def _prepare(self) -> None:
         """
-        공통: parse_config + import_target_function
+        공통: parse_config + import_target_function + 입력 매핑 컴파일
         """
         self.parse_config(config={}, base_dir=None)
         self.import_target_function()
+        self.compile_input_plan()
 
     def _wrap_result(self, raw_result: Any) -> Dict[str, Any]:
         """
@@ -4,6 +4,7 @@ import importlib.util
 from typing import Any, Dict, List, Union, Optional
 from dataclasses import dataclass
 
+from agentblock.base import call_maybe_async
 from agentblock.function.base import FunctionNode, FunctionResult
 from agentblock.tools.load_config import get_abspath
 
@@ -61,20 +62,30 @@ class FunctionFromFileNode(FunctionNode[Dict[str, Any]]):
         """우리는 이미 __init__에서 가져왔으므로 여기선 pass."""
         pass
 
-    def import_target_function(self) -> None:
-        if not self.function_path:
-            raise ValueError("No function_path specified for FunctionFromFileNode")
-
+    @staticmethod
+    def resolve_function_path(function_path: str, base_dir: Optional[str]):
+        """
+        "module.py:function_name" 형식의 function_path를 (모듈 파일 절대경로, 함수명)으로 변환.
+        그래프 캐시(graph_cache)에서도 같은 규칙으로 의존 파일을 찾기 위해 분리.
+        """
         # parse "module.py:function_name"
-        if ":" not in self.function_path:
+        if ":" not in function_path:
             raise ValueError(
-                f"Invalid function_path '{self.function_path}'. Must be 'xxx:func'"
+                f"Invalid function_path '{function_path}'. Must be 'xxx:func'"
             )
 
-        mod_part, func_name = self.function_path.rsplit(":", 1)
-        mod_part = get_abspath(mod_part, self.base_dir).replace(".", "/")
+        mod_part, func_name = function_path.rsplit(":", 1)
+        mod_part = get_abspath(mod_part, base_dir).replace(".", "/")
         mod_part_fs = mod_part + ".py"
-        mod_file = os.path.abspath(mod_part_fs)
+        return os.path.abspath(mod_part_fs), func_name
+
+    def import_target_function(self) -> None:
+        if not self.function_path:
+            raise ValueError("No function_path specified for FunctionFromFileNode")
+
+        mod_file, func_name = self.resolve_function_path(
+            self.function_path, self.base_dir
+        )
 
         if not os.path.isfile(mod_file):
             raise FileNotFoundError(f"Cannot find file: {mod_file}")
@@ -95,17 +106,28 @@ class FunctionFromFileNode(FunctionNode[Dict[str, Any]]):
 
         self._loaded_func = func
 
-    def call_target_function(self, inputs: Dict[str, Any]) -> FunctionResult[Dict[str, Any]]:
+    def _final_inputs(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         # inputs + self.param => dict
         final_inputs = dict(inputs)
         final_inputs.update(self.param)
+        return final_inputs
 
-        result = self._loaded_func(**final_inputs)
-        
+    def _make_result(self, result: Any) -> FunctionResult[Dict[str, Any]]:
         # 메타데이터 추가
         metadata = {
             "function_path": self.function_path,
             "param": self.param,
         }
-        
+
         return FunctionResult(value=result, metadata=metadata)
+
+    def call_target_function(self, inputs: Dict[str, Any]) -> FunctionResult[Dict[str, Any]]:
+        result = self._loaded_func(**self._final_inputs(inputs))
+        return self._make_result(result)
+
+    async def acall_target_function(
+        self, inputs: Dict[str, Any]
+    ) -> FunctionResult[Dict[str, Any]]:
+        # async def 함수는 그대로 await, 동기 함수는 스레드 풀에서 실행
+        result = await call_maybe_async(self._loaded_func, **self._final_inputs(inputs))
+        return self._make_result(result)
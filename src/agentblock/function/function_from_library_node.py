@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Union, Optional
 import importlib
 import importlib.util
 
+from agentblock.base import call_maybe_async
 from agentblock.function.base import FunctionNode, FunctionResult
 
 
@@ -74,7 +75,7 @@ class FunctionFromLibraryNode(FunctionNode[Any]):
 
         self._func = target_func
 
-    def call_target_function(self, inputs: Dict[str, Any]) -> FunctionResult[Any]:
+    def _split_param_args(self, inputs: Dict[str, Any]):
         # input_keys + param(list[str]) => call _func
         extra_args = {}
         for p in self.param:
@@ -85,13 +86,27 @@ class FunctionFromLibraryNode(FunctionNode[Any]):
         for p in self.param:
             inputs.pop(p, None)
 
-        # now call
-        raw_result = self._func(**inputs, **extra_args)
-        
+        return inputs, extra_args
+
+    def _make_result(self, raw_result: Any) -> FunctionResult[Any]:
         # 메타데이터 추가
         metadata = {
             "from_library": self.from_library,
             "param": self.param,
         }
-        
+
         return FunctionResult(value=raw_result, metadata=metadata)
+
+    def call_target_function(self, inputs: Dict[str, Any]) -> FunctionResult[Any]:
+        inputs, extra_args = self._split_param_args(inputs)
+
+        # now call
+        raw_result = self._func(**inputs, **extra_args)
+        return self._make_result(raw_result)
+
+    async def acall_target_function(self, inputs: Dict[str, Any]) -> FunctionResult[Any]:
+        inputs, extra_args = self._split_param_args(inputs)
+
+        # async def 함수는 그대로 await, 동기 함수는 스레드 풀에서 실행
+        raw_result = await call_maybe_async(self._func, **inputs, **extra_args)
+        return self._make_result(raw_result)
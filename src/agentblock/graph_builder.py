@@ -1,22 +1,27 @@
 import os
-import yaml
-import tempfile
 
-from typing import TypedDict, Type, Set, Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, TypedDict, Type, Set, Any, Callable, Dict, List, Optional
 
 from langgraph.graph import StateGraph, START, END
 
+from agentblock.base import BaseNode
 from agentblock.llm.llm_node import LLMNode
 from agentblock.function.function_from_file_node import FunctionFromFileNode
 from agentblock.function.function_from_library_node import FunctionFromLibraryNode
 from agentblock.retriever.retriever_node import RetrieverNode
 from agentblock.data_loader.base import GenericLoaderNode
 from agentblock.vector_store.data_saver_node import DataSaverNode
+from agentblock.embedding.embedding_node import EmbeddingNode
 
 from agentblock.embedding.embedding_reference import EmbeddingReference
 from agentblock.vector_store.vector_store_reference import VectorStoreReference
-from agentblock.schema.tools import validate_yaml
-from agentblock.tools.load_config import load_config
+from agentblock.schema.tools import load_yaml, validate_yaml_data
+from agentblock.graph_cache import GRAPH_CACHE, CachedGraph
+from agentblock.lazy_reference import make_lazy_reference
+from agentblock.reference_registry import REFERENCE_REGISTRY, reference_fingerprint
+from agentblock.reducers import REDUCER_MAP
+from agentblock.profiler import NodeProfiler
 
 
 # 실행 노드 타입 매핑
@@ -27,53 +32,165 @@ NODE_TYPE_MAP = {
     "from_yaml": "handled separately",
     "retriever": RetrieverNode,
     "data_loader": GenericLoaderNode,
-    "data_saver": DataSaverNode
+    "data_saver": DataSaverNode,
+    "embedding_node": EmbeddingNode,
     # 필요하면 "router" 등 다른 실행 노드 추가
 }
 
 
+# REFERENCE_REGISTRY로 공유 가능한 reference 타입
+SHAREABLE_REFERENCE_TYPES = {"embedding", "vector_store"}
+
+
+class ReferenceBuildError(RuntimeError):
+    """
+    references 빌드 실패. errors에 {reference 이름: 발생한 예외}를 담는다.
+    """
+
+    def __init__(self, errors: Dict[str, BaseException]):
+        self.errors = errors
+        detail = "; ".join(f"'{name}': {err!r}" for name, err in errors.items())
+        super().__init__(f"Failed to build references: {detail}")
+
+
 class GraphBuilder:
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        yaml_data: Optional[Dict[str, Any]] = None,
+        base_dir: Optional[str] = None,
+        max_reference_workers: Optional[int] = None,
+        lazy_references: bool = False,
+        share_references: bool = False,
+        async_mode: bool = False,
+        profiler: Optional[NodeProfiler] = None,
+    ):
         """
-        path가 YAML 파일 경로라고 가정.
+        path: YAML 파일 경로. 파일은 한 번만 파싱되고, 검증/빌드는 파싱된 dict로 수행.
+        yaml_data: 이미 파싱된(혹은 프로그램에서 생성한) 그래프 dict.
+                   파일 I/O 없이 검증/빌드하며, from_file 하위 그래프와
+                   function_path는 base_dir 기준으로 해석한다(기본값: 현재 작업 디렉토리).
+        max_reference_workers: 같은 위상 레벨의 references를 동시에 빌드할 스레드 수.
+                   None이면 ThreadPoolExecutor 기본값, 1이면 순차 빌드.
+        lazy_references: True면 references를 기본적으로 지연 생성(첫 사용 시 build)한다.
+                   reference 정의의 `lazy: true/false`가 이 기본값보다 우선한다.
+        share_references: True면 프로세스 전역 REFERENCE_REGISTRY를 통해
+                   설정이 같은 reference를 다른 그래프/서브그래프와 공유한다.
+                   사용이 끝나면 release_references()로 참조를 반납한다.
+        async_mode: True면 각 노드의 async node_fn(abuild)으로 그래프를 구성한다.
+                   컴파일된 그래프는 ainvoke/astream으로 실행해야 한다.
+        profiler: 지정하면 모든 node_fn(서브그래프 노드 포함)을 감싸
+                   노드별 호출 수 / 지연 시간 / 에러 / payload 크기를 기록한다.
         """
-        self.yaml_path = os.path.abspath(path)
+        if (path is None) == (yaml_data is None):
+            raise ValueError("GraphBuilder에는 path와 yaml_data 중 하나만 지정해야 합니다.")
+
+        if path is not None:
+            self.yaml_path = os.path.abspath(path)
+            self.yaml_dir = os.path.dirname(self.yaml_path)
+            self.config = load_yaml(self.yaml_path)
+        else:
+            self.yaml_path = None
+            self.yaml_dir = os.path.abspath(base_dir or os.getcwd())
+            self.config = yaml_data
         self.validate_yaml()
 
-        self.yaml_dir = os.path.dirname(self.yaml_path)
-        self.config = load_config(self.yaml_path)
-
         # 스키마에서 sections 파싱
         self.references_defs = self.config.get("references", [])
         self.node_defs = self.config.get("nodes", [])
         self.edge_defs = self.config.get("edges", [])
+        self.state_defs = self.config.get("state") or {}
 
         # 저장 구조
         self.node_map = {}  # { node_name: node_fn or sub_graph }
         self.references_map: Dict[str, Any] = {}  # { reference_name: built_object }
         self.used_keys: Set[Any] = set()
+        # { state 키: reducer 함수 } - 병렬 branch의 업데이트를 합치는 방법
+        self.state_reducers: Dict[str, Callable] = {
+            key: REDUCER_MAP[spec["reducer"]] for key, spec in self.state_defs.items()
+        }
+        self.use_cache = False  # build(use_cache=True) 시 서브그래프에도 캐시 적용
+        self.max_reference_workers = max_reference_workers
+        self.lazy_references = lazy_references
+        self.share_references = share_references
+        self.async_mode = async_mode
+        self.profiler = profiler
+        self.reference_fingerprints: Dict[str, str] = {}  # { reference_name: fingerprint }
+        # registry에서 acquire한 fingerprint 목록 (서브그래프에서 acquire한 것 포함)
+        self._acquired_references: List[str] = []
+
+    def _builder_options(self) -> Dict[str, Any]:
+        """서브그래프(from_yaml) GraphBuilder에 그대로 전달할 옵션"""
+        return {
+            "max_reference_workers": self.max_reference_workers,
+            "lazy_references": self.lazy_references,
+            "share_references": self.share_references,
+            "async_mode": self.async_mode,
+            "profiler": self.profiler,
+        }
 
     @staticmethod
-    def from_yaml_data(yaml_data):
+    def _cache_variant(options: Dict[str, Any]) -> str:
+        """빌드 결과에 영향을 주는 옵션만 캐시 key에 포함"""
+        return (
+            f"lazy_references={bool(options.get('lazy_references'))},"
+            f"share_references={bool(options.get('share_references'))},"
+            f"async_mode={bool(options.get('async_mode'))},"
+            # 프로파일러가 다르면 기록 대상이 다르므로 별도 캐시 항목
+            f"profiler={id(options['profiler']) if options.get('profiler') else None}"
+        )
+
+    @staticmethod
+    def build_cached(path: str, **options):
+        """
+        프로세스 전역 그래프 캐시(GRAPH_CACHE)를 이용해 컴파일된 그래프를 반환.
+        루트 YAML, from_file로 포함된 YAML, function_path 파일의 내용이 모두 같다면
+        YAML 파싱/검증/레퍼런스 빌드/컴파일 없이 캐시된 그래프를 그대로 돌려준다.
+        options는 GraphBuilder 생성자 옵션(max_reference_workers 등)과 동일.
         """
-        주어진 yaml_data를 임시 YAML 파일로 저장하고, 해당 파일 경로를 사용하여 GraphBuilder 객체를 생성합니다.
+        return GraphBuilder._get_cached_entry(path, **options).graph
+
+    @staticmethod
+    def _get_cached_entry(path: str, **options) -> CachedGraph:
+        fingerprint = GRAPH_CACHE.fingerprint(
+            path, GraphBuilder._cache_variant(options)
+        )
+        return GRAPH_CACHE.get_or_build(
+            fingerprint, lambda fp: GraphBuilder(path, **options)._build_cache_entry(fp)
+        )
+
+    def _build_cache_entry(self, fingerprint: str) -> CachedGraph:
+        self.use_cache = True
+        graph = self._build()
+        # 공유 reference는 builder가 아니라 캐시 항목이 소유한다 (캐시에서 제거될 때 반납)
+        acquired, self._acquired_references = self._acquired_references, []
+        return CachedGraph(
+            fingerprint=fingerprint,
+            graph=graph,
+            used_keys=set(self.used_keys),
+            references_map=dict(self.references_map),
+            state_reducers=dict(self.state_reducers),
+            acquired_references=acquired,
+        )
+
+    @staticmethod
+    def from_yaml_data(yaml_data, base_dir: Optional[str] = None, **options):
+        """
+        주어진 yaml_data(dict)로 GraphBuilder 객체를 생성합니다.
+        임시 파일을 만들지 않고, 파싱된 구조를 그대로 검증/빌드에 사용합니다.
 
         Args:
             yaml_data (dict): YAML 형식의 데이터 (예: dict 형태로 전달)
+            base_dir (str): from_file / function_path 상대경로의 기준 디렉토리
+            options: GraphBuilder 생성자 옵션 (profiler, async_mode 등)
 
         Returns:
             GraphBuilder: 생성된 GraphBuilder 객체
         """
-        # 임시 파일을 생성하여 yaml_data를 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.yaml') as temp_file:
-            temp_file_path = temp_file.name
-            yaml.dump(yaml_data, temp_file, default_flow_style=False, allow_unicode=True)
-
-        # 생성된 임시 파일 경로를 사용하여 GraphBuilder 객체 반환
-        return GraphBuilder(temp_file_path)
+        return GraphBuilder(yaml_data=yaml_data, base_dir=base_dir, **options)
 
     def validate_yaml(self):
-        validate_yaml(self.yaml_path)
+        validate_yaml_data(self.config)
 
     def load_nodes(self):
         """
@@ -91,13 +208,26 @@ class GraphBuilder:
                         f"{node_cfg['name']}: from_yaml node but no from_file specified"
                     )
                 sub_file_path = os.path.join(self.yaml_dir, from_file)
-                sub_builder = GraphBuilder(sub_file_path)
-                # 재귀 빌드
-                sub_graph = sub_builder.build()
+                sub_options = self._builder_options()
+                if self.profiler is not None:
+                    # 서브그래프 노드는 "상위노드/하위노드" 이름으로 기록
+                    sub_options["profiler"] = self.profiler.child(node_cfg["name"])
+                if self.use_cache:
+                    # 서브그래프도 캐시에서 재사용
+                    entry = GraphBuilder._get_cached_entry(sub_file_path, **sub_options)
+                    sub_graph, sub_used_keys = entry.graph, entry.used_keys
+                else:
+                    sub_builder = GraphBuilder(sub_file_path, **sub_options)
+                    # 재귀 빌드
+                    sub_graph = sub_builder.build()
+                    sub_used_keys = sub_builder.used_keys
+                    self._acquired_references.extend(sub_builder._acquired_references)
+                if self.profiler is not None:
+                    sub_graph = self.profiler.wrap(node_cfg["name"], sub_graph)
                 self.node_map[node_cfg["name"]] = sub_graph
 
                 # 서브그래프의 used_keys를 상위 그래프에도 반영
-                self.used_keys.update(sub_builder.used_keys)
+                self.used_keys.update(sub_used_keys)
 
             else:
                 # 일반 실행 노드
@@ -109,7 +239,16 @@ class GraphBuilder:
                 node_obj = cls.from_yaml(
                     node_cfg, base_dir=self.yaml_dir, references_map=self.references_map
                 )
-                node_fn = node_obj.build()
+                node_fn = node_obj.abuild() if self.async_mode else node_obj.build()
+                if self.profiler is not None:
+                    node_fn = self.profiler.wrap(
+                        node_cfg["name"],
+                        node_fn,
+                        input_keys=[
+                            BaseNode.parse_input_keys(k)[0]
+                            for k in node_cfg.get("input_keys", [])
+                        ],
+                    )
                 self.node_map[node_cfg["name"]] = node_fn
 
                 # input_keys / output_key -> used_keys 추가
@@ -120,13 +259,44 @@ class GraphBuilder:
                 elif isinstance(out_key, list):
                     for k in out_key:
                         self.used_keys.add(k)
+                # 노드 실행 통계를 기록하는 metadata_key (embedding_node 등)
+                if node_cfg.get("metadata_key"):
+                    self.used_keys.add(node_cfg["metadata_key"])
 
-    def build(self):
+    def build(self, use_cache: bool = False, async_mode: Optional[bool] = None):
         """
         1) references 빌드 -> self.references_map
         2) nodes 빌드 -> self.node_map
         3) edges -> StateGraph
+
+        use_cache=True면 프로세스 전역 그래프 캐시를 사용한다.
+        캐시 히트 시 used_keys / references_map은 캐시된 빌드 결과로 채워진다.
+
+        async_mode=True면 노드들이 ainvoke / aembed_* / async retriever API를 사용하는
+        async node_fn으로 구성되고, 블로킹 사용자 함수는 스레드 풀에서 실행된다.
+        하나의 이벤트 루프에서 graph.ainvoke()로 많은 요청을 동시에 처리할 수 있다.
+        (None이면 생성자의 async_mode를 따른다)
         """
+        if async_mode is not None:
+            self.async_mode = async_mode
+
+        if use_cache:
+            variant = self._cache_variant(self._builder_options())
+            if self.yaml_path is not None:
+                fingerprint = GRAPH_CACHE.fingerprint(self.yaml_path, variant)
+            else:
+                fingerprint = GRAPH_CACHE.fingerprint_data(
+                    self.config, self.yaml_dir, variant
+                )
+            entry = GRAPH_CACHE.get_or_build(fingerprint, self._build_cache_entry)
+            self.used_keys = set(entry.used_keys)
+            self.references_map = dict(entry.references_map)
+            self.state_reducers = dict(entry.state_reducers)
+            return entry.graph
+
+        return self._build()
+
+    def _build(self):
         # 1) references 빌드
         self.load_references_topo()
 
@@ -144,10 +314,14 @@ class GraphBuilder:
             graph.add_node(name, fn)
 
         # 6) edges
+        #    - 같은 from에서 여러 edge가 나가면(fan-out) 대상 노드들이 같은 step에서 동시에 실행됨
+        #    - from이 리스트인 edge(fan-in)는 모든 source 노드가 끝난 뒤 to를 실행
         for edge in self.edge_defs:
             from_name = edge["from"]
             to_name = edge["to"]
-            if from_name == "START":
+            if isinstance(from_name, list):
+                from_name = list(from_name)
+            elif from_name == "START":
                 from_name = START
             if to_name == "END":
                 to_name = END
@@ -166,10 +340,16 @@ class GraphBuilder:
     def generate_state(self) -> Type[TypedDict]:
         """
         used_keys를 기반으로 TypedDict 타입을 동적으로 생성
+        state 섹션에 reducer가 선언된 키는 Annotated[Any, reducer]로 만들어,
+        병렬 branch가 같은 키에 쓴 값을 reducer로 합친다.
         """
         state_dict = {}
-        for k in self.used_keys:
-            state_dict[k] = Any  # ToDo: node 타입별로 형태를 정의할 것, input과 output 포맷에 대한 강력한 규약
+        for k in self.used_keys | set(self.state_reducers):
+            reducer = self.state_reducers.get(k)
+            if reducer is not None:
+                state_dict[k] = Annotated[Any, reducer]
+            else:
+                state_dict[k] = Any  # ToDo: node 타입별로 형태를 정의할 것, input과 output 포맷에 대한 강력한 규약
         return TypedDict("State", state_dict, total=False)
 
     def load_references_topo(self):
@@ -208,52 +388,123 @@ class GraphBuilder:
                     graph[dep_name].append(ref_name)
                     in_degree[ref_name] += 1
 
-        # 3) Kahn's Algorithm or similar topological sort
-        from collections import deque
+        # 3) Kahn's Algorithm을 레벨 단위로 수행
+        #    같은 레벨의 reference들은 서로 의존하지 않으므로 동시에 빌드할 수 있다.
+        levels = []
+        current_level = [name for name, deg in in_degree.items() if deg == 0]
+        while current_level:
+            levels.append(current_level)
+            next_level = []
+            # 그래프에서 current -> next
+            for current in current_level:
+                for nxt in graph[current]:
+                    in_degree[nxt] -= 1
+                    if in_degree[nxt] == 0:
+                        next_level.append(nxt)
+            current_level = next_level
+
+        # 에러 체크: 만약 정렬된 개수가 전체 refs 개수보다 작으면, 순환 의존이 존재
+        if sum(len(level) for level in levels) < len(name_to_refdef):
+            raise ValueError(
+                "Reference cyclic dependency detected. Could not topologically sort."
+            )
 
-        queue = deque()
+        # 4) 레벨 순서대로, 레벨 내부는 병렬로 build
+        for level in levels:
+            # 의존 reference의 fingerprint는 이전 레벨에서 이미 계산됨
+            for ref_name in level:
+                self.reference_fingerprints[ref_name] = reference_fingerprint(
+                    name_to_refdef[ref_name],
+                    self.reference_fingerprints,
+                    self.yaml_dir,
+                )
+            self.references_map.update(
+                self._build_reference_level([name_to_refdef[n] for n in level])
+            )
 
-        # queue에 in_degree=0인 노드(의존 없는 레퍼런스) 넣기
-        for ref_name, deg in in_degree.items():
-            if deg == 0:
-                queue.append(ref_name)
+    def _build_reference_level(self, ref_defs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        서로 의존하지 않는 references를 스레드 풀에서 동시에 build.
+        레벨 전체가 끝난 뒤, 실패한 reference가 있으면 이름별 예외를 모아 보고한다.
+        """
+        built: Dict[str, Any] = {}
+        errors: Dict[str, BaseException] = {}
+
+        if self.max_reference_workers == 1 or len(ref_defs) == 1:
+            for ref_def in ref_defs:
+                try:
+                    built[ref_def["name"]] = self._get_reference(ref_def)
+                except Exception as e:
+                    errors[ref_def["name"]] = e
+        else:
+            max_workers = self.max_reference_workers
+            if max_workers is not None:
+                max_workers = min(max_workers, len(ref_defs))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._get_reference, ref_def): ref_def["name"]
+                    for ref_def in ref_defs
+                }
+                for future, ref_name in futures.items():
+                    try:
+                        built[ref_name] = future.result()
+                    except Exception as e:
+                        errors[ref_name] = e
+
+        if errors:
+            raise ReferenceBuildError(errors) from next(iter(errors.values()))
+
+        # 지원하지 않는 타입(None)은 references_map에 넣지 않는다
+        return {name: obj for name, obj in built.items() if obj is not None}
+
+    def _get_reference(self, ref_def: Dict[str, Any]) -> Any:
+        """share_references면 registry에서 공유 객체를 acquire, 아니면 직접 build"""
+        if not self.share_references or ref_def["type"] not in SHAREABLE_REFERENCE_TYPES:
+            return self._build_reference(ref_def)
+
+        fingerprint = self.reference_fingerprints[ref_def["name"]]
+        obj = REFERENCE_REGISTRY.acquire(
+            fingerprint, lambda: self._build_reference(ref_def)
+        )
+        # 스레드 풀에서 호출되므로 list.append(원자적)로만 기록
+        self._acquired_references.append(fingerprint)
+        return obj
+
+    def release_references(self) -> None:
+        """
+        share_references로 acquire한 reference들(서브그래프 포함)을 registry에 반납한다.
+        참조 카운트가 0이 된 reference는 registry에서 제거된다.
+        (build_cached / build(use_cache=True)로 만든 그래프의 reference는 GRAPH_CACHE가
+        소유하며, 캐시에서 제거되거나 GRAPH_CACHE.clear() 될 때 반납된다)
+        """
+        while self._acquired_references:
+            REFERENCE_REGISTRY.release(self._acquired_references.pop())
 
-        topo_order = []
-        while queue:
-            current = queue.popleft()
-            topo_order.append(current)
+    def _build_reference(self, ref_def: Dict[str, Any]) -> Any:
+        """
+        단일 reference build. 의존 reference는 이전 레벨에서 이미 references_map에 존재.
+        lazy reference는 설정 파싱(from_yaml)만 하고, 실제 build는 첫 사용 시로 미룬다.
+        """
+        ref_type = ref_def["type"]
 
-            # 그래프에서 current -> next
-            for nxt in graph[current]:
-                in_degree[nxt] -= 1
-                if in_degree[nxt] == 0:
-                    queue.append(nxt)
+        if ref_type == "embedding":
+            ref_obj = EmbeddingReference.from_yaml(
+                ref_def, base_dir=self.yaml_dir, references_map=self.references_map
+            )
 
-        # 에러 체크: 만약 topo_order 길이가 전체 refs 개수보다 작으면, 순환 의존이 존재
-        if len(topo_order) < len(name_to_refdef):
-            raise ValueError(
-                "Reference cyclic dependency detected. Could not topologically sort."
+        elif ref_type == "vector_store":
+            ref_obj = VectorStoreReference.from_yaml(
+                ref_def, base_dir=self.yaml_dir, references_map=self.references_map
             )
 
-        # 4) 실제 build 순서대로 진행
-        for ref_name in topo_order:
-            ref_def = name_to_refdef[ref_name]
-            ref_type = ref_def["type"]
+        else:
+            # other references or skip
+            return None
 
+        if ref_def.get("lazy", self.lazy_references):
+            lazy_ref = make_lazy_reference(ref_type, ref_def["name"], ref_obj.build)
             if ref_type == "embedding":
-                emb_ref = EmbeddingReference.from_yaml(
-                    ref_def, base_dir=self.yaml_dir, references_map=self.references_map
-                )
-                built_obj = emb_ref.build()
-                self.references_map[ref_name] = built_obj
-
-            elif ref_type == "vector_store":
-                vs_ref = VectorStoreReference.from_yaml(
-                    ref_def, base_dir=self.yaml_dir, references_map=self.references_map
-                )
-                built_obj = vs_ref.build()
-                self.references_map[ref_name] = built_obj
-
-            else:
-                # other references or skip
-                pass
+                # 저장된 벡터 스토어를 로드할 때 임베딩 모델을 만들지 않고 identity를 비교하도록
+                lazy_ref.model_id = ref_obj.model_id
+            return lazy_ref
+        return ref_obj.build()
@@ -0,0 +1,253 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from agentblock.function.function_from_file_node import FunctionFromFileNode
+from agentblock.reference_registry import REFERENCE_REGISTRY
+from agentblock.tools.load_config import load_config
+
+
+@dataclass
+class CachedGraph:
+    """컴파일된 그래프와, 캐시 히트 시 GraphBuilder에 복원할 빌드 결과"""
+
+    fingerprint: str
+    graph: Any
+    used_keys: Set[Any] = field(default_factory=set)
+    references_map: Dict[str, Any] = field(default_factory=dict)
+    state_reducers: Dict[str, Callable] = field(default_factory=dict)
+    # share_references로 REFERENCE_REGISTRY에서 acquire한 fingerprint 목록.
+    # 그래프가 캐시에 있는 동안 유지되고, 캐시에서 제거될 때 반납된다.
+    acquired_references: List[str] = field(default_factory=list)
+
+    def release_references(self) -> None:
+        while self.acquired_references:
+            REFERENCE_REGISTRY.release(self.acquired_references.pop())
+
+
+def collect_config_dependencies(config: dict, base_dir: str):
+    """
+    파싱된 그래프 config에서 직접 참조하는 파일들을 찾는다.
+    반환: (from_file로 포함된 하위 YAML 경로 목록, function_path 모듈 파일 경로 목록)
+    """
+    yaml_files: List[str] = []
+    function_files: List[str] = []
+
+    for node_cfg in (config or {}).get("nodes", []) or []:
+        if not isinstance(node_cfg, dict):
+            continue
+        cfg = node_cfg.get("config") or {}
+        node_type = node_cfg.get("type")
+
+        if node_type == "from_yaml" and cfg.get("from_file"):
+            yaml_files.append(os.path.abspath(os.path.join(base_dir, cfg["from_file"])))
+        elif node_type == "function_from_file" and cfg.get("function_path"):
+            try:
+                mod_file, _ = FunctionFromFileNode.resolve_function_path(
+                    cfg["function_path"], base_dir
+                )
+            except ValueError:
+                # 형식 오류는 실제 build() 단계에서 보고된다.
+                continue
+            function_files.append(mod_file)
+
+    return yaml_files, function_files
+
+
+def collect_graph_dependencies(
+    yaml_path: Optional[str] = None,
+    config: Optional[dict] = None,
+    base_dir: Optional[str] = None,
+) -> List[str]:
+    """
+    루트 YAML과 from_file로 (재귀적으로) 포함된 YAML, function_path 파일의
+    절대경로 목록을 반환한다.
+    config가 주어지면 루트는 파일이 아닌 파싱된 dict(base_dir 기준)로 취급하며,
+    반환 목록에는 루트가 포함되지 않는다.
+    """
+    deps: List[str] = []
+    seen: Set[str] = set()
+
+    def add_config(cfg: dict, cfg_dir: str):
+        yaml_files, function_files = collect_config_dependencies(cfg, cfg_dir)
+        for func_file in function_files:
+            if func_file not in seen:
+                seen.add(func_file)
+                deps.append(func_file)
+        stack.extend(reversed(yaml_files))
+
+    stack: List[str] = []
+    if config is not None:
+        add_config(config, os.path.abspath(base_dir or os.getcwd()))
+    else:
+        stack.append(os.path.abspath(yaml_path))
+
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        deps.append(path)
+
+        if os.path.isfile(path):
+            add_config(load_config(path), os.path.dirname(path))
+
+    return deps
+
+
+def compute_data_digest(config: dict, base_dir: str) -> str:
+    """파싱된 그래프 dict + 기준 디렉토리의 정규화된 해시"""
+    payload = json.dumps(
+        [os.path.abspath(base_dir), config],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compute_fingerprint(paths: List[str], extra: bytes = b"") -> str:
+    """
+    파일 경로 + 파일 내용 해시를 모두 합친 sha256.
+    파일이 없으면 '없음' 자체를 상태로 취급한다(파일이 생기면 fingerprint가 바뀜).
+    """
+    digest = hashlib.sha256(extra)
+    for path in sorted(paths):
+        digest.update(path.encode("utf-8"))
+        digest.update(b"\0")
+        try:
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class GraphCache:
+    """
+    프로세스 전역 컴파일 그래프 캐시.
+    - key: 루트 YAML + 포함된 모든 YAML/function 파일 내용의 해시(fingerprint)
+    - 루트 경로별 의존 파일 목록을 기억해 두므로, 캐시 히트 시에는 YAML 파싱 없이
+      파일 내용 해시만 다시 계산한다.
+    - maxsize를 넘으면 가장 오래 사용하지 않은 그래프부터 제거(LRU).
+      제거되거나 clear()된 그래프가 공유하던 reference는 REFERENCE_REGISTRY에 반납한다.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CachedGraph]" = OrderedDict()
+        # 루트(경로 또는 dict digest)별 의존 파일 목록. 그래프와 같은 maxsize의 LRU로 유지한다
+        self._dependencies: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, yaml_path: str, variant: str = "") -> str:
+        """
+        variant: 같은 파일이라도 빌드 결과가 달라지는 빌드 옵션(예: lazy_references)
+        """
+        yaml_path = os.path.abspath(yaml_path)
+        return self._fingerprint(
+            yaml_path,
+            lambda: collect_graph_dependencies(yaml_path),
+            variant.encode("utf-8"),
+        )
+
+    def fingerprint_data(self, config: dict, base_dir: str, variant: str = "") -> str:
+        """
+        파일이 아닌 dict로 구성한 그래프의 fingerprint.
+        dict 내용 + base_dir + 포함된 파일들의 내용으로 결정된다.
+        """
+        data_digest = compute_data_digest(config, base_dir)
+        return self._fingerprint(
+            f"data:{data_digest}",
+            lambda: collect_graph_dependencies(config=config, base_dir=base_dir),
+            (data_digest + variant).encode("utf-8"),
+        )
+
+    def _fingerprint(
+        self, memo_key: str, collect_fn: Callable[[], List[str]], extra: bytes
+    ) -> str:
+        with self._lock:
+            deps = self._dependencies.get(memo_key)
+            if deps is not None:
+                self._dependencies.move_to_end(memo_key)
+
+        # 의존 목록은 해당 파일들의 내용에 의해서만 결정되므로,
+        # 내용 해시가 기존 엔트리와 같다면 의존 목록도 그대로 유효하다.
+        if deps is not None:
+            fp = compute_fingerprint(deps, extra)
+            with self._lock:
+                if fp in self._entries:
+                    return fp
+
+        deps = collect_fn()
+        with self._lock:
+            self._dependencies[memo_key] = deps
+            self._dependencies.move_to_end(memo_key)
+            while len(self._dependencies) > self.maxsize:
+                self._dependencies.popitem(last=False)
+        return compute_fingerprint(deps, extra)
+
+    def get(self, fingerprint: str) -> Optional[CachedGraph]:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                self._entries.move_to_end(fingerprint)
+            return entry
+
+    def put(self, entry: CachedGraph) -> None:
+        evicted: List[CachedGraph] = []
+        with self._lock:
+            previous = self._entries.get(entry.fingerprint)
+            if previous is not None and previous is not entry:
+                evicted.append(previous)
+            self._entries[entry.fingerprint] = entry
+            self._entries.move_to_end(entry.fingerprint)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for old in evicted:
+            old.release_references()
+
+    def get_or_build(
+        self, fingerprint: str, build_fn: Callable[[str], CachedGraph]
+    ) -> CachedGraph:
+        """
+        캐시에 있으면 바로 반환, 없으면 build_fn(fingerprint)로 생성 후 저장.
+        같은 fingerprint를 여러 스레드가 동시에 요청해도 빌드는 한 번만 수행된다.
+        """
+        entry = self.get(fingerprint)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(fingerprint, threading.Lock())
+
+        with build_lock:
+            entry = self.get(fingerprint)
+            if entry is None:
+                entry = build_fn(fingerprint)
+                self.put(entry)
+
+        with self._lock:
+            self._build_locks.pop(fingerprint, None)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._entries.values())
+            self._entries.clear()
+            self._dependencies.clear()
+        for old in evicted:
+            old.release_references()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 프로세스 전역 캐시
+GRAPH_CACHE = GraphCache()
@@ -0,0 +1,138 @@
+import functools
+import threading
+from typing import Any, Callable, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+class LazyReference:
+    """
+    첫 메서드 호출 시점에 실제 객체(Embeddings / VectorStore 등)를 생성하는 프록시.
+    - factory는 스레드 안전하게 정확히 한 번만 호출된다 (실패 시에는 다음 호출에서 재시도).
+    - 프록시에 정의되지 않은 속성은 모두 실제 객체로 위임한다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self._lazy_name = name
+        self._lazy_factory = factory
+        self._lazy_target = None
+        self._lazy_lock = threading.Lock()
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._lazy_target is not None
+
+    def materialize(self) -> Any:
+        target = self._lazy_target
+        if target is None:
+            with self._lazy_lock:
+                if self._lazy_target is None:
+                    self._lazy_target = self._lazy_factory()
+                    # 빌드가 끝나면 factory(클로저)가 잡고 있던 객체를 놓아준다
+                    self._lazy_factory = None
+                target = self._lazy_target
+        return target
+
+    def __getattr__(self, item):
+        # __getattr__은 일반 속성 조회가 실패했을 때만 호출된다.
+        # - 초기화 이전/내부 속성 조회로 인한 무한 재귀 방지
+        # - hasattr(obj, "__self__") 같은 dunder 탐색(예: langgraph compile)이
+        #   실제 객체 생성을 유발하지 않도록 위임하지 않음
+        if item.startswith("_lazy_") or (item.startswith("__") and item.endswith("__")):
+            raise AttributeError(item)
+        return getattr(self.materialize(), item)
+
+    def __repr__(self) -> str:
+        state = "materialized" if self.is_materialized else "pending"
+        return f"<{type(self).__name__} '{self._lazy_name}' ({state})>"
+
+
+def _delegate(base: type, method_name: str):
+    # 시그니처 / 타입 힌트는 base 클래스 메서드의 것을 복사한다
+    # (EmbeddingNode처럼 inspect.signature로 호출 방식을 정하는 노드가 실제 객체를 만들지 않도록)
+    @functools.wraps(getattr(base, method_name))
+    def method(self, *args, **kwargs):
+        return getattr(self.materialize(), method_name)(*args, **kwargs)
+
+    # wraps가 복사한 abstractmethod 표시는 지운다 (프록시 클래스를 인스턴스화할 수 있도록)
+    method.__isabstractmethod__ = False
+    return method
+
+
+class LazyEmbeddings(LazyReference, Embeddings):
+    """isinstance(x, Embeddings) 검사를 통과하는 지연 생성 임베딩 프록시"""
+
+    # 모델 identity (GraphBuilder가 EmbeddingReference 설정에서 채운다).
+    # 클래스 속성으로 두어 벡터 스토어 로드 시 조회가 실제 객체 생성으로 위임되지 않게 한다.
+    model_id: Optional[str] = None
+
+    embed_documents = _delegate(Embeddings, "embed_documents")
+    embed_query = _delegate(Embeddings, "embed_query")
+    aembed_documents = _delegate(Embeddings, "aembed_documents")
+    aembed_query = _delegate(Embeddings, "aembed_query")
+
+
+class LazyVectorStore(LazyReference, VectorStore):
+    """isinstance(x, VectorStore) 검사를 통과하는 지연 생성 벡터스토어 프록시"""
+
+    similarity_search = _delegate(VectorStore, "similarity_search")
+
+    @property
+    def embeddings(self):
+        return self.materialize().embeddings
+
+    @classmethod
+    def from_texts(cls, *args, **kwargs):
+        # VectorStore의 추상 메서드라 정의는 필요하지만, 프록시는 reference 설정(factory)으로만 만든다
+        raise TypeError(
+            "LazyVectorStore cannot be created with from_texts(); "
+            "declare the vector store reference with 'lazy: true' in YAML, "
+            "or call from_texts() on the concrete vector store class."
+        )
+
+
+# VectorStore 기본 클래스에 구현된 메서드도 프록시 자신이 아니라 실제 객체에서 실행되도록 위임
+for _method_name in (
+    "add_texts",
+    "aadd_texts",
+    "add_documents",
+    "aadd_documents",
+    "delete",
+    "adelete",
+    "get_by_ids",
+    "aget_by_ids",
+    "search",
+    "asearch",
+    "asimilarity_search",
+    "similarity_search_with_score",
+    "asimilarity_search_with_score",
+    "similarity_search_with_relevance_scores",
+    "asimilarity_search_with_relevance_scores",
+    "similarity_search_by_vector",
+    "asimilarity_search_by_vector",
+    "max_marginal_relevance_search",
+    "amax_marginal_relevance_search",
+    "max_marginal_relevance_search_by_vector",
+    "amax_marginal_relevance_search_by_vector",
+    "as_retriever",
+):
+    setattr(LazyVectorStore, _method_name, _delegate(VectorStore, _method_name))
+
+
+# reference type -> 프록시 클래스
+LAZY_REFERENCE_TYPE_MAP = {
+    "embedding": LazyEmbeddings,
+    "vector_store": LazyVectorStore,
+}
+
+
+def make_lazy_reference(
+    ref_type: str, name: str, factory: Callable[[], Any]
+) -> LazyReference:
+    cls = LAZY_REFERENCE_TYPE_MAP.get(ref_type)
+    if cls is None:
+        raise ValueError(
+            f"Lazy loading is not supported for reference type: {ref_type}"
+        )
+    return cls(name, factory)
@@ -36,11 +36,16 @@ class LLMNode(BaseNode):
             prompt_template=config["config"]["prompt_template"],
         )
 
-    def build(self):
+    def _build_chain(self) -> LLMChain:
         prompt = PromptTemplate.from_template(self.prompt_template)
         llm = LLMFactory().create_llm(provider=self.provider, **self.param)
 
         chain = LLMChain(prompt=prompt, llm=llm, output_key=self.output_key)
+        self.compile_input_plan()
+        return chain
+
+    def build(self):
+        chain = self._build_chain()
 
         def node_fn(state: Dict) -> Dict:
             # 입력값 준비
@@ -49,3 +54,14 @@ class LLMNode(BaseNode):
             return {self.output_key: result[self.output_key]}
 
         return node_fn
+
+    def abuild(self):
+        chain = self._build_chain()
+
+        async def node_fn(state: Dict) -> Dict:
+            # LLM 호출을 이벤트 루프에서 비동기로 수행 (스레드 점유 없음)
+            inputs = self.get_inputs(state)
+            result = await chain.ainvoke(inputs)
+            return {self.output_key: result[self.output_key]}
+
+        return node_fn
@@ -0,0 +1,330 @@
+import json
+import os
+import sys
+import time
+import inspect
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+# 지연 시간 히스토그램 버킷 상한(초). 마지막 +Inf 버킷은 항상 추가된다.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def payload_size(obj: Any) -> int:
+    """
+    state 값의 대략적인 크기(bytes).
+    문자열/바이트는 길이, Document는 page_content 길이, 배열은 nbytes,
+    컨테이너는 원소 합으로 계산한다. (정확한 메모리 사용량이 아닌 비교용 추정치)
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(payload_size(k) + payload_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sum(payload_size(v) for v in obj)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    page_content = getattr(obj, "page_content", None)
+    if isinstance(page_content, str):
+        return len(page_content.encode("utf-8"))
+    return sys.getsizeof(obj)
+
+
+class NodeStats:
+    """노드 하나의 누적 통계"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # 마지막은 +Inf
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.min_seconds: Optional[float] = None
+        self.max_seconds: Optional[float] = None
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+    def observe(self, seconds: float, error: bool, input_bytes: int, output_bytes: int):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total_seconds += seconds
+        self.min_seconds = (
+            seconds if self.min_seconds is None else min(self.min_seconds, seconds)
+        )
+        self.max_seconds = (
+            seconds if self.max_seconds is None else max(self.max_seconds, seconds)
+        )
+        self.input_bytes += input_bytes
+        self.output_bytes += output_bytes
+
+        for i, upper in enumerate(self.buckets):
+            if seconds <= upper:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = []
+        running = 0
+        for upper, count in zip(list(self.buckets) + ["+Inf"], self.bucket_counts):
+            running += count
+            cumulative.append({"le": upper, "count": running})
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+            "min_seconds": self.min_seconds,
+            "max_seconds": self.max_seconds,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "latency_histogram": cumulative,
+        }
+
+
+class NodeProfiler:
+    """
+    노드 실행 프로파일러 (opt-in).
+    GraphBuilder(path, profiler=NodeProfiler())로 지정하면 load_nodes에서 만들어지는
+    모든 node_fn(서브그래프 포함)을 감싸 노드별로 아래 값을 기록한다.
+      - 호출 수, 에러 수
+      - 지연 시간 히스토그램(합계/최소/최대 포함)
+      - 입력(읽는 state 키) / 출력(반환 dict) payload 크기
+
+    서브그래프의 노드는 "상위노드/하위노드" 형태의 이름으로 기록된다.
+    결과는 snapshot()으로 조회하거나 Prometheus text / JSON 파일로 내보낼 수 있다.
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        measure_payload: bool = True,
+        prefix: str = "",
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.measure_payload = measure_payload
+        self.prefix = prefix
+        self._stats: Dict[str, NodeStats] = {}
+        self._lock = threading.Lock()
+        self._children: Dict[str, "NodeProfiler"] = {}
+
+    def child(self, name: str) -> "NodeProfiler":
+        """
+        서브그래프용 프로파일러. 통계 저장소를 공유하고, 노드 이름에 prefix를 붙인다.
+        같은 이름에는 같은 객체를 반환한다(그래프 캐시 key가 안정적으로 유지되도록).
+        """
+        with self._lock:
+            sub = self._children.get(name)
+            if sub is None:
+                sub = NodeProfiler(
+                    self.buckets, self.measure_payload, f"{self.prefix}{name}/"
+                )
+                # 저장소와 lock을 공유
+                sub._stats = self._stats
+                sub._lock = self._lock
+                self._children[name] = sub
+        return sub
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        error: bool = False,
+        input_bytes: int = 0,
+        output_bytes: int = 0,
+    ) -> None:
+        full_name = f"{self.prefix}{name}"
+        with self._lock:
+            stats = self._stats.get(full_name)
+            if stats is None:
+                stats = self._stats[full_name] = NodeStats(self.buckets)
+            stats.observe(seconds, error, input_bytes, output_bytes)
+
+    def _input_size(self, state: Any, input_keys: Optional[Tuple[str, ...]]) -> int:
+        if not self.measure_payload:
+            return 0
+        if input_keys is None or not isinstance(state, dict):
+            return payload_size(state)
+        return sum(payload_size(state.get(k)) for k in input_keys)
+
+    def _output_size(self, output: Any) -> int:
+        return payload_size(output) if self.measure_payload else 0
+
+    def wrap(
+        self,
+        name: str,
+        node_fn: Callable,
+        input_keys: Optional[Iterable[str]] = None,
+    ) -> Callable:
+        """
+        node_fn(동기/async 함수 또는 컴파일된 서브그래프)을 감싸 실행 통계를 기록한다.
+        input_keys: 입력 payload 측정에 사용할 state 키 (None이면 state 전체)
+        """
+        keys = tuple(input_keys) if input_keys is not None else None
+
+        if hasattr(node_fn, "invoke") and hasattr(node_fn, "ainvoke"):
+            # 컴파일된 서브그래프(Runnable): 동기/async 실행 모두 지원하도록 감싼다
+            runnable = node_fn
+
+            def invoke_fn(state: Dict[str, Any], config: RunnableConfig) -> Any:
+                return runnable.invoke(state, config)
+
+            async def ainvoke_fn(state: Dict[str, Any], config: RunnableConfig) -> Any:
+                return await runnable.ainvoke(state, config)
+
+            return RunnableLambda(
+                self._wrap_sync(name, invoke_fn, keys),
+                afunc=self._wrap_async(name, ainvoke_fn, keys),
+                name=name,
+            )
+
+        if inspect.iscoroutinefunction(node_fn):
+            return self._wrap_async(name, node_fn, keys)
+        return self._wrap_sync(name, node_fn, keys)
+
+    def _wrap_sync(
+        self, name: str, fn: Callable, keys: Optional[Tuple[str, ...]]
+    ) -> Callable:
+        takes_config = "config" in inspect.signature(fn).parameters
+
+        def profiled(state: Dict[str, Any], config: RunnableConfig = None) -> Any:
+            input_bytes = self._input_size(state, keys)
+            start = time.perf_counter()
+            try:
+                output = fn(state, config) if takes_config else fn(state)
+            except Exception:
+                self.record(name, time.perf_counter() - start, True, input_bytes)
+                raise
+            elapsed = time.perf_counter() - start
+            self.record(name, elapsed, False, input_bytes, self._output_size(output))
+            return output
+
+        return profiled
+
+    def _wrap_async(
+        self, name: str, fn: Callable, keys: Optional[Tuple[str, ...]]
+    ) -> Callable:
+        takes_config = "config" in inspect.signature(fn).parameters
+
+        async def profiled(state: Dict[str, Any], config: RunnableConfig = None) -> Any:
+            input_bytes = self._input_size(state, keys)
+            start = time.perf_counter()
+            try:
+                output = await (fn(state, config) if takes_config else fn(state))
+            except Exception:
+                self.record(name, time.perf_counter() - start, True, input_bytes)
+                raise
+            elapsed = time.perf_counter() - start
+            self.record(name, elapsed, False, input_bytes, self._output_size(output))
+            return output
+
+        return profiled
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{노드 이름: 통계 dict} 형태의 현재 통계 사본"""
+        with self._lock:
+            return {
+                name: stats.to_dict() for name, stats in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, namespace: str = "agentblock_node") -> str:
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {namespace}_{name} {help_text}")
+            lines.append(f"# TYPE {namespace}_{name} {kind}")
+
+        metric("calls_total", "counter", "Number of node executions.")
+        for node, s in snapshot.items():
+            lines.append(
+                f'{namespace}_calls_total{{node="{_escape(node)}"}} {s["calls"]}'
+            )
+
+        metric("errors_total", "counter", "Number of node executions that raised.")
+        for node, s in snapshot.items():
+            lines.append(
+                f'{namespace}_errors_total{{node="{_escape(node)}"}} {s["errors"]}'
+            )
+
+        metric("latency_seconds", "histogram", "Node execution latency in seconds.")
+        for node, s in snapshot.items():
+            label = _escape(node)
+            for bucket in s["latency_histogram"]:
+                lines.append(
+                    f'{namespace}_latency_seconds_bucket{{node="{label}",le="{bucket["le"]}"}} '
+                    f'{bucket["count"]}'
+                )
+            lines.append(
+                f'{namespace}_latency_seconds_sum{{node="{label}"}} {s["total_seconds"]}'
+            )
+            lines.append(
+                f'{namespace}_latency_seconds_count{{node="{label}"}} {s["calls"]}'
+            )
+
+        metric(
+            "input_bytes_total", "counter", "Estimated size of node inputs in bytes."
+        )
+        for node, s in snapshot.items():
+            lines.append(
+                f'{namespace}_input_bytes_total{{node="{_escape(node)}"}} {s["input_bytes"]}'
+            )
+
+        metric(
+            "output_bytes_total", "counter", "Estimated size of node outputs in bytes."
+        )
+        for node, s in snapshot.items():
+            lines.append(
+                f'{namespace}_output_bytes_total{{node="{_escape(node)}"}} {s["output_bytes"]}'
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str) -> None:
+        _atomic_write(path, self.to_json())
+
+    def dump_prometheus(self, path: str, namespace: str = "agentblock_node") -> None:
+        """node_exporter textfile collector 등에서 읽을 수 있도록 파일로 저장"""
+        _atomic_write(path, self.to_prometheus(namespace))
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _atomic_write(path: str, content: str) -> None:
+    # 수집기가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,71 @@
+"""
+State 키별 reducer.
+병렬 branch(fan-out)가 같은 state 키에 값을 쓰는 경우, YAML `state` 섹션에 지정한
+reducer로 여러 업데이트를 하나로 합친다.
+
+state:
+  retrieved_docs:
+    reducer: append
+"""
+
+from typing import Any
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def append_reducer(left: Any, right: Any) -> list:
+    """리스트 이어붙이기. 리스트가 아닌 값은 원소 하나로 취급."""
+    return _as_list(left) + _as_list(right)
+
+
+def merge_reducer(left: Any, right: Any) -> dict:
+    """dict 병합. 같은 키는 나중에 적용된 업데이트가 우선."""
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
+
+
+def sum_reducer(left: Any, right: Any) -> Any:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left + right
+
+
+def max_reducer(left: Any, right: Any) -> Any:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return max(left, right)
+
+
+def min_reducer(left: Any, right: Any) -> Any:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return min(left, right)
+
+
+def last_reducer(left: Any, right: Any) -> Any:
+    """마지막 업데이트를 그대로 사용 (병렬 업데이트도 에러 없이 허용)"""
+    return right
+
+
+# YAML reducer 이름 -> 함수
+REDUCER_MAP = {
+    "append": append_reducer,
+    "merge": merge_reducer,
+    "sum": sum_reducer,
+    "max": max_reducer,
+    "min": min_reducer,
+    "last": last_reducer,
+}
@@ -0,0 +1,134 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# YAML 파일 위치(base_dir) 기준 상대경로로 해석되는 config 옵션: (config 키, 하위 키)
+BASE_DIR_PATH_OPTIONS = (("cache", "path"),)
+
+
+def _resolve_base_dir_paths(
+    cfg: Dict[str, Any], base_dir: Optional[str]
+) -> Dict[str, Any]:
+    """base_dir 기준 상대경로 옵션을 절대경로로 바꾼 config 사본 (reference build와 같은 해석)"""
+    if not base_dir:
+        return cfg
+    cfg = dict(cfg)
+    for key, path_key in BASE_DIR_PATH_OPTIONS:
+        option = cfg.get(key)
+        if not isinstance(option, dict):
+            continue
+        path = option.get(path_key)
+        if isinstance(path, str) and not os.path.isabs(path):
+            cfg[key] = dict(option, **{path_key: os.path.join(base_dir, path)})
+    return cfg
+
+
+def reference_fingerprint(
+    ref_def: Dict[str, Any],
+    dependency_fingerprints: Optional[Dict[str, str]] = None,
+    base_dir: Optional[str] = None,
+) -> str:
+    """
+    reference 정의의 fingerprint.
+    type / provider / param / 기타 config와, 참조하는 reference들의 fingerprint로 결정된다.
+    (reference 이름은 포함하지 않으므로, 이름이 달라도 설정이 같으면 같은 fingerprint)
+    base_dir: cache.path 같은 상대경로를 해석할 YAML 디렉토리.
+      다른 디렉토리의 YAML이 같은 상대경로를 쓰면 서로 다른 파일이므로 fingerprint도 달라진다.
+    """
+    dependency_fingerprints = dependency_fingerprints or {}
+    cfg = _resolve_base_dir_paths(ref_def.get("config", {}) or {}, base_dir)
+
+    payload = {
+        "type": ref_def.get("type"),
+        "provider": cfg.get("provider"),
+        "param": cfg.get("param", {}),
+        "config": {
+            k: v for k, v in cfg.items() if k not in ("provider", "param", "reference")
+        },
+        "reference": {
+            role: dependency_fingerprints.get(dep_name, dep_name)
+            for role, dep_name in (cfg.get("reference", {}) or {}).items()
+        },
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _RegistryEntry:
+    def __init__(self, obj: Any):
+        self.obj = obj
+        self.refcount = 1
+
+
+class ReferenceRegistry:
+    """
+    프로세스 전역 reference 저장소.
+    - 같은 fingerprint의 reference는 한 번만 build되어 모든 그래프가 공유한다.
+    - acquire()마다 참조 카운트가 증가하고, release()로 감소한다.
+      카운트가 0이 되면 registry에서 제거된다(다음 acquire에서 다시 build).
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _RegistryEntry] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, fingerprint: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                entry.refcount += 1
+                return entry.obj
+            build_lock = self._build_locks.setdefault(fingerprint, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(fingerprint)
+                if entry is not None:
+                    entry.refcount += 1
+                    return entry.obj
+
+            # 같은 fingerprint의 build는 build_lock으로 직렬화되고,
+            # 다른 fingerprint의 build는 동시에 진행될 수 있다.
+            obj = factory()
+
+            with self._lock:
+                self._entries[fingerprint] = _RegistryEntry(obj)
+                self._build_locks.pop(fingerprint, None)
+            return obj
+
+    def release(self, fingerprint: str) -> bool:
+        """
+        참조 카운트를 1 감소. 0이 되어 registry에서 제거되면 True 반환.
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                raise KeyError(f"Reference '{fingerprint}' is not registered.")
+            entry.refcount -= 1
+            if entry.refcount <= 0:
+                del self._entries[fingerprint]
+                return True
+            return False
+
+    def refcount(self, fingerprint: str) -> int:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            return entry.refcount if entry is not None else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, fingerprint: str) -> bool:
+        with self._lock:
+            return fingerprint in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 프로세스 전역 registry
+REFERENCE_REGISTRY = ReferenceRegistry()
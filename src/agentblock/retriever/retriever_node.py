@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any
 from agentblock.base import BaseNode
 
@@ -72,37 +73,45 @@ class RetrieverNode(BaseNode):
             search_kwargs=search_kwargs,
         )
 
+    def _get_query(self, state: Dict) -> Any:
+        # 1) query 가져오기
+        inputs = self.get_inputs(state)
+        if not self.input_keys:
+            raise ValueError(f"RetrieverNode '{self.name}'에 input_keys가 비어있습니다.")
+        query_key = self.input_keys[0]
+
+        if query_key not in inputs:
+            raise ValueError(
+                f"state에 '{query_key}' 키가 없습니다 (RetrieverNode '{self.name}')."
+            )
+        query_val = inputs[query_key]
+        return query_val
+
+    def _get_retriever(self):
+        # 2) vector_store.as_retriever()로 검색객체 생성
+        #    or 직접 similarity_search 호출
+        # 여기서는 구버전 방식( as_retriever + getattr(retriever, search_method) )을 예시
+        if not hasattr(self.vector_store, "as_retriever"):
+            raise TypeError("vector_store 객체가 'as_retriever()' 메서드를 지원하지 않습니다.")
+
+        retriever = self.vector_store.as_retriever(
+            search_type=self.search_type, search_kwargs=self.search_kwargs
+        )
+        search_fn = getattr(retriever, self.search_method, None)
+        if not search_fn:
+            raise ValueError(f"retriever에 메서드 '{self.search_method}'가 없습니다.")
+        return retriever, search_fn
+
     def build(self):
         """
         BFS에서 이 Node가 실행될 때 호출될 함수(node_fn)를 반환.
         node_fn이 query를 받아 vector_store 검색, 결과를 state에 저장.
         """
+        self.compile_input_plan()
 
         def node_fn(state: Dict) -> Dict:
-            # 1) query 가져오기
-            inputs = self.get_inputs(state)
-            if not self.input_keys:
-                raise ValueError(f"RetrieverNode '{self.name}'에 input_keys가 비어있습니다.")
-            query_key = self.input_keys[0]
-
-            if query_key not in inputs:
-                raise ValueError(
-                    f"state에 '{query_key}' 키가 없습니다 (RetrieverNode '{self.name}')."
-                )
-            query_val = inputs[query_key]
-
-            # 2) vector_store.as_retriever()로 검색객체 생성
-            #    or 직접 similarity_search 호출
-            # 여기서는 구버전 방식( as_retriever + getattr(retriever, search_method) )을 예시
-            if not hasattr(self.vector_store, "as_retriever"):
-                raise TypeError("vector_store 객체가 'as_retriever()' 메서드를 지원하지 않습니다.")
-
-            retriever = self.vector_store.as_retriever(
-                search_type=self.search_type, search_kwargs=self.search_kwargs
-            )
-            search_fn = getattr(retriever, self.search_method, None)
-            if not search_fn:
-                raise ValueError(f"retriever에 메서드 '{self.search_method}'가 없습니다.")
+            query_val = self._get_query(state)
+            _, search_fn = self._get_retriever()
 
             # 3) 검색 수행
             results = search_fn(query_val)
@@ -111,3 +120,24 @@ class RetrieverNode(BaseNode):
             return {self.output_key: results}
 
         return node_fn
+
+    def abuild(self):
+        """
+        async 모드 node_fn. retriever의 async 메서드(예: invoke -> ainvoke)를 사용하고,
+        async 버전이 없는 search_method는 스레드 풀에서 실행한다.
+        """
+        self.compile_input_plan()
+
+        async def node_fn(state: Dict) -> Dict:
+            query_val = self._get_query(state)
+            retriever, search_fn = self._get_retriever()
+
+            asearch_fn = getattr(retriever, f"a{self.search_method}", None)
+            if asearch_fn is not None:
+                results = await asearch_fn(query_val)
+            else:
+                results = await asyncio.to_thread(search_fn, query_val)
+
+            return {self.output_key: results}
+
+        return node_fn
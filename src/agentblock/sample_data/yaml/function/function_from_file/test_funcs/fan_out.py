@@ -0,0 +1,10 @@
+def tag_a(x: int):
+    return [f"a:{x}"]
+
+
+def tag_b(x: int):
+    return [f"b:{x}"]
+
+
+def join_tags(tags: list):
+    return ",".join(sorted(tags))
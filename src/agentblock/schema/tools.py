@@ -2,6 +2,8 @@ import yaml
 import collections
 from typing import Dict, List, Any, Set, Tuple
 
+from agentblock.reducers import REDUCER_MAP
+
 # 실행 노드와 비실행 노드(embedding, vector_store 등) 타입을 정의
 EXECUTION_TYPES = {
     "llm",
@@ -38,13 +40,13 @@ def load_yaml(yaml_path: str) -> Dict[str, Any]:
 def validate_top_level_structure(data: dict) -> None:
     """
     data는 YAML을 로드한 후의 최상위 dict.
-    - references, nodes, edges 이외의 필드가 있으면 에러
+    - references, nodes, edges, state 이외의 필드가 있으면 에러
     - references, nodes, edges 중 누락된 필드도 에러(선택적)
       (프로젝트에서 references/nodes/edges가 필수인지 여부에 따라 다르게 처리)
     """
 
     # 1) 허용되는 필드 지정
-    allowed_keys = {"references", "nodes", "edges"}
+    allowed_keys = {"references", "nodes", "edges", "state"}
 
     # 2) 실제 필드 set
     actual_keys = set(data.keys())
@@ -65,10 +67,42 @@ def validate_top_level_structure(data: dict) -> None:
         raise ValueError("'nodes' 필드는 list 형식이어야 합니다.")
     if not isinstance(data.get("edges", []), list):
         raise ValueError("'edges' 필드는 list 형식이어야 합니다.")
+    if not isinstance(data.get("state") or {}, dict):
+        raise ValueError("'state' 필드는 dict 형식이어야 합니다.")
 
     # 여기까지 통과하면 최상위 구조는 references, nodes, edges만 있고, 타입도 맞음.
 
 
+def validate_state(state: Dict[str, Any]) -> None:
+    """
+    state 섹션(state 키별 reducer 선언)에 대해:
+      - 각 항목이 {reducer: <이름>} 형태인지
+      - reducer 이름이 REDUCER_MAP에 존재하는지
+    """
+    for key, spec in state.items():
+        if not isinstance(key, str):
+            raise ValueError(f"state의 키 '{key}'가 문자열이 아닙니다.")
+        if not isinstance(spec, dict) or "reducer" not in spec:
+            raise ValueError(f"state['{key}']에 'reducer'가 없습니다.")
+        extra = set(spec.keys()) - {"reducer"}
+        if extra:
+            raise ValueError(f"state['{key}']에 허용되지 않은 필드가 있습니다: {extra}")
+        if spec["reducer"] not in REDUCER_MAP:
+            raise ValueError(
+                f"state['{key}']의 reducer '{spec['reducer']}'를 지원하지 않습니다. "
+                f"허용되는 reducer: {sorted(REDUCER_MAP)}"
+            )
+
+
+def edge_sources(edge: Dict[str, Any]) -> List[str]:
+    """
+    edge의 from을 리스트로 반환.
+    from이 리스트인 edge(join edge)는 모든 source 노드가 끝난 뒤 to를 실행한다.
+    """
+    fr = edge.get("from")
+    return list(fr) if isinstance(fr, list) else [fr]
+
+
 def validate_references(refs: List[Any]) -> Tuple[List[Dict[str, Any]], Set[str]]:
     """
     references 섹션(비실행 노드 목록)에 대해 유효성 검사:
@@ -103,6 +137,9 @@ def validate_references(refs: List[Any]) -> Tuple[List[Dict[str, Any]], Set[str]
                 f"NON_EXECUTION_TYPES에 포함되지 않습니다: {NON_EXECUTION_TYPES}"
             )
 
+        if "lazy" in ref and not isinstance(ref["lazy"], bool):
+            raise ValueError(f"references[{i}] ('{name}')의 'lazy'는 true/false여야 합니다.")
+
         non_exec_nodes.append(ref)
 
     return non_exec_nodes, ref_names
@@ -165,7 +202,7 @@ def validate_edges(edges: List[Any], node_names: Set[str]) -> Tuple[bool, bool]:
     """
     edges 배열에 대해:
       - 각 edge가 dict인지
-      - from/to가 문자열인지
+      - from/to가 문자열인지 (from은 노드명 리스트(join edge)도 허용)
       - from=START / to=END / 노드명 존재 여부
     반환값: (has_start_edge, has_end_edge)
     """
@@ -177,14 +214,26 @@ def validate_edges(edges: List[Any], node_names: Set[str]) -> Tuple[bool, bool]:
             raise ValueError(f"edges[{i}]가 dict 형태가 아닙니다.")
         fr = edge.get("from")
         to = edge.get("to")
-        if not isinstance(fr, str) or not isinstance(to, str):
+        if isinstance(fr, list):
+            # join edge: from의 모든 노드가 끝나야 to 실행 (fan-in)
+            if not fr or not all(isinstance(f, str) for f in fr):
+                raise ValueError(f"edges[{i}]의 'from' 리스트가 비었거나 문자열이 아닌 항목이 있습니다.")
+            if "START" in fr:
+                raise ValueError(f"edges[{i}]: join edge의 from에는 START를 사용할 수 없습니다.")
+            if len(set(fr)) != len(fr):
+                raise ValueError(f"edges[{i}]: join edge의 from에 중복된 노드가 있습니다: {fr}")
+            if "condition" in edge:
+                raise ValueError(f"edges[{i}]: join edge에는 condition을 지정할 수 없습니다.")
+        elif not isinstance(fr, str):
+            raise ValueError(f"edges[{i}]에 'from'/'to'가 없거나 문자열이 아닙니다.")
+        if not isinstance(to, str):
             raise ValueError(f"edges[{i}]에 'from'/'to'가 없거나 문자열이 아닙니다.")
 
-        if fr == "START":
-            has_start_edge = True
-        else:
-            if fr not in node_names:
-                raise ValueError(f"edges[{i}]의 from='{fr}'가 유효한 노드명도, START도 아닙니다.")
+        for f in edge_sources(edge):
+            if f == "START":
+                has_start_edge = True
+            elif f not in node_names:
+                raise ValueError(f"edges[{i}]의 from='{f}'가 유효한 노드명도, START도 아닙니다.")
 
         if to == "END":
             has_end_edge = True
@@ -216,18 +265,18 @@ def validate_bfs_for_execution_nodes(
     adjacency["START"] = []
 
     for edge in edges:
-        fr = edge["from"]
         to = edge["to"]
-        if fr == "START":
-            if to in execution_node_names:
-                adjacency["START"].append(to)
-        elif to == "END":
-            if fr in execution_node_names:
-                adjacency[fr].append("END")
-        else:
-            # fr->to 둘 다 실행 노드면 연결
-            if fr in execution_node_names and to in execution_node_names:
-                adjacency[fr].append(to)
+        for fr in edge_sources(edge):
+            if fr == "START":
+                if to in execution_node_names:
+                    adjacency["START"].append(to)
+            elif to == "END":
+                if fr in execution_node_names:
+                    adjacency[fr].append("END")
+            else:
+                # fr->to 둘 다 실행 노드면 연결
+                if fr in execution_node_names and to in execution_node_names:
+                    adjacency[fr].append(to)
 
     visited = set()
     queue = collections.deque()
@@ -287,10 +336,10 @@ def check_all_nodes_reach_end(execution_nodes, edges, node_names):
     # 인접 리스트 (node -> [다음 노드/END])
     adjacency = {name: [] for name in node_names}
     for edge in edges:
-        fr = edge["from"]
         to = edge["to"]
-        if fr in exec_names:
-            adjacency[fr].append(to)
+        for fr in edge_sources(edge):
+            if fr in exec_names:
+                adjacency[fr].append(to)
 
     def can_reach_end(start: str) -> bool:
         visited = set()
@@ -373,6 +422,17 @@ def validate_yaml(yaml_path: str) -> None:
     5) BFS 검사(실행 노드만)
     """
     data = load_yaml(yaml_path)
+    validate_yaml_data(data)
+
+
+def validate_yaml_data(data: Dict[str, Any]) -> None:
+    """
+    이미 파싱된 YAML dict에 대해 validate_yaml과 동일한 검사를 수행한다.
+    (파일 I/O 및 재파싱 없이 프로그램에서 생성한 그래프를 검증할 때 사용)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("YAML 데이터의 최상위 구조가 dict가 아닙니다.")
+
     # top level에 references, nodes, edges 외의 구조가 존재하는지 검증
     validate_top_level_structure(data)
 
@@ -389,6 +449,9 @@ def validate_yaml(yaml_path: str) -> None:
     if not isinstance(edges, list):
         raise ValueError("'edges' 필드가 list 형태가 아닙니다.")
 
+    # state 섹션(reducer) 검증
+    validate_state(data.get("state") or {})
+
     # 1) references 검증
     non_exec_refs, ref_names = validate_references(references)
 
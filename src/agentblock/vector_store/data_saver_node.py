@@ -1,8 +1,14 @@
-from typing import Dict, Any
+import asyncio
+from collections.abc import Iterator
+from typing import Dict, Any, List, Tuple
 from agentblock.function.base import FunctionNode
 from langchain.docstore.document import Document
+from langchain_community.vectorstores import FAISS
 from langchain_core.vectorstores import VectorStore
 from agentblock.function.base import FunctionResult
+from agentblock.lazy_reference import LazyReference
+from agentblock.vector_store.faiss_utils import add_embedding_matrix
+from agentblock.vector_store.sharded_faiss import ShardedFAISS
 
 
 class DataSaverNode(FunctionNode):
@@ -10,6 +16,14 @@ class DataSaverNode(FunctionNode):
     DataSaverNode는 입력 데이터를 벡터 스토어에 저장하는 실행 노드입니다.
     YAML 설정에서 vector_store 레퍼런스를 받아, 해당 저장소에 문서를 추가합니다.
 
+    입력 값은 두 가지 형태를 받을 수 있습니다.
+    - List[Document]: 벡터 스토어의 임베딩으로 임베딩한 뒤 저장
+    - (List[Document], vectors): EmbeddingNode 출력. 미리 계산된 벡터를 그대로 저장합니다.
+      vectors가 float32 행렬(output_format: numpy)이면 FAISS에 복사 없이 추가됩니다.
+    - iterator / generator: EmbeddingNode 스트리밍 출력(stream_batch_size)처럼
+      (doc_batch, vectors) 튜플이나 Document(또는 Document 리스트)를 차례로 내보내는 스트림.
+      항목을 하나씩 꺼내 바로 벡터 스토어에 추가하고, 스트림을 모두 소비한 뒤 한 번만 저장합니다.
+
     예시 YAML 설정:
 
     nodes:
@@ -67,34 +81,157 @@ class DataSaverNode(FunctionNode):
         # 이 노드는 외부 Python 함수를 import할 필요가 없으므로, 별도 처리가 필요하지 않습니다.
         pass
 
-    def call_target_function(self, inputs: Dict[str, Any]) -> Any:
-        """
-        입력 데이터("documents")를 벡터 스토어에 저장합니다.
-        - 입력 데이터가 문자열이면 Document 객체로 변환합니다.
-        - 저장 후, 저장된 문서 수와 상태 정보를 반환합니다.
-        """
-        # 입력에서 "documents" 키의 데이터를 가져옵니다.
-        # 문서 리스트 가져오기
-        docs = list()
-        for docs_each in inputs.values():
-            docs.extend(docs_each)
-
-        if len(docs) == 0:
-            raise ValueError("No documents to save.")
+    @staticmethod
+    def _is_embedded(value: Any) -> bool:
+        # EmbeddingNode 출력: (List[Document], vectors) 튜플
+        return (
+            isinstance(value, tuple)
+            and len(value) == 2
+            and isinstance(value[0], (list, tuple))
+            and not isinstance(value[1], Document)
+        )
 
+    @staticmethod
+    def _check_documents(docs: List[Any]) -> None:
         for doc in docs:
             if not isinstance(doc, Document):
                 raise ValueError(
                     f"The inputs must be an instance of Document, got {type(doc)}"
                 )
 
-        if isinstance(self.reference, VectorStore):
-            self.reference.add_documents(docs)
-            self.reference.save()
-            # 저장 후, 상태와 저장된 문서 수를 반환합니다.
-            result = {"status": "saved", "num_docs": len(docs), "path_save": self.reference.path_save}
-            return FunctionResult(value=result)
-        else:
+    def _collect_documents(
+        self, inputs: Dict[str, Any]
+    ) -> Tuple[List[Document], List[Tuple[List[Document], Any]], List[Iterator]]:
+        """
+        입력을 (임베딩이 필요한 문서 리스트, 미리 임베딩된 (docs, vectors) 목록, 스트림 목록)으로 나눕니다.
+        스트림은 여기서 소비하지 않습니다.
+        """
+        docs = list()
+        embedded = list()
+        streams = list()
+        for value in inputs.values():
+            if self._is_embedded(value):
+                embedded.append(value)
+            elif isinstance(value, Iterator):
+                streams.append(value)
+            else:
+                docs.extend(value)
+
+        all_docs = docs + [doc for embedded_docs, _ in embedded for doc in embedded_docs]
+        if len(all_docs) == 0 and not streams:
+            raise ValueError("No documents to save.")
+        self._check_documents(all_docs)
+
+        if not isinstance(self.reference, VectorStore):
             raise ValueError(
                 f"Reference must be an instance of VectorStore, got {type(self.reference)}"
             )
+        return docs, embedded, streams
+
+    def _add_stream_item(self, item: Any) -> int:
+        """스트림 항목 하나를 추가하고 추가된 문서 수를 반환합니다."""
+        if self._is_embedded(item):
+            embedded_docs, vectors = item
+            self._check_documents(embedded_docs)
+            if embedded_docs:
+                self._add_embedded(embedded_docs, vectors)
+            return len(embedded_docs)
+        docs = [item] if isinstance(item, Document) else list(item)
+        self._check_documents(docs)
+        if docs:
+            self.reference.add_documents(docs)
+        return len(docs)
+
+    @staticmethod
+    def _check_streamed(num_docs: int) -> None:
+        if num_docs == 0:
+            raise ValueError("No documents to save.")
+
+    def _add_embedded(self, docs: List[Document], vectors: Any) -> None:
+        """미리 계산된 벡터를 임베딩 재계산 없이 저장합니다."""
+        store = self.reference
+        if isinstance(store, LazyReference):
+            # lazy 프록시는 FAISS 타입 검사를 통과하지 못하므로 실제 스토어로 분기한다
+            store = store.materialize()
+        if isinstance(store, FAISS):
+            add_embedding_matrix(store, docs, vectors)
+            return
+        if isinstance(store, ShardedFAISS):
+            # 행렬을 샤드별로 나눠 각 샤드에 복사 없이 추가
+            store.add_embedding_matrix(docs, vectors)
+            return
+        # FAISS 외 벡터 스토어: add_embeddings(text, vector) 인터페이스 사용
+        if not hasattr(store, "add_embeddings"):
+            raise ValueError(
+                f"{type(store).__name__} does not support precomputed embeddings."
+            )
+        if hasattr(vectors, "tolist"):
+            vectors = vectors.tolist()
+        store.add_embeddings(
+            text_embeddings=[(doc.page_content, vector) for doc, vector in zip(docs, vectors)],
+            metadatas=[doc.metadata for doc in docs],
+        )
+
+    def _add_all(self, docs: List[Document], embedded: List[Tuple[List[Document], Any]]) -> None:
+        for embedded_docs, vectors in embedded:
+            self._add_embedded(embedded_docs, vectors)
+        if docs:
+            self.reference.add_documents(docs)
+
+    def _make_result(
+        self,
+        docs: List[Document],
+        embedded: List[Tuple[List[Document], Any]],
+        num_streamed: int = 0,
+    ) -> FunctionResult:
+        # 저장 후, 상태와 저장된 문서 수를 반환합니다.
+        num_docs = len(docs) + sum(len(embedded_docs) for embedded_docs, _ in embedded)
+        num_docs += num_streamed
+        result = {"status": "saved", "num_docs": num_docs, "path_save": self.reference.path_save}
+        return FunctionResult(value=result)
+
+    def call_target_function(self, inputs: Dict[str, Any]) -> Any:
+        """
+        입력 데이터("documents")를 벡터 스토어에 저장합니다.
+        - 입력 데이터가 문자열이면 Document 객체로 변환합니다.
+        - 저장 후, 저장된 문서 수와 상태 정보를 반환합니다.
+        """
+        docs, embedded, streams = self._collect_documents(inputs)
+        self._add_all(docs, embedded)
+        num_streamed = 0
+        for stream in streams:
+            for item in stream:
+                num_streamed += self._add_stream_item(item)
+        if streams and not docs and not embedded:
+            self._check_streamed(num_streamed)
+        self.reference.save()
+        return self._make_result(docs, embedded, num_streamed)
+
+    async def acall_target_function(self, inputs: Dict[str, Any]) -> Any:
+        """
+        call_target_function의 async 버전.
+        문서 추가는 aadd_documents로, 미리 계산된 벡터 추가와 디스크 저장(save)은 스레드 풀에서 수행합니다.
+        스트림은 항목을 꺼내는 작업(임베딩 포함)과 추가를 함께 스레드 풀에서 한 항목씩 수행합니다.
+        """
+        docs, embedded, streams = self._collect_documents(inputs)
+        for embedded_docs, vectors in embedded:
+            await asyncio.to_thread(self._add_embedded, embedded_docs, vectors)
+        if docs:
+            await self.reference.aadd_documents(docs)
+        num_streamed = 0
+        for stream in streams:
+            while True:
+                added = await asyncio.to_thread(self._add_next, stream)
+                if added is None:
+                    break
+                num_streamed += added
+        if streams and not docs and not embedded:
+            self._check_streamed(num_streamed)
+        await asyncio.to_thread(self.reference.save)
+        return self._make_result(docs, embedded, num_streamed)
+
+    def _add_next(self, stream: Iterator) -> Any:
+        # 스트림이 끝나면 None (StopIteration은 asyncio.to_thread 경계를 넘길 수 없음)
+        for item in stream:
+            return self._add_stream_item(item)
+        return None
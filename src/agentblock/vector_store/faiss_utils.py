@@ -1,45 +1,990 @@
 import os
+import json
+import uuid
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
 import faiss
+import numpy as np
+from langchain_core.documents import Document
 from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.embeddings.embeddings import Embeddings
 
+from agentblock.lazy_reference import LazyReference
+from agentblock.vector_store import segment_store
+from agentblock.vector_store.mmap_docstore import MmapDocstore, ensure_mmap_docstore
+from agentblock.vector_store.sqlite_docstore import (
+    DEFAULT_SQLITE_FILE,
+    SQLiteDocstore,
+    parse_docstore,
+)
+
+# param.index.type -> 설명
+INDEX_TYPES = {
+    "flat": "float32 원본 벡터 (정확한 검색, 압축 없음)",
+    "sq_fp16": "scalar quantization fp16 (벡터당 2 bytes x dim)",
+    "sq8": "scalar quantization int8 (벡터당 1 byte x dim)",
+    "pq": "product quantization (벡터당 m x nbits / 8 bytes)",
+    "ivf_pq": "IVF + product quantization (역색인으로 일부 cluster만 검색)",
+    "ivf_flat": "IVF + float32 원본 벡터 (역색인으로 일부 cluster만 검색)",
+    "hnsw": "HNSW graph + float32 원본 벡터 (학습 불필요, 그래프 탐색)",
+}
+
+# 검색 시 파라미터 (faiss.ParameterSpace 이름). 저장 후 다시 로드할 때도 적용된다
+SEARCH_PARAMS = ("nprobe", "efSearch")
+
+# 인덱스 구조를 결정하는 설정 키 (로드 시 저장된 인덱스와 비교)
+_STRUCTURE_KEYS = ("type", "factory", "m", "nbits", "nlist", "hnsw_m")
+
+# 학습이 필요한 인덱스에서 기본으로 사용할 학습 sample 수
+DEFAULT_TRAIN_SIZE = 50000
+
+# k-means centroid 하나당 필요한 학습 벡터 수 (faiss가 이보다 적으면 경고하는 기준)
+TRAIN_POINTS_PER_CENTROID = 39
+
+# full 형식에서 학습 전 buffer를 저장하는 파일 이름 ({name}.npy / {name}.docs.pkl)
+TRAIN_BUFFER_NAME = "train_buffer"
+
+# 저장된 인덱스 옆에 두는 메타데이터 파일 (차원 / 임베딩 모델 identity / 인덱스 설정)
+META_FILE_NAME = "agentblock_meta.json"
+
+
+def embedding_identity(embedding: Embeddings) -> str:
+    """
+    벡터 스토어에 기록할 임베딩 모델 identity (네트워크 호출 없음).
+    - model_id 속성: EmbeddingReference가 만든 임베딩 (provider + param, 래퍼 / lazy 여부와 무관)
+    - 래퍼(RateLimitedEmbedding 등): 감싼 임베딩의 identity
+    - LazyReference: GraphBuilder가 채운 model_id, 없으면 실제 객체의 identity
+    - model / model_name 속성이 있으면 "클래스명:모델명"
+    - 그 외: "클래스명:{공개 설정값}" (예: HashingEmbedding의 dimension, seed)
+    """
+    model_id = getattr(embedding, "model_id", None)
+    if isinstance(model_id, str):
+        return model_id
+    if isinstance(embedding, LazyReference):
+        return embedding_identity(embedding.materialize())
+    inner = vars(embedding).get("embedding")
+    if isinstance(inner, Embeddings):
+        return embedding_identity(inner)
+
+    name = type(embedding).__name__
+    for attr in ("model", "model_name"):
+        model = getattr(embedding, attr, None)
+        if isinstance(model, str):
+            return f"{name}:{model}"
+    config = {
+        k: list(v) if isinstance(v, tuple) else v
+        for k, v in sorted(vars(embedding).items())
+        if not k.startswith("_") and isinstance(v, (str, int, float, bool, tuple))
+    }
+    return f"{name}:{json.dumps(config, sort_keys=True)}"
+
+
+def read_meta(path: str) -> Optional[Dict[str, Any]]:
+    meta_path = os.path.join(path, META_FILE_NAME)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_meta(path: str, meta: Dict[str, Any]) -> None:
+    os.makedirs(path, exist_ok=True)
+    meta_path = os.path.join(path, META_FILE_NAME)
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, meta_path)
+
+
+def index_factory_string(
+    dimension: int, index_cfg: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    param.index 설정 -> faiss.index_factory 문자열.
+      index:
+        type: ivf_pq   # flat | sq_fp16 | sq8 | pq | ivf_pq | ivf_flat | hnsw
+        m: 16          # pq / ivf_pq: sub-quantizer 수 (dimension의 약수, 기본 dimension // 4)
+        nbits: 8       # pq / ivf_pq: sub-quantizer당 bit 수
+        nlist: 1024    # ivf_pq / ivf_flat: cluster 수
+        hnsw_m: 32     # hnsw: 노드당 이웃 수
+    factory가 있으면 type 대신 그대로 사용합니다 (예: "IVF4096,PQ32x8", "HNSW32,SQ8").
+    """
+    index_cfg = index_cfg or {}
+    factory = index_cfg.get("factory")
+    if factory is not None:
+        if not isinstance(factory, str) or not factory.strip():
+            raise ValueError(
+                f"FAISS index 'factory' must be a non-empty string, got {factory!r}"
+            )
+        return factory.strip()
+    index_type = index_cfg.get("type", "flat")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported FAISS index type: {index_type}. Allowed: {sorted(INDEX_TYPES)}"
+        )
+
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "sq_fp16":
+        return "SQfp16"
+    if index_type == "sq8":
+        return "SQ8"
+    if index_type == "ivf_flat":
+        return f"IVF{index_cfg.get('nlist', 1024)},Flat"
+    if index_type == "hnsw":
+        return f"HNSW{index_cfg.get('hnsw_m', 32)}"
+
+    m = index_cfg.get("m", max(1, dimension // 4))
+    nbits = index_cfg.get("nbits", 8)
+    if dimension % m != 0:
+        raise ValueError(
+            f"PQ 'm' ({m}) must divide the vector dimension ({dimension})."
+        )
+    if index_type == "pq":
+        return f"PQ{m}x{nbits}"
+    return f"IVF{index_cfg.get('nlist', 1024)},PQ{m}x{nbits}"
+
+
+def _find_hnsw(index: faiss.Index) -> Optional[Any]:
+    """인덱스(또는 IVF quantizer)의 HNSW graph. 없으면 None"""
+    index = faiss.downcast_index(index)
+    if hasattr(index, "hnsw"):
+        return index.hnsw
+    quantizer = getattr(index, "quantizer", None)
+    if quantizer is not None:
+        return _find_hnsw(quantizer)
+    return None
+
+
+def create_index(
+    dimension: int, index_cfg: Optional[Dict[str, Any]] = None
+) -> faiss.Index:
+    """param.index 설정으로 (아직 학습되지 않았을 수 있는) L2 FAISS 인덱스를 생성합니다."""
+    index_cfg = index_cfg or {}
+    factory = index_factory_string(dimension, index_cfg)
+    try:
+        index = faiss.index_factory(dimension, factory)
+    except RuntimeError as e:
+        raise ValueError(f"Invalid FAISS index factory '{factory}': {e}") from e
+
+    ef_construction = index_cfg.get("efConstruction")
+    if ef_construction is not None:
+        # 그래프를 만드는 add 전에 설정해야 한다
+        hnsw = _find_hnsw(index)
+        if hnsw is None:
+            raise ValueError(
+                f"'efConstruction' requires an HNSW index, got '{factory}'."
+            )
+        hnsw.efConstruction = ef_construction
+    apply_search_params(index, index_cfg)
+    return index
+
+
+def apply_search_params(
+    index: faiss.Index, index_cfg: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    검색 시 파라미터(nprobe / efSearch)를 인덱스에 적용합니다.
+    faiss.ParameterSpace를 사용하므로 IVF quantizer 안의 HNSW 등 중첩된 인덱스에도 적용됩니다.
+    """
+    index_cfg = index_cfg or {}
+    space = faiss.ParameterSpace()
+    for name in SEARCH_PARAMS:
+        value = index_cfg.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(
+                f"FAISS search parameter '{name}' must be a positive int, got {value!r}"
+            )
+        try:
+            space.set_index_parameter(index, name, value)
+        except RuntimeError as e:
+            raise ValueError(
+                f"FAISS index {type(faiss.downcast_index(index)).__name__} "
+                f"does not support '{name}'."
+            ) from e
+
+
+def min_training_points(index: faiss.Index) -> int:
+    """
+    인덱스를 학습하는 데 필요한 최소 벡터 수.
+    - k-means로 학습되는 centroid 수(IVF nlist, PQ 2^nbits) 중 큰 값 x TRAIN_POINTS_PER_CENTROID
+    - k-means가 없는 인덱스(SQ)는 1, 학습이 필요 없거나 이미 학습된 인덱스는 0
+    """
+    if index.is_trained:
+        return 0
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexPreTransform):
+        index = faiss.downcast_index(index.index)
+    ivf = faiss.try_extract_index_ivf(index)
+    centroids = 1
+    if ivf is not None:
+        centroids = ivf.nlist
+        index = faiss.downcast_index(ivf)
+    pq = getattr(index, "pq", None)
+    if pq is not None:
+        centroids = max(centroids, 1 << pq.nbits)
+    return 1 if centroids == 1 else centroids * TRAIN_POINTS_PER_CENTROID
+
 
-def create_faiss_vector_store(embedding_model: Embeddings, path: str = None, **kwargs):
+def train_index(
+    index: faiss.Index, vectors: np.ndarray, train_size: int = DEFAULT_TRAIN_SIZE
+):
+    """
+    학습이 필요한 인덱스(SQ / PQ / IVF)를 vectors에서 뽑은 sample로 학습합니다.
+    sample 수는 train_size (min_training_points보다 작으면 min_training_points).
+    이미 학습된 인덱스(flat 포함)는 아무것도 하지 않습니다.
+    """
+    if index.is_trained:
+        return
+    train_size = max(train_size, min_training_points(index))
+    if len(vectors) > train_size:
+        # 재현 가능하도록 고정 seed로 sample 추출
+        rows = np.random.default_rng(0).choice(
+            len(vectors), size=train_size, replace=False
+        )
+        vectors = vectors[np.sort(rows)]
+    try:
+        index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+    except RuntimeError as e:
+        raise ValueError(
+            f"Failed to train FAISS index on {len(vectors)} vectors "
+            f"(recommended minimum: {min_training_points(index)}): {e}"
+        ) from e
+
+
+class ManagedFAISS(FAISS):
+    """
+    create_faiss_vector_store가 반환하는 FAISS VectorStore.
+    - 모든 add 경로(add_texts / add_embeddings / aadd_texts / add_embedding_matrix)를
+      add_embedding_matrix로 모읍니다.
+    - 학습이 필요한 인덱스는 추가된 벡터를 min_training_points개가 모일 때까지 buffer에 두었다가
+      한 번에 학습 / 추가합니다 (작은 batch 하나로 학습하지 않도록). buffer도 save()에 저장됩니다.
+    - save(): 생성 시 지정한 path에 인덱스와 메타데이터(차원 / 모델 identity)를 저장합니다.
+      - persistence mode full: 매번 인덱스 + docstore 전체를 다시 쓴다 (FAISS.save_local)
+      - persistence mode segments: 마지막 save 이후 추가된 벡터 / 문서만 새 segment 파일로 쓰고
+        manifest.json을 원자적으로 교체한다. compact()는 segment들을 base 파일 하나로 합친다.
+    - read_only: add / delete / save / compact를 거부합니다 (mmap으로 연 인덱스는 수정하면 안 된다).
+    """
+
+    path_save: Optional[str] = None
+    train_size: int = DEFAULT_TRAIN_SIZE
+    meta: Optional[Dict[str, Any]] = None
+    persistence: Dict[str, Any] = segment_store.parse_persistence(None)
+    read_only: bool = False
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # segments 모드: 마지막 save 이후 추가된 (ids, docs, 행렬) 목록
+        self._pending: List[Tuple[List[str], List[Document], np.ndarray]] = []
+        self._manifest: Optional[Dict[str, Any]] = None
+        # 인덱스 전체를 다시 써야 하는 경우 (첫 저장 / delete / 학습 전 base)
+        self._needs_base = True
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self._compaction_error: Optional[BaseException] = None
+        # 학습 전 인덱스에 추가된 (ids, docs, 행렬) 목록
+        self._train_buffer: List[Tuple[List[str], List[Document], np.ndarray]] = []
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ValueError(f"Vector store '{self.path_save}' is read-only.")
+
+    def _add_vectors(
+        self,
+        texts: Sequence[str],
+        embeddings: Any,
+        metadatas: Optional[Iterable[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        docs = [
+            Document(page_content=text, metadata=metadata or {})
+            for text, metadata in zip(texts, metadatas)
+        ]
+        return add_embedding_matrix(self, docs, embeddings, ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        self._check_writable()  # 임베딩을 계산하기 전에 거부
+        texts = list(texts)
+        return self._add_vectors(texts, self._embed_documents(texts), metadatas, ids)
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        self._check_writable()
+        texts = list(texts)
+        embeddings = await self._aembed_documents(texts)
+        return self._add_vectors(texts, embeddings, metadatas, ids)
+
+    def add_embeddings(
+        self,
+        text_embeddings: Iterable[Tuple[str, List[float]]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts, embeddings = zip(*text_embeddings)
+        return self._add_vectors(texts, embeddings, metadatas, ids)
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 4, **kwargs):
+        # 학습 전 인덱스는 검색할 수 없다
+        if self.index.ntotal == 0:
+            if self._train_buffer:
+                raise ValueError(
+                    f"FAISS index is not trained yet: {self.num_buffered()} vectors are "
+                    f"buffered, training needs at least {min_training_points(self.index)}. "
+                    "Add more documents or use a smaller nlist / nbits."
+                )
+            return []
+        return super().similarity_search_with_score_by_vector(embedding, k=k, **kwargs)
+
+    # ---------- 학습 전 buffer ----------
+
+    def num_buffered(self) -> int:
+        """학습을 기다리며 아직 인덱스에 들어가지 않은 벡터 수"""
+        return sum(len(ids) for ids, _, _ in self._train_buffer)
+
+    def buffered_ids(self) -> List[str]:
+        return [id_ for ids, _, _ in self._train_buffer for id_ in ids]
+
+    def _buffered(self) -> Tuple[List[str], List[Document], np.ndarray]:
+        ids = self.buffered_ids()
+        docs = [doc for _, batch_docs, _ in self._train_buffer for doc in batch_docs]
+        matrix = np.concatenate([matrix for _, _, matrix in self._train_buffer])
+        return ids, docs, matrix
+
+    def _buffer_for_training(
+        self, ids: List[str], docs: List[Document], matrix: np.ndarray
+    ) -> None:
+        """학습 전 인덱스: buffer에 쌓고, 충분히 모이면 학습한 뒤 buffer 전체를 추가 (lock 안에서 호출)"""
+        self._train_buffer.append((ids, docs, matrix))
+        if self.num_buffered() < min_training_points(self.index):
+            return
+        ids, docs, matrix = self._buffered()
+        self._train_buffer = []
+        train_index(self.index, matrix, self.train_size)
+        _add_to_index(self, ids, docs, matrix)
+
+    def _delete_buffered(self, ids: List[str]) -> List[str]:
+        """buffer에 있는 id를 지우고, buffer에 없던 id 목록을 반환 (lock 안에서 호출)"""
+        remove = set(ids) & set(self.buffered_ids())
+        if not remove:
+            return ids
+        kept = []
+        for batch_ids, batch_docs, batch_matrix in self._train_buffer:
+            rows = [i for i, id_ in enumerate(batch_ids) if id_ not in remove]
+            if rows:
+                kept.append(
+                    (
+                        [batch_ids[i] for i in rows],
+                        [batch_docs[i] for i in rows],
+                        batch_matrix[rows],
+                    )
+                )
+        self._train_buffer = kept
+        return [id_ for id_ in ids if id_ not in remove]
+
+    def _save_train_buffer(self) -> None:
+        # full 형식: buffer는 train_buffer 파일로 저장하고, 비어 있으면 지운다
+        if self._train_buffer:
+            segment_store.write_segment(
+                self.path_save, TRAIN_BUFFER_NAME, *self._buffered()
+            )
+        else:
+            segment_store.remove_files(self.path_save, None, [TRAIN_BUFFER_NAME])
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        self._check_writable()
+        with self._lock:
+            if ids and self._train_buffer:
+                ids = self._delete_buffered(ids)
+                if not ids:
+                    return True
+            result = super().delete(ids, **kwargs)
+            # 벡터 위치가 바뀌므로 segment로 이어 쓸 수 없다 -> 다음 save에서 base를 새로 쓴다
+            self._pending = []
+            self._needs_base = True
+        return result
+
+    def merge_from(self, target: FAISS) -> None:
+        self._check_writable()
+        with self._lock:
+            super().merge_from(target)
+            self._pending = []
+            self._needs_base = True
+
+    def _track_added(
+        self, ids: List[str], docs: List[Document], matrix: np.ndarray
+    ) -> None:
+        # add_embedding_matrix에서 호출. full 모드에서는 추적하지 않는다
+        if self.persistence["mode"] == "segments" and not self._needs_base:
+            self._pending.append((ids, docs, matrix))
+
+    def save(self) -> None:
+        if self.path_save is None:
+            raise ValueError(
+                "Vector store was created without 'path'; nothing to save to."
+            )
+        self._check_writable()
+        self._raise_compaction_error()
+        if self.persistence["mode"] == "segments":
+            self._save_segments()
+        else:
+            with self._lock:
+                self.save_local(self.path_save)
+                self._save_train_buffer()
+                self._commit_docstore_deletes()
+                # segments 형식으로 저장되어 있던 경우 full 형식으로 전환
+                manifest = segment_store.read_manifest(self.path_save)
+                if manifest is not None:
+                    os.remove(
+                        os.path.join(self.path_save, segment_store.MANIFEST_FILE_NAME)
+                    )
+                    names = [segment["name"] for segment in manifest["segments"]]
+                    segment_store.remove_files(self.path_save, manifest["base"], names)
+        write_meta(self.path_save, self.meta or {"dimension": self.index.d})
+
+    def _commit_docstore_deletes(self) -> None:
+        # 인덱스를 쓴 뒤에 SQLiteDocstore의 delete를 반영한다 (lock 안에서 호출)
+        # save 전에 종료되면 디스크의 인덱스와 docstore가 모두 delete 이전 상태로 남는다
+        if isinstance(self.docstore, SQLiteDocstore):
+            self.docstore.commit_deletes()
+
+    # ---------- segments 형식 ----------
+
+    def _save_segments(self) -> None:
+        with self._lock:
+            if self._needs_base or self._manifest is None:
+                self._write_base_inline()
+            else:
+                self._flush_pending()
+            self._commit_docstore_deletes()
+            num_segments = len(self._manifest["segments"])
+        max_segments = self.persistence["max_segments"]
+        if max_segments is not None and num_segments >= max_segments:
+            self.compact(wait=not self.persistence["background"])
+
+    def _flush_pending(self) -> None:
+        """pending 벡터를 새 segment 하나로 쓰고 manifest에 추가 (lock 안에서 호출)"""
+        if not self._pending:
+            return
+        ids = [id_ for batch_ids, _, _ in self._pending for id_ in batch_ids]
+        docs = [doc for _, batch_docs, _ in self._pending for doc in batch_docs]
+        matrix = np.concatenate([batch_matrix for _, _, batch_matrix in self._pending])
+        name = segment_store.next_name(self._manifest, "seg")
+        segment_store.write_segment(self.path_save, name, ids, docs, matrix)
+        self._manifest["segments"].append({"name": name, "count": len(ids)})
+        segment_store.write_manifest(self.path_save, self._manifest)
+        self._pending = []
+
+    def _snapshot(self) -> Tuple[np.ndarray, Any, Dict[int, str]]:
+        # 백그라운드에서 쓰는 동안 add가 계속되어도 되도록 현재 상태를 복사 (lock 안에서 호출)
+        # SQLiteDocstore는 이미 디스크에 있으므로 경로만 pickle 된다
+        docstore = self.docstore
+        if isinstance(docstore, InMemoryDocstore):
+            docstore = InMemoryDocstore(dict(docstore._dict))
+        return (
+            faiss.serialize_index(self.index),
+            docstore,
+            dict(self.index_to_docstore_id),
+        )
+
+    def _write_base_inline(self) -> None:
+        """현재 상태 전체를 새 base로 쓰고 기존 segment를 모두 대체한다 (lock 안에서 호출)"""
+        manifest = self._manifest or segment_store.read_manifest(self.path_save)
+        manifest = manifest or segment_store.new_manifest()
+        old_base = manifest["base"]
+        old_segments = [segment["name"] for segment in manifest["segments"]]
+
+        name = segment_store.next_name(manifest, "base")
+        segment_store.write_base(self.path_save, name, *self._snapshot())
+        manifest.update(
+            base=name, base_trained=bool(self.index.is_trained), segments=[]
+        )
+        if self._train_buffer:
+            # 학습 전 buffer는 segment로 쓴다 (로드 시 다시 buffer로 들어간다)
+            buffer_name = segment_store.next_name(manifest, "seg")
+            ids, docs, matrix = self._buffered()
+            segment_store.write_segment(self.path_save, buffer_name, ids, docs, matrix)
+            manifest["segments"].append({"name": buffer_name, "count": len(ids)})
+        segment_store.write_manifest(self.path_save, manifest)
+        segment_store.remove_files(self.path_save, old_base, old_segments)
+
+        self._manifest = manifest
+        self._pending = []
+        # 학습 전 인덱스를 base로 쓴 경우, 학습 후 첫 save에서 base를 다시 쓴다
+        self._needs_base = not self.index.is_trained
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        segment들을 base 파일 하나로 합칩니다.
+        - 저장되지 않은 벡터는 먼저 segment로 쓴 뒤, 그 시점의 상태를 복사해서 base로 씁니다.
+        - wait=False이면 base 쓰기를 백그라운드 스레드에서 수행하며, 그동안 add / save는 계속 가능합니다.
+          (compaction 도중 추가된 segment는 그대로 유지)
+        """
+        if self.path_save is None:
+            raise ValueError(
+                "Vector store was created without 'path'; nothing to compact."
+            )
+        self._check_writable()
+        if self.persistence["mode"] != "segments":
+            raise ValueError("compact() requires persistence mode 'segments'.")
+        self._raise_compaction_error()
+
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                if not wait:
+                    return  # 이미 진행 중
+                compaction = self._compaction
+            else:
+                compaction = None
+        if compaction is not None:
+            compaction.join()
+            self._raise_compaction_error()
+
+        with self._lock:
+            if self._needs_base or self._manifest is None:
+                self._write_base_inline()
+                return
+            self._flush_pending()
+            if not self._manifest["segments"]:
+                return
+            covered = [segment["name"] for segment in self._manifest["segments"]]
+            name = segment_store.next_name(self._manifest, "base")
+            snapshot = self._snapshot()
+            trained = bool(self.index.is_trained)
+
+        if wait:
+            self._finish_compaction(name, snapshot, covered, trained)
+            return
+        self._compaction = threading.Thread(
+            target=self._run_compaction,
+            args=(name, snapshot, covered, trained),
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def _run_compaction(self, *args: Any) -> None:
+        try:
+            self._finish_compaction(*args)
+        except BaseException as e:  # 다음 save / compact 호출에서 다시 발생시킨다
+            self._compaction_error = e
+
+    def _finish_compaction(
+        self,
+        name: str,
+        snapshot: Tuple[np.ndarray, Any, Dict[int, str]],
+        covered: List[str],
+        trained: bool,
+    ) -> None:
+        segment_store.write_base(self.path_save, name, *snapshot)
+        with self._lock:
+            manifest = self._manifest
+            old_base = manifest["base"]
+            manifest.update(
+                base=name,
+                base_trained=trained,
+                segments=[s for s in manifest["segments"] if s["name"] not in covered],
+            )
+            segment_store.write_manifest(self.path_save, manifest)
+        segment_store.remove_files(self.path_save, old_base, covered)
+
+    def wait_for_compaction(self) -> None:
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        self._raise_compaction_error()
+
+    def _raise_compaction_error(self) -> None:
+        error, self._compaction_error = self._compaction_error, None
+        if error is not None:
+            raise RuntimeError(f"Background compaction failed: {error}") from error
+
+
+def known_dimension(embedding_model: Embeddings) -> Optional[int]:
+    """
+    모델을 로드하거나 호출하지 않고 알 수 있는 임베딩 차원 (모르면 None).
+    - 아직 생성되지 않은 LazyReference는 생성하지 않는다
+    - known_dimension 속성(ProcessPoolEmbedding 등)이 있으면 dimension 대신 사용한다
+      (dimension 속성은 워커 프로세스를 띄워 모델을 로드할 수 있음)
+    """
+    if isinstance(embedding_model, LazyReference):
+        if not embedding_model.is_materialized:
+            return None
+        return known_dimension(embedding_model.materialize())
+    for attr in ("known_dimension", "dimension"):
+        try:
+            value = getattr(embedding_model, attr)
+        except AttributeError:
+            continue
+        return value if isinstance(value, int) else None
+    return None
+
+
+def resolve_dimension(
+    embedding_model: Embeddings, dimension: Optional[int] = None
+) -> int:
+    """
+    새 인덱스의 벡터 차원: 설정값 -> 임베딩 객체의 dimension 속성 -> (둘 다 없을 때만) 실제 임베딩 호출
+    """
+    if dimension is not None:
+        return int(dimension)
+    attr = getattr(embedding_model, "dimension", None)
+    if isinstance(attr, int):
+        return attr
+    # 차원을 알 수 없는 경우에만 "hello" 문장을 임베딩해서 차원 수를 파악
+    return len(embedding_model.embed_query("hello"))
+
+
+def _check_meta(
+    path: str,
+    meta: Dict[str, Any],
+    embedding_model: Embeddings,
+    dimension: Optional[int],
+    model_id: str,
+) -> None:
+    """
+    저장된 메타데이터와 현재 설정이 다르면 로드 전에 실패.
+    임베딩 차원은 모델을 로드하지 않고 알 수 있을 때만 비교한다 (known_dimension).
+    """
+    stored_dim = meta.get("dimension")
+    expected = [
+        ("config", dimension),
+        ("embedding", known_dimension(embedding_model)),
+    ]
+    for source, value in expected:
+        if isinstance(value, int) and stored_dim is not None and value != stored_dim:
+            raise ValueError(
+                f"Vector store '{path}' has dimension {stored_dim}, "
+                f"but the {source} dimension is {value}."
+            )
+    stored_model = meta.get("model_id")
+    if stored_model is not None and stored_model != model_id:
+        raise ValueError(
+            f"Vector store '{path}' was built with embedding model '{stored_model}', "
+            f"but the configured embedding is '{model_id}'."
+        )
+
+
+def _loaded_index_cfg(
+    path: str, meta: Optional[Dict[str, Any]], index_cfg: Dict[str, Any], dimension: int
+) -> Dict[str, Any]:
+    """
+    저장된 인덱스를 로드할 때 사용할 index 설정.
+    - 구조(type / factory 등)는 저장된 인덱스를 따른다. 설정에 구조가 있는데 저장된 것과 다르면 ValueError
+    - 검색 파라미터(nprobe / efSearch)는 현재 설정 -> 저장된 설정 순으로 적용
+    """
+    stored_cfg = dict((meta or {}).get("index") or {})
+    if stored_cfg and any(key in index_cfg for key in _STRUCTURE_KEYS):
+        stored_factory = index_factory_string(dimension, stored_cfg)
+        configured_factory = index_factory_string(dimension, index_cfg)
+        if stored_factory != configured_factory:
+            raise ValueError(
+                f"Vector store '{path}' was built with index '{stored_factory}', "
+                f"but the configured index is '{configured_factory}'."
+            )
+    merged = dict(stored_cfg)
+    merged.update(index_cfg)
+    return merged
+
+
+def is_saved_store(path: Optional[str]) -> bool:
+    """path에 저장된 인덱스가 있는지 (full 형식의 index.faiss 또는 segments 형식의 manifest)"""
+    if path is None:
+        return False
+    return os.path.exists(os.path.join(path, "index.faiss")) or (
+        segment_store.read_manifest(path) is not None
+    )
+
+
+def create_docstore(docstore: Any = None, path: Optional[str] = None) -> Any:
+    """
+    새 스토어의 docstore (sqlite_docstore.parse_docstore 참고).
+    sqlite의 path를 지정하지 않으면 스토어 디렉터리의 DEFAULT_SQLITE_FILE을 사용한다.
+    """
+    docstore_cfg = parse_docstore(docstore)
+    if docstore_cfg["type"] == "memory":
+        return InMemoryDocstore()
+    sqlite_path = docstore_cfg["path"]
+    if sqlite_path is None:
+        sqlite_path = os.path.join(path, DEFAULT_SQLITE_FILE) if path else ":memory:"
+    return SQLiteDocstore(sqlite_path)
+
+
+def _relocate_docstore(vector_store: FAISS, path: str) -> None:
+    # 스토어 디렉터리를 옮긴 경우: pickle에 기록된 절대 경로 대신 디렉터리 안의 sqlite 파일을 사용
+    docstore = vector_store.docstore
+    if isinstance(docstore, SQLiteDocstore) and not os.path.exists(docstore.path):
+        moved = os.path.join(path, os.path.basename(docstore.path))
+        if os.path.exists(moved):
+            vector_store.docstore = SQLiteDocstore(moved)
+
+
+def create_faiss_vector_store(
+    embedding_model: Embeddings,
+    path: str = None,
+    index: Optional[Dict[str, Any]] = None,
+    dimension: Optional[int] = None,
+    model_id: Optional[str] = None,
+    persistence: Any = None,
+    read_only: bool = False,
+    mmap: bool = False,
+    docstore: Any = None,
+    **kwargs,
+):
     """
     FAISS VectorStore를 생성하거나, 기존 인덱스를 로컬에서 로드합니다.
 
     - embedding_model: 임베딩 객체 (예: OpenAIEmbeddings)
     - path: 기존 인덱스 파일 경로 (None이면 새 인덱스 생성)
-    - **kwargs: top_k, docstore, 기타 FAISS에 전달할 파라미터
+    - index: 인덱스 종류 / 압축 설정 (index_factory_string 참고, None이면 flat)
+      학습이 필요한 인덱스는 min_training_points개 벡터가 모이면 최대 index.train_size개 sample로 학습합니다.
+      nprobe / efSearch는 검색 시 파라미터로, 저장된 인덱스를 로드할 때도 다시 적용됩니다.
+    - dimension: 벡터 차원 (None이면 임베딩 객체의 dimension 속성, 그것도 없으면 한 번 임베딩해서 확인)
+    - model_id: 임베딩 모델 identity (None이면 embedding_identity로 계산)
+    - persistence: 저장 형식 (segment_store.parse_persistence 참고, 기본 full)
+      로드할 때는 설정과 관계없이 디스크의 형식(manifest.json 유무)을 자동으로 인식합니다.
+    - read_only: 기존 스토어를 읽기 전용으로 로드 (쓰기 시 ValueError)
+    - mmap: 인덱스 / docstore를 mmap으로 로드 (read_only를 포함, load_read_only_store 참고)
+    - docstore: 새 스토어의 문서 저장 방식 (create_docstore 참고, 기본 memory)
+      sqlite는 텍스트 / 메타데이터를 디스크에 두고 검색 hit만 조회합니다. 로드 시에는 저장된 docstore를 사용합니다.
+    - **kwargs: top_k, 기타 FAISS에 전달할 파라미터
+
+    저장된 인덱스를 로드할 때는 임베딩 호출 없이 메타데이터 파일(META_FILE_NAME)의
+    차원 / 모델 identity를 현재 설정과 비교하고, 다르면 ValueError를 발생시킵니다.
     """
-    # 먼저 임의로 "hello" 문장을 임베딩해서 차원 수를 파악
-    vector_dim = len(embedding_model.embed_query("hello"))
-    index = faiss.IndexFlatL2(vector_dim)
+    index_cfg = index or {}
+    model_id = model_id or embedding_identity(embedding_model)
+    persistence = segment_store.parse_persistence(persistence)
+    read_only = read_only or mmap
+    if read_only and not is_saved_store(path):
+        raise ValueError(
+            f"read_only / mmap requires an existing vector store, got path={path!r}"
+        )
 
-    if path is not None and os.path.exists(path):
+    if is_saved_store(path):
         # 기존 인덱스를 로드하는 경우
-        vector_store = FAISS.load_local(
-            path,
-            embedding_model,
-            allow_dangerous_deserialization=True,
-        )
+        meta = read_meta(path)
+        if meta is not None:
+            _check_meta(path, meta, embedding_model, dimension, model_id)
+        manifest = segment_store.read_manifest(path)
+        if read_only:
+            vector_store = load_read_only_store(path, embedding_model, manifest, mmap)
+        elif manifest is not None:
+            vector_store = load_segmented_store(path, embedding_model, manifest)
+        else:
+            vector_store = ManagedFAISS.load_local(
+                path,
+                embedding_model,
+                allow_dangerous_deserialization=True,
+            )
+            _load_train_buffer(vector_store, path)
+        _relocate_docstore(vector_store, path)
+        if meta is None:
+            # 메타데이터 없이 저장된 기존 인덱스: 차원은 인덱스에서 확인
+            legacy_meta = {"dimension": vector_store.index.d}
+            _check_meta(path, legacy_meta, embedding_model, dimension, model_id)
+        # 학습된 인덱스는 파일에 그대로 저장되어 있으므로 검색 파라미터만 다시 적용
+        index_cfg = _loaded_index_cfg(path, meta, index_cfg, vector_store.index.d)
+        apply_search_params(vector_store.index, index_cfg)
     else:
+        vector_dim = resolve_dimension(embedding_model, dimension)
+
         # 새로 인덱스를 생성하는 경우
-        vector_store = FAISS(
+        vector_store = ManagedFAISS(
             embedding_function=embedding_model,
-            index=index,
-            docstore=InMemoryDocstore(),
+            index=create_index(vector_dim, index_cfg),
+            docstore=create_docstore(docstore, path),
             index_to_docstore_id={},
             **kwargs,
         )
 
-    def save():
-        vector_store.save_local(path)
+    vector_store.path_save = path
+    vector_store.persistence = persistence
+    vector_store.train_size = index_cfg.get("train_size", DEFAULT_TRAIN_SIZE)
+    vector_store.meta = {
+        "dimension": vector_store.index.d,
+        "model_id": model_id,
+        "index": index_cfg,
+    }
+
+    return vector_store
 
-    vector_store.save = save
 
-    vector_store.save = save
-    vector_store.path_save = path
+def add_embedding_matrix(
+    vector_store: FAISS,
+    docs: Sequence[Document],
+    vectors: Any,
+    ids: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    미리 계산된 임베딩을 FAISS 벡터 스토어에 추가합니다. (임베딩 재계산 없음)
+
+    - vectors: (문서 수, 차원) 모양의 행렬 또는 List[List[float]]
+      C-contiguous float32 행렬이면 복사 없이 그대로 index.add에 전달합니다.
+      (normalize_L2가 켜진 스토어는 입력 행렬을 보존하기 위해 한 번 복사)
+    - ids: docstore id 목록 (None이면 Document.id, 없으면 uuid4)
+    학습되지 않은 인덱스는 이 행렬에서 뽑은 sample로 먼저 학습합니다.
+    - 반환: 추가된 docstore id 목록
+    """
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError(f"vectors must be a 2-D matrix, got shape {matrix.shape}")
+    if matrix.shape[0] != len(docs):
+        raise ValueError(
+            f"Number of vectors ({matrix.shape[0]}) does not match number of documents ({len(docs)})."
+        )
+    if matrix.shape[1] != vector_store.index.d:
+        raise ValueError(
+            f"Vector dimension ({matrix.shape[1]}) does not match index dimension "
+            f"({vector_store.index.d})."
+        )
+
+    if ids is None:
+        ids = [doc.id for doc in docs]
+    ids = [id_ or str(uuid.uuid4()) for id_ in ids]
+    if len(ids) != len(docs):
+        raise ValueError(
+            f"Number of ids ({len(ids)}) does not match number of documents."
+        )
+    if len(ids) != len(set(ids)):
+        raise ValueError("Duplicate ids found in the ids list.")
+
+    if vector_store._normalize_L2:
+        matrix = matrix.copy()
+        faiss.normalize_L2(matrix)
+    stored_docs = [
+        Document(id=id_, page_content=doc.page_content, metadata=doc.metadata)
+        for id_, doc in zip(ids, docs)
+    ]
+    if isinstance(vector_store, ManagedFAISS):
+        vector_store._check_writable()
+        with vector_store._lock:
+            _append_vectors(vector_store, ids, stored_docs, matrix)
+            vector_store._track_added(ids, stored_docs, matrix)
+    else:
+        _append_vectors(vector_store, ids, stored_docs, matrix)
+    return ids
+
+
+def _append_vectors(
+    vector_store: FAISS, ids: List[str], docs: List[Document], matrix: np.ndarray
+) -> None:
+    """(정규화가 끝난) 행렬을 인덱스에 추가하고 docstore / id 매핑을 갱신합니다."""
+    if isinstance(vector_store, ManagedFAISS) and not vector_store.index.is_trained:
+        vector_store._buffer_for_training(ids, docs, matrix)
+        return
+    # 일반 FAISS에서 학습이 필요한 인덱스(SQ / PQ / IVF)는 첫 batch로 학습
+    train_index(
+        vector_store.index,
+        matrix,
+        getattr(vector_store, "train_size", DEFAULT_TRAIN_SIZE),
+    )
+    _add_to_index(vector_store, ids, docs, matrix)
+
+
+def _add_to_index(
+    vector_store: FAISS, ids: List[str], docs: List[Document], matrix: np.ndarray
+) -> None:
+    # docstore를 먼저 갱신한다 (SQLiteDocstore가 metadata를 거부하면 인덱스에 고아 벡터가 남지 않도록)
+    vector_store.docstore.add(dict(zip(ids, docs)))
+    vector_store.index.add(matrix)
+
+    # langchain FAISS.add_embeddings와 같은 방식으로 id 매핑을 갱신
+    starting_len = len(vector_store.index_to_docstore_id)
+    vector_store.index_to_docstore_id.update(
+        {starting_len + j: id_ for j, id_ in enumerate(ids)}
+    )
+
+
+def _load_train_buffer(vector_store: ManagedFAISS, path: str) -> None:
+    """full 형식으로 저장된 학습 전 buffer를 다시 올린다"""
+    if os.path.exists(os.path.join(path, f"{TRAIN_BUFFER_NAME}.npy")):
+        vector_store._train_buffer = [
+            segment_store.read_segment(path, TRAIN_BUFFER_NAME)
+        ]
+
+
+def load_read_only_store(
+    path: str,
+    embedding_model: Embeddings,
+    manifest: Optional[Dict[str, Any]],
+    mmap: bool,
+) -> ManagedFAISS:
+    """
+    저장된 스토어를 읽기 전용으로 로드합니다.
+    - mmap=True: 인덱스 파일을 IO_FLAG_MMAP_IFC | IO_FLAG_READ_ONLY로 매핑하고, docstore도
+      MmapDocstore로 연다. 여러 워커 프로세스가 OS 페이지 캐시를 공유하고 로드 시 복사 / unpickle이 없다.
+    - mmap=False: 일반 로드와 같지만 쓰기를 거부한다.
+    segments 형식은 segment가 남아 있으면 로드하지 않는다 (먼저 compact 필요).
+    """
+    index_name = "index"
+    # 학습 전 buffer: segments 형식은 학습 전 base 뒤의 segment, full 형식은 train_buffer 파일
+    if manifest is not None:
+        buffered = not manifest.get("base_trained", True) and manifest["segments"]
+    else:
+        buffered = os.path.exists(os.path.join(path, f"{TRAIN_BUFFER_NAME}.npy"))
+    if buffered:
+        raise ValueError(
+            f"Vector store '{path}' has vectors waiting for index training; "
+            "add more documents before loading it read-only."
+        )
+    if manifest is not None:
+        if manifest["segments"]:
+            raise ValueError(
+                f"Vector store '{path}' has {len(manifest['segments'])} uncompacted segments; "
+                "run compact() before loading it read-only."
+            )
+        index_name = manifest["base"]
+
+    if not mmap:
+        vector_store = ManagedFAISS.load_local(
+            path,
+            embedding_model,
+            index_name=index_name,
+            allow_dangerous_deserialization=True,
+        )
+    else:
+        # 이전 버전 faiss에는 IO_FLAG_MMAP_IFC(flat code 매핑)가 없다
+        flags = (
+            getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+            | faiss.IO_FLAG_READ_ONLY
+        )
+        index = faiss.read_index(os.path.join(path, f"{index_name}.faiss"), flags)
+        ensure_mmap_docstore(path, index_name)
+        docstore = MmapDocstore(path, index_name)
+        vector_store = ManagedFAISS(embedding_model, index, docstore, docstore.id_map())
+    vector_store.read_only = True
+    return vector_store
+
 
+def load_segmented_store(
+    path: str, embedding_model: Embeddings, manifest: Dict[str, Any]
+) -> ManagedFAISS:
+    """segments 형식으로 저장된 스토어를 로드: base를 읽고 segment들을 순서대로 다시 추가"""
+    vector_store = ManagedFAISS.load_local(
+        path,
+        embedding_model,
+        index_name=manifest["base"],
+        allow_dangerous_deserialization=True,
+    )
+    for segment in manifest["segments"]:
+        ids, docs, matrix = segment_store.read_segment(path, segment["name"])
+        _append_vectors(vector_store, ids, docs, matrix)
+    vector_store._manifest = manifest
+    vector_store._needs_base = not manifest.get("base_trained", True)
     return vector_store
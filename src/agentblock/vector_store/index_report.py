@@ -0,0 +1,112 @@
+import time
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from agentblock.vector_store.faiss_utils import (
+    DEFAULT_TRAIN_SIZE,
+    create_index,
+    train_index,
+)
+
+
+def index_memory_bytes(index: faiss.Index) -> int:
+    """직렬화된 인덱스 크기(bytes). 메모리에 올라가는 벡터 / 코드북 크기의 근사치."""
+    return int(faiss.serialize_index(index).size)
+
+
+def evaluate_index(
+    name: str,
+    index_cfg: Optional[Dict[str, Any]],
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    ground_truth: np.ndarray,
+    k: int = 10,
+    train_size: int = DEFAULT_TRAIN_SIZE,
+) -> Dict[str, Any]:
+    """
+    index_cfg로 인덱스를 만들어 vectors를 넣고, queries에 대한 recall@k / 지연 시간 / 크기를 측정합니다.
+    ground_truth: 정확한 검색(flat)의 top-k 인덱스 (len(queries), k)
+    """
+    dimension = vectors.shape[1]
+    index = create_index(dimension, index_cfg)
+
+    start = time.perf_counter()
+    train_index(index, vectors, train_size)
+    index.add(vectors)
+    build_seconds = time.perf_counter() - start
+
+    # 검색 서버처럼 쿼리 한 건씩 지연 시간을 잰다
+    latencies = []
+    found = np.empty((len(queries), k), dtype=np.int64)
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i : i + 1], k)
+        latencies.append(time.perf_counter() - start)
+        found[i] = ids[0]
+
+    recall = np.mean(
+        [len(set(found[i]) & set(ground_truth[i])) / k for i in range(len(queries))]
+    )
+    memory = index_memory_bytes(index)
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "name": name,
+        "index": dict(index_cfg or {"type": "flat"}),
+        "recall_at_k": float(recall),
+        "k": k,
+        "latency_ms_mean": float(latencies_ms.mean()),
+        "latency_ms_p95": float(np.percentile(latencies_ms, 95)),
+        "build_seconds": build_seconds,
+        "memory_bytes": memory,
+        "bytes_per_vector": memory / len(vectors),
+    }
+
+
+def compare_index_configs(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    configs: Dict[str, Optional[Dict[str, Any]]],
+    k: int = 10,
+    train_size: int = DEFAULT_TRAIN_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    여러 param.index 설정을 같은 데이터로 비교합니다.
+    - recall@k는 flat(정확한 검색) 결과 대비 비율
+    - compression은 flat 인덱스 크기 대비 배수
+
+    configs 예: {"flat": None, "sq8": {"type": "sq8"}, "pq16": {"type": "pq", "m": 16}}
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, ground_truth = exact.search(queries, k)
+    flat_bytes = index_memory_bytes(exact)
+
+    rows = []
+    for name, index_cfg in configs.items():
+        row = evaluate_index(
+            name, index_cfg, vectors, queries, ground_truth, k, train_size
+        )
+        row["compression"] = flat_bytes / row["memory_bytes"]
+        rows.append(row)
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """compare_index_configs 결과를 사람이 읽기 쉬운 표로 변환합니다."""
+    header = (
+        f"{'name':<16}{'recall@k':>10}{'mean ms':>10}{'p95 ms':>10}"
+        f"{'MiB':>10}{'B/vec':>10}{'x smaller':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<16}{row['recall_at_k']:>10.3f}{row['latency_ms_mean']:>10.3f}"
+            f"{row['latency_ms_p95']:>10.3f}{row['memory_bytes'] / 2**20:>10.2f}"
+            f"{row['bytes_per_vector']:>10.1f}{row.get('compression', 1.0):>11.1f}"
+        )
+    return "\n".join(lines)
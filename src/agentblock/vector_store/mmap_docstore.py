@@ -0,0 +1,160 @@
+import os
+import json
+import pickle
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+# {index_name}.docs.* 파일 구성
+#   .bin          문서 record(pickle)를 인덱스 행 순서대로 이어 붙인 blob
+#   .offsets.npy  record 경계 (int64, 문서 수 + 1)
+#   .ids.npy      행 -> docstore id (고정 길이 bytes)
+#   .sorted.npy   정렬된 id (id -> 행 이진 탐색용)
+#   .order.npy    정렬된 id 각각의 행 번호
+#   .json         header (문서 수, 원본 pkl 파일 정보)
+_SUFFIXES = (".bin", ".offsets.npy", ".ids.npy", ".sorted.npy", ".order.npy", ".json")
+
+
+def _file(path: str, index_name: str, suffix: str) -> str:
+    return os.path.join(path, f"{index_name}.docs{suffix}")
+
+
+def _source_info(path: str, index_name: str) -> Dict[str, int]:
+    # 원본 pkl이 다시 저장되면 mmap 파일을 다시 만들기 위해 크기 / 수정 시각을 기록
+    stat = os.stat(os.path.join(path, f"{index_name}.pkl"))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _save_atomic(file_path: str, write) -> None:
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, file_path)
+
+
+def write_mmap_docstore(
+    path: str,
+    index_name: str,
+    docstore: Docstore,
+    index_to_docstore_id: Dict[int, str],
+    source: Optional[Dict[str, int]] = None,
+) -> None:
+    """
+    docstore를 mmap으로 읽을 수 있는 형식으로 씁니다. 문서는 인덱스 행 순서(index_to_docstore_id)로 저장됩니다.
+    여러 프로세스가 동시에 호출해도 각 파일은 os.replace로 교체되고, header(.json)를 마지막에 쓴다.
+    """
+    ids = [index_to_docstore_id[i] for i in range(len(index_to_docstore_id))]
+    records = [
+        pickle.dumps(docstore.search(id_), protocol=pickle.HIGHEST_PROTOCOL)
+        for id_ in ids
+    ]
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    np.cumsum([len(record) for record in records], out=offsets[1:])
+
+    encoded = [id_.encode("utf-8") for id_ in ids]
+    width = max((len(id_) for id_ in encoded), default=1)
+    id_array = np.array(encoded, dtype=f"S{width}")
+
+    _save_atomic(_file(path, index_name, ".bin"), lambda f: f.write(b"".join(records)))
+    _save_atomic(_file(path, index_name, ".offsets.npy"), lambda f: np.save(f, offsets))
+    _save_atomic(_file(path, index_name, ".ids.npy"), lambda f: np.save(f, id_array))
+    order = np.argsort(id_array, kind="stable").astype(np.int64)
+    sorted_ids = id_array[order]
+    _save_atomic(
+        _file(path, index_name, ".sorted.npy"), lambda f: np.save(f, sorted_ids)
+    )
+    _save_atomic(_file(path, index_name, ".order.npy"), lambda f: np.save(f, order))
+    header = json.dumps({"count": len(ids), "source": source}).encode("utf-8")
+    _save_atomic(_file(path, index_name, ".json"), lambda f: f.write(header))
+
+
+def ensure_mmap_docstore(path: str, index_name: str) -> None:
+    """
+    {index_name}.pkl에 대응하는 mmap docstore 파일이 없거나 오래되었으면 pkl에서 한 번 변환합니다.
+    (첫 번째 read-only 로드에서만 비용이 들고, 이후 로드는 파일을 매핑만 한다)
+    """
+    source = _source_info(path, index_name)
+    header_path = _file(path, index_name, ".json")
+    if os.path.exists(header_path):
+        with open(header_path, "r", encoding="utf-8") as f:
+            if json.load(f).get("source") == source:
+                return
+    with open(os.path.join(path, f"{index_name}.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    write_mmap_docstore(path, index_name, docstore, index_to_docstore_id, source)
+
+
+class MmapIdMap(Mapping):
+    """index_to_docstore_id 대체: 인덱스 행 -> docstore id (mmap 배열, 읽기 전용)"""
+
+    def __init__(self, ids: np.ndarray):
+        self._ids = ids
+
+    def __getitem__(self, row: int) -> str:
+        if not 0 <= row < len(self._ids):
+            raise KeyError(row)
+        return self._ids[row].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._ids)))
+
+
+class MmapDocstore(Docstore):
+    """
+    write_mmap_docstore 형식의 파일을 mmap으로 여는 읽기 전용 docstore.
+    - 파일 페이지는 OS 페이지 캐시를 통해 여러 프로세스가 공유한다 (프로세스별 unpickle 없음)
+    - search(id)는 정렬된 id 배열을 이진 탐색한 뒤 해당 record 하나만 unpickle 한다
+    """
+
+    def __init__(self, path: str, index_name: str = "index"):
+        with open(_file(path, index_name, ".json"), "r", encoding="utf-8") as f:
+            self.count = json.load(f)["count"]
+        self.offsets = np.load(_file(path, index_name, ".offsets.npy"), mmap_mode="r")
+        self.ids = np.load(_file(path, index_name, ".ids.npy"), mmap_mode="r")
+        self.sorted_ids = np.load(_file(path, index_name, ".sorted.npy"), mmap_mode="r")
+        self.order = np.load(_file(path, index_name, ".order.npy"), mmap_mode="r")
+        blob_path = _file(path, index_name, ".bin")
+        # 길이 0인 파일은 mmap 할 수 없다 (빈 스토어)
+        if os.path.getsize(blob_path) > 0:
+            self.blob = np.memmap(blob_path, dtype=np.uint8, mode="r")
+        else:
+            self.blob = np.empty(0, dtype=np.uint8)
+
+    def _row(self, id_: str) -> Optional[int]:
+        key = id_.encode("utf-8")
+        if self.count == 0 or len(key) > self.ids.dtype.itemsize:
+            return None
+        # mmap 배열에서 이진 탐색 -> log(n)개의 페이지만 읽는다
+        pos = int(np.searchsorted(self.sorted_ids, key))
+        if pos < self.count and self.sorted_ids[pos] == key:
+            return int(self.order[pos])
+        return None
+
+    def search(self, search: str) -> Union[str, Document]:
+        row = self._row(search)
+        if row is None:
+            return f"ID {search} not found."
+        start, stop = int(self.offsets[row]), int(self.offsets[row + 1])
+        return pickle.loads(self.blob[start:stop].tobytes())
+
+    def id_map(self) -> MmapIdMap:
+        return MmapIdMap(self.ids)
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        raise ValueError("MmapDocstore is read-only.")
+
+    def delete(self, ids: List) -> None:
+        raise ValueError("MmapDocstore is read-only.")
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def mmap_docstore_files(index_name: str) -> List[str]:
+    return [f"{index_name}.docs{suffix}" for suffix in _SUFFIXES]
@@ -0,0 +1,149 @@
+import os
+import json
+import pickle
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from agentblock.vector_store.mmap_docstore import mmap_docstore_files
+
+# segments 저장 형식의 목차 파일. 이 파일을 교체하는 순간이 저장의 commit 시점이다
+MANIFEST_FILE_NAME = "manifest.json"
+
+# param.persistence.mode
+PERSISTENCE_MODES = ("full", "segments")
+
+# config.persistence에 허용되는 키
+PERSISTENCE_KEYS = {"mode", "max_segments", "background"}
+
+
+def parse_persistence(persistence: Any) -> Dict[str, Any]:
+    """
+    param.persistence 설정 -> {"mode", "max_segments", "background"}.
+      persistence: segments          # 축약형
+      persistence:
+        mode: segments       # full(기본) | segments
+        max_segments: 16     # segment 수가 이 값에 도달하면 save() 후 자동 compaction
+        background: true     # 자동 compaction을 백그라운드 스레드에서 실행
+    """
+    if persistence is None:
+        persistence = {}
+    elif isinstance(persistence, str):
+        persistence = {"mode": persistence}
+    if not isinstance(persistence, dict):
+        raise ValueError(
+            f"'persistence' must be a string or a dict, got {type(persistence)}"
+        )
+
+    unknown = set(persistence) - PERSISTENCE_KEYS
+    if unknown:
+        raise ValueError(
+            f"Unsupported persistence options {unknown}. Allowed: {sorted(PERSISTENCE_KEYS)}"
+        )
+    mode = persistence.get("mode", "full")
+    if mode not in PERSISTENCE_MODES:
+        raise ValueError(
+            f"Unsupported persistence mode: {mode}. Allowed: {PERSISTENCE_MODES}"
+        )
+    max_segments = persistence.get("max_segments")
+    if max_segments is not None and max_segments < 1:
+        raise ValueError(f"max_segments must be >= 1, got {max_segments}")
+    return {
+        "mode": mode,
+        "max_segments": max_segments,
+        "background": bool(persistence.get("background", False)),
+    }
+
+
+def _replace_atomic(path: str, write) -> None:
+    # 임시 파일에 쓴 뒤 os.replace로 교체 (중간에 실패해도 기존 파일은 그대로)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    manifest_path = os.path.join(path, MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    os.makedirs(path, exist_ok=True)
+    data = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+    _replace_atomic(os.path.join(path, MANIFEST_FILE_NAME), lambda f: f.write(data))
+
+
+def new_manifest() -> Dict[str, Any]:
+    return {"format": "segments", "base": None, "segments": [], "next_id": 1}
+
+
+def next_name(manifest: Dict[str, Any], prefix: str) -> str:
+    """seg_000001 / base_000002 처럼 manifest 안에서 단조 증가하는 파일 이름"""
+    name = f"{prefix}_{manifest['next_id']:06d}"
+    manifest["next_id"] += 1
+    return name
+
+
+def write_segment(
+    path: str,
+    name: str,
+    ids: Sequence[str],
+    docs: Sequence[Document],
+    matrix: np.ndarray,
+) -> None:
+    """
+    segment 하나 = 벡터 행렬({name}.npy) + docstore 변경분({name}.docs.pkl).
+    쓰기 비용은 이번 batch 크기에만 비례한다.
+    """
+    os.makedirs(path, exist_ok=True)
+    _replace_atomic(os.path.join(path, f"{name}.npy"), lambda f: np.save(f, matrix))
+    _replace_atomic(
+        os.path.join(path, f"{name}.docs.pkl"),
+        lambda f: pickle.dump((list(ids), list(docs)), f),
+    )
+
+
+def read_segment(path: str, name: str) -> Tuple[List[str], List[Document], np.ndarray]:
+    matrix = np.load(os.path.join(path, f"{name}.npy"))
+    with open(os.path.join(path, f"{name}.docs.pkl"), "rb") as f:
+        ids, docs = pickle.load(f)
+    return ids, docs, matrix
+
+
+def write_base(
+    path: str,
+    name: str,
+    index_bytes: np.ndarray,
+    docstore: Any,
+    index_to_docstore_id: Dict[int, str],
+) -> None:
+    """
+    compaction 결과 = FAISS.save_local과 같은 형식의 {name}.faiss + {name}.pkl.
+    (FAISS.load_local(path, embeddings, index_name=name)으로도 읽을 수 있다)
+    index_bytes: faiss.serialize_index 결과
+    """
+    os.makedirs(path, exist_ok=True)
+    _replace_atomic(
+        os.path.join(path, f"{name}.faiss"), lambda f: f.write(index_bytes.tobytes())
+    )
+    _replace_atomic(
+        os.path.join(path, f"{name}.pkl"),
+        lambda f: pickle.dump((docstore, index_to_docstore_id), f),
+    )
+
+
+def remove_files(path: str, base: Optional[str], segments: Iterable[str]) -> None:
+    """manifest에서 빠진 base / segment 파일을 지운다."""
+    names = [f"{name}{ext}" for name in segments for ext in (".npy", ".docs.pkl")]
+    if base is not None:
+        # read-only 로드 때 만들어진 mmap docstore 파일도 함께 지운다
+        names += [f"{base}.faiss", f"{base}.pkl"] + mmap_docstore_files(base)
+    for file_name in names:
+        file_path = os.path.join(path, file_name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
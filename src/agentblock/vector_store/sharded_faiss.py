@@ -0,0 +1,429 @@
+import os
+import json
+import heapq
+import asyncio
+import hashlib
+import itertools
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from agentblock.vector_store.faiss_utils import (
+    ManagedFAISS,
+    add_embedding_matrix,
+    create_faiss_vector_store,
+    embedding_identity,
+    is_saved_store,
+    resolve_dimension,
+)
+
+# 샤드 구성 파일 (샤드 수 / 라우팅 방식이 바뀌면 문서가 다른 샤드로 가므로 로드 시 비교)
+SHARDS_FILE_NAME = "shards.json"
+
+# param.route_by
+ROUTE_MODES = ("hash", "metadata")
+
+
+def stable_hash(value: str) -> int:
+    """프로세스 / 플랫폼과 관계없이 같은 값을 내는 64bit 해시 (Python hash()는 실행마다 다르다)"""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def shard_path(path: Optional[str], shard: int) -> Optional[str]:
+    return os.path.join(path, f"shard_{shard:03d}") if path else None
+
+
+class ShardedFAISS(VectorStore):
+    """
+    문서를 N개의 FAISS 샤드(ManagedFAISS)에 나눠 저장하는 VectorStore.
+
+    - 라우팅 (route_by)
+      - hash: 문서 id의 해시
+      - metadata: metadata[route_key] 값의 해시 (같은 tenant의 문서는 같은 샤드)
+    - add: 임베딩은 한 번만 계산하고, 행렬을 샤드별로 나눠 스레드 풀에서 동시에 추가
+      id는 샤드에 보내기 전에 모든 샤드의 id와 중복되는지 확인하고,
+      샤드 하나에서 추가가 실패하면 다른 샤드에 추가된 문서를 delete로 되돌린다
+    - 검색: 모든 샤드를 스레드 풀에서 동시에 검색한 뒤 전체 top-k로 병합
+      (L2는 작을수록, inner product는 클수록 가까움)
+      route_by: metadata이고 filter에 route_key 값이 있으면 해당 샤드만 검색
+    - save: 샤드별 save()를 동시에 실행
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        shards: List[ManagedFAISS],
+        route_by: str = "hash",
+        route_key: Optional[str] = None,
+        path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        if not shards:
+            raise ValueError("ShardedFAISS requires at least one shard.")
+        if route_by not in ROUTE_MODES:
+            raise ValueError(
+                f"Unsupported route_by: {route_by}. Allowed: {ROUTE_MODES}"
+            )
+        if route_by == "metadata" and not route_key:
+            raise ValueError("route_by 'metadata' requires 'route_key'.")
+        self.embedding = embedding
+        self.shards = shards
+        self.route_by = route_by
+        self.route_key = route_key
+        self.path_save = path
+        self.max_workers = max_workers or len(shards)
+        # 스레드는 첫 작업 제출 시점에 만들어지므로 여기서 만들어도 비용이 없다
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # docstore id -> 샤드 번호 (첫 add / delete 시점에 샤드들의 id로 만든다)
+        self._id_shards: Optional[Dict[str, int]] = None
+        self._ids_lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def _map(self, fn: Callable, items: Sequence[Any]) -> List[Any]:
+        # faiss add / search는 GIL을 놓으므로 샤드별 작업을 스레드로 동시에 실행한다
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        return list(self._executor.map(fn, items))
+
+    def _id_map(self) -> Dict[str, int]:
+        # _ids_lock 안에서 호출
+        if self._id_shards is None:
+            self._id_shards = {
+                id_: shard_no
+                for shard_no, shard in enumerate(self.shards)
+                for id_ in itertools.chain(
+                    shard.index_to_docstore_id.values(), shard.buffered_ids()
+                )
+            }
+        return self._id_shards
+
+    # ---------- 라우팅 ----------
+
+    def route(self, doc_id: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """문서 하나가 저장될 샤드 번호"""
+        if self.route_by == "hash":
+            return stable_hash(doc_id) % len(self.shards)
+        metadata = metadata or {}
+        if self.route_key not in metadata:
+            raise ValueError(
+                f"Document '{doc_id}' has no metadata field '{self.route_key}'."
+            )
+        return self._route_value(metadata[self.route_key])
+
+    def _route_value(self, value: Any) -> int:
+        return stable_hash(str(value)) % len(self.shards)
+
+    # ---------- 추가 ----------
+
+    def add_embedding_matrix(
+        self, docs: Sequence[Document], vectors: Any, ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        미리 계산된 (문서 수, 차원) 행렬을 샤드별로 나눠 추가합니다. 반환: docstore id 목록
+        - 이미 저장된 id(어느 샤드든)나 목록 안의 중복 id가 있으면 아무것도 추가하지 않고 ValueError
+        - 샤드 하나에서 추가가 실패하면 다른 샤드에 추가된 문서를 지우고 원래 예외를 다시 낸다
+        """
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(docs):
+            raise ValueError(
+                f"vectors must be a ({len(docs)}, dimension) matrix, got shape {matrix.shape}"
+            )
+        if matrix.shape[1] != self.shards[0].index.d:
+            raise ValueError(
+                f"Vector dimension ({matrix.shape[1]}) does not match index dimension "
+                f"({self.shards[0].index.d})."
+            )
+        if ids is None:
+            ids = [doc.id for doc in docs]
+        ids = [id_ or str(uuid.uuid4()) for id_ in ids]
+        if len(ids) != len(docs):
+            raise ValueError(
+                f"Number of ids ({len(ids)}) does not match number of documents."
+            )
+        if len(ids) != len(set(ids)):
+            raise ValueError("Duplicate ids found in the ids list.")
+
+        targets = np.fromiter(
+            (self.route(id_, doc.metadata) for id_, doc in zip(ids, docs)),
+            dtype=np.int64,
+            count=len(docs),
+        )
+
+        # 샤드에 보내기 전에 id를 예약한다 (metadata 라우팅에서는 같은 id가 다른 샤드로 갈 수 있음)
+        with self._ids_lock:
+            id_map = self._id_map()
+            existing = [id_ for id_ in ids if id_ in id_map]
+            if existing:
+                raise ValueError(
+                    f"Tried to add ids that already exist in the store: {existing}"
+                )
+            id_map.update(zip(ids, targets.tolist()))
+
+        def add_to_shard(shard: int) -> Optional[Exception]:
+            rows = np.flatnonzero(targets == shard)
+            try:
+                add_embedding_matrix(
+                    self.shards[shard],
+                    [docs[i] for i in rows],
+                    matrix[rows],
+                    [ids[i] for i in rows],
+                )
+            except Exception as e:
+                return e
+            return None
+
+        shards = [int(shard) for shard in np.unique(targets)]
+        errors = self._map(add_to_shard, shards)
+        failed = [error for error in errors if error is not None]
+        if failed:
+            self._rollback_add(ids, targets, shards, errors)
+            raise failed[0]
+        return ids
+
+    def _rollback_add(
+        self,
+        ids: List[str],
+        targets: np.ndarray,
+        shards: List[int],
+        errors: List[Optional[Exception]],
+    ) -> None:
+        """실패한 add에서 성공한 샤드의 문서를 지우고 예약한 id를 해제한다"""
+        for shard, error in zip(shards, errors):
+            shard_ids = [ids[i] for i in np.flatnonzero(targets == shard)]
+            if error is None:
+                try:
+                    self.shards[shard].delete(shard_ids)
+                except Exception as rollback_error:
+                    # 삭제를 지원하지 않는 인덱스(HNSW 등): 추가된 문서는 남아 있다
+                    raise RuntimeError(
+                        f"Adding documents failed on another shard "
+                        f"({next(e for e in errors if e is not None)}), and the "
+                        f"documents already added to shard {shard} could not be removed: "
+                        f"{rollback_error}"
+                    ) from rollback_error
+            with self._ids_lock:
+                for id_ in shard_ids:
+                    self._id_shards.pop(id_, None)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        docs = [
+            Document(page_content=t, metadata=m or {}) for t, m in zip(texts, metadatas)
+        ]
+        return self.add_embedding_matrix(
+            docs, self.embedding.embed_documents(texts), ids
+        )
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        docs = [
+            Document(page_content=t, metadata=m or {}) for t, m in zip(texts, metadatas)
+        ]
+        vectors = await self.embedding.aembed_documents(texts)
+        return await asyncio.to_thread(self.add_embedding_matrix, docs, vectors, ids)
+
+    def add_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+        ids = kwargs.pop("ids", None) or [doc.id for doc in documents]
+        return self.add_texts(
+            [doc.page_content for doc in documents],
+            [doc.metadata for doc in documents],
+            ids=ids,
+        )
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            raise ValueError("No ids provided to delete.")
+        # metadata 라우팅은 id만으로 샤드를 알 수 없으므로 id -> 샤드 매핑으로 찾아 지운다
+        with self._ids_lock:
+            id_map = self._id_map()
+            remaining = {id_ for id_ in ids if id_ not in id_map}
+            if remaining:
+                raise ValueError(
+                    f"Some specified ids do not exist in the current store: {remaining}"
+                )
+            by_shard: Dict[int, List[str]] = {}
+            for id_ in dict.fromkeys(ids):
+                by_shard.setdefault(id_map[id_], []).append(id_)
+        for shard, shard_ids in by_shard.items():
+            self.shards[shard].delete(shard_ids)
+            with self._ids_lock:
+                for id_ in shard_ids:
+                    self._id_shards.pop(id_, None)
+        return True
+
+    # ---------- 검색 ----------
+
+    def _shards_for(self, filter: Any) -> List[int]:
+        # metadata 라우팅 + filter에 route_key 값이 하나로 정해져 있으면 그 샤드만 검색
+        if self.route_by == "metadata" and isinstance(filter, dict):
+            value = filter.get(self.route_key)
+            if value is not None and not isinstance(value, (list, dict)):
+                return [self._route_value(value)]
+        return list(range(len(self.shards)))
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Any = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        def search(shard: int) -> List[Tuple[Document, float]]:
+            return self.shards[shard].similarity_search_with_score_by_vector(
+                embedding, k=k, filter=filter, fetch_k=fetch_k, **kwargs
+            )
+
+        results = self._map(search, self._shards_for(filter))
+        hits = [hit for shard_hits in results for hit in shard_hits]
+        # 샤드마다 top-k를 받았으므로 합친 목록의 top-k가 전체 top-k다
+        if self.shards[0].distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT:
+            return heapq.nlargest(k, hits, key=lambda hit: hit[1])
+        return heapq.nsmallest(k, hits, key=lambda hit: hit[1])
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Any = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        embedding = self.embedding.embed_query(query)
+        return self.similarity_search_with_score_by_vector(
+            embedding, k, filter, fetch_k, **kwargs
+        )
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Any = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> List[Document]:
+        hits = self.similarity_search_with_score_by_vector(
+            embedding, k, filter, fetch_k, **kwargs
+        )
+        return [doc for doc, _ in hits]
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Any = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> List[Document]:
+        hits = self.similarity_search_with_score(query, k, filter, fetch_k, **kwargs)
+        return [doc for doc, _ in hits]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return self.shards[0]._select_relevance_score_fn()
+
+    # ---------- 저장 ----------
+
+    def _layout(self) -> Dict[str, Any]:
+        return {
+            "num_shards": len(self.shards),
+            "route_by": self.route_by,
+            "route_key": self.route_key,
+        }
+
+    def save(self) -> None:
+        if self.path_save is None:
+            raise ValueError(
+                "Vector store was created without 'path'; nothing to save to."
+            )
+        self._map(lambda shard: shard.save(), self.shards)
+        os.makedirs(self.path_save, exist_ok=True)
+        with open(
+            os.path.join(self.path_save, SHARDS_FILE_NAME), "w", encoding="utf-8"
+        ) as f:
+            json.dump(self._layout(), f, indent=2)
+
+    def shard_sizes(self) -> List[int]:
+        return [shard.index.ntotal for shard in self.shards]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "ShardedFAISS":
+        vector_store = create_sharded_faiss_store(embedding, **kwargs)
+        vector_store.add_texts(texts, metadatas, ids=ids)
+        return vector_store
+
+
+def create_sharded_faiss_store(
+    embedding_model: Embeddings,
+    path: Optional[str] = None,
+    num_shards: int = 4,
+    route_by: str = "hash",
+    route_key: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    dimension: Optional[int] = None,
+    model_id: Optional[str] = None,
+    **shard_kwargs: Any,
+) -> ShardedFAISS:
+    """
+    ShardedFAISS를 생성하거나 로드합니다. 샤드 i는 {path}/shard_{i:03d}에 저장됩니다.
+    - shard_kwargs: 모든 샤드에 전달할 create_faiss_vector_store 인자 (index, persistence, docstore, mmap 등)
+    - 저장된 샤드 구성(shards.json)과 num_shards / route_by / route_key가 다르면 ValueError
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be >= 1, got {num_shards}")
+    layout = {"num_shards": num_shards, "route_by": route_by, "route_key": route_key}
+    if path is not None and os.path.exists(os.path.join(path, SHARDS_FILE_NAME)):
+        with open(os.path.join(path, SHARDS_FILE_NAME), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored != layout:
+            raise ValueError(
+                f"Sharded vector store '{path}' was saved with {stored}, "
+                f"but the config is {layout}."
+            )
+
+    # 모든 샤드가 같은 임베딩을 쓰므로 identity / 차원은 한 번만 계산
+    model_id = model_id or embedding_identity(embedding_model)
+    paths = [shard_path(path, shard) for shard in range(num_shards)]
+    if dimension is None and not all(is_saved_store(p) for p in paths):
+        dimension = resolve_dimension(embedding_model)
+
+    shards = [
+        create_faiss_vector_store(
+            embedding_model, p, dimension=dimension, model_id=model_id, **shard_kwargs
+        )
+        for p in paths
+    ]
+    return ShardedFAISS(embedding_model, shards, route_by, route_key, path, max_workers)
@@ -0,0 +1,169 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Set, Union
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+# param.docstore 종류
+DOCSTORE_TYPES = ("memory", "sqlite")
+
+# sqlite IN (...) 한 번에 조회할 최대 id 수 (SQLITE_MAX_VARIABLE_NUMBER 기본값 이하)
+_SQLITE_LOOKUP_CHUNK = 500
+
+# param.docstore.type: sqlite에서 path를 지정하지 않은 경우 스토어 디렉터리 안의 파일 이름
+DEFAULT_SQLITE_FILE = "docstore.sqlite"
+
+
+class SQLiteDocstore(Docstore, AddableMixin):
+    """
+    문서 텍스트 / 메타데이터를 sqlite 파일에 id별로 저장하는 docstore.
+    - InMemoryDocstore와 달리 전체 문서를 메모리에 올리지 않고, 검색 시 top-k hit만 id로 조회한다.
+    - add는 바로 commit되므로 FAISS save()는 문서 전체를 다시 쓰지 않는다.
+      (pickle에는 sqlite 파일 경로만 기록된다)
+    - delete는 바로 지우지 않고 commit_deletes()까지 미룬다 (그동안 search / len에서는 삭제된 것으로 취급).
+      ManagedFAISS.save()가 인덱스를 쓴 뒤 호출하므로, save 전에 프로세스가 종료되어도
+      디스크의 인덱스가 가리키는 문서가 사라지지 않는다.
+    - metadata는 JSON으로 저장된다. JSON으로 표현할 수 없는 값(datetime 등)이 있으면
+      값이 조용히 바뀌지 않도록 ValueError를 낸다.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path) if path != ":memory:" else path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending_deletes: Set[str] = set()
+
+    def _connection(self) -> sqlite3.Connection:
+        # unpickle 직후에는 연결이 없으므로 첫 사용 시점에 연다
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # 여러 스레드(병렬 노드, 비동기 저장)에서 호출되므로 직접 lock으로 보호
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents "
+                "(id TEXT PRIMARY KEY, page_content TEXT NOT NULL, metadata TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        # 같은 id는 덮어쓴다 (segment replay처럼 같은 문서를 다시 추가해도 안전)
+        rows = [
+            (id_, doc.page_content, self._dump_metadata(id_, doc.metadata))
+            for id_, doc in texts.items()
+        ]
+        with self._lock:
+            # 삭제 대기 중인 id를 다시 추가하면 새 문서가 유지된다
+            self._pending_deletes.difference_update(texts)
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (id, page_content, metadata) VALUES (?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    @staticmethod
+    def _dump_metadata(id_: str, metadata: Dict[str, Any]) -> str:
+        try:
+            return json.dumps(metadata, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"Metadata of document '{id_}' cannot be stored in the sqlite docstore: "
+                f"{e}. Convert the values to JSON types (str / number / bool / list / dict) "
+                "before adding the document."
+            ) from e
+
+    def delete(self, ids: List) -> None:
+        with self._lock:
+            self._pending_deletes.update(ids)
+
+    def commit_deletes(self) -> None:
+        """대기 중인 delete를 sqlite에 반영 (인덱스가 디스크에 저장된 뒤 호출)"""
+        with self._lock:
+            if not self._pending_deletes:
+                return
+            conn = self._connection()
+            conn.executemany(
+                "DELETE FROM documents WHERE id = ?",
+                [(id_,) for id_ in self._pending_deletes],
+            )
+            conn.commit()
+            self._pending_deletes.clear()
+
+    def search(self, search: str) -> Union[str, Document]:
+        with self._lock:
+            if search in self._pending_deletes:
+                return f"ID {search} not found."
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT page_content, metadata FROM documents WHERE id = ?",
+                    (search,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return f"ID {search} not found."
+        return Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            count = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            pending = list(self._pending_deletes)
+            # 삭제 대기 중인 id 중 실제로 저장된 것만 뺀다 (sqlite 변수 수 제한 때문에 나눠 조회)
+            for start in range(0, len(pending), _SQLITE_LOOKUP_CHUNK):
+                chunk = pending[start : start + _SQLITE_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                count -= conn.execute(
+                    f"SELECT COUNT(*) FROM documents WHERE id IN ({placeholders})",
+                    chunk,
+                ).fetchone()[0]
+            return count
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # FAISS.save_local의 pickle에는 경로만 남긴다
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"])
+
+
+def parse_docstore(docstore: Any) -> Dict[str, Any]:
+    """
+    param.docstore 설정 -> {"type", "path"}.
+      docstore: sqlite                # 축약형 (스토어 디렉터리의 docstore.sqlite)
+      docstore:
+        type: sqlite                  # memory(기본) | sqlite
+        path: /data/docs.sqlite       # 선택
+    """
+    if docstore is None:
+        docstore = {}
+    elif isinstance(docstore, str):
+        docstore = {"type": docstore}
+    if not isinstance(docstore, dict):
+        raise ValueError(f"'docstore' must be a string or a dict, got {type(docstore)}")
+    unknown = set(docstore) - {"type", "path"}
+    if unknown:
+        raise ValueError(
+            f"Unsupported docstore options {unknown}. Allowed: ['path', 'type']"
+        )
+    docstore_type = docstore.get("type", "memory")
+    if docstore_type not in DOCSTORE_TYPES:
+        raise ValueError(
+            f"Unsupported docstore type: {docstore_type}. Allowed: {DOCSTORE_TYPES}"
+        )
+    return {"type": docstore_type, "path": docstore.get("path")}
@@ -1,6 +1,7 @@
 from typing import Dict
 from agentblock.base import BaseReference
 from agentblock.vector_store.faiss_utils import create_faiss_vector_store
+from agentblock.vector_store.sharded_faiss import create_sharded_faiss_store
 
 from langchain.docstore.document import Document
 from langchain_core.embeddings import Embeddings
@@ -67,7 +68,7 @@ class VectorStoreReference(BaseReference):
         """
         실제 FAISS VectorStore를 생성/로드하여 self._vector_store에 보관
         - EmbeddingReference를 build()하여 LangChain Embeddings 객체 획득
-        - param dict에서 path, 등 필요한 인자 로드
+        - param dict에서 path, index(압축 인덱스 설정), dimension, model_id, persistence, read_only / mmap, docstore 등 필요한 인자 로드
         """
         if self._vector_store is not None:
             return self._vector_store  # 캐싱
@@ -84,7 +85,39 @@ class VectorStoreReference(BaseReference):
             param_dict = self.config.get("param", {})
             faiss_path = param_dict.get("path")
 
-            self._vector_store = create_faiss_vector_store(embedding_obj, faiss_path)
+            self._vector_store = create_faiss_vector_store(
+                embedding_obj,
+                faiss_path,
+                index=param_dict.get("index"),
+                dimension=param_dict.get("dimension"),
+                model_id=param_dict.get("model_id"),
+                persistence=param_dict.get("persistence"),
+                read_only=param_dict.get("read_only", False),
+                mmap=param_dict.get("mmap", False),
+                docstore=param_dict.get("docstore"),
+            )
+        elif self.provider == "sharded_faiss":
+            if not self.embedding_ref:
+                raise ValueError(
+                    "sharded_faiss requires an EmbeddingReference, but none found."
+                )
+            param_dict = self.config.get("param", {})
+            # 샤드 구성 외의 인자(index, persistence, docstore 등)는 모든 샤드에 같게 적용
+            self._vector_store = create_sharded_faiss_store(
+                self.embedding_ref,
+                param_dict.get("path"),
+                num_shards=param_dict.get("num_shards", 4),
+                route_by=param_dict.get("route_by", "hash"),
+                route_key=param_dict.get("route_key"),
+                max_workers=param_dict.get("max_workers"),
+                index=param_dict.get("index"),
+                dimension=param_dict.get("dimension"),
+                model_id=param_dict.get("model_id"),
+                persistence=param_dict.get("persistence"),
+                read_only=param_dict.get("read_only", False),
+                mmap=param_dict.get("mmap", False),
+                docstore=param_dict.get("docstore"),
+            )
         else:
             raise ValueError(f"Unsupported vector store provider: {self.provider}")
 
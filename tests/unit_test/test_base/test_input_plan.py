@@ -0,0 +1,47 @@
+import pytest
+
+from agentblock.base import InputPlan
+from agentblock.function.function_from_library_node import FunctionFromLibraryNode
+
+
+class StateWithoutCopy(dict):
+    """get_inputs가 state 전체를 복사하면 실패하는 dict"""
+
+    def keys(self):
+        raise AssertionError("state 전체를 순회/복사하면 안 됩니다.")
+
+    def __iter__(self):
+        raise AssertionError("state 전체를 순회/복사하면 안 됩니다.")
+
+
+def test_input_plan_compiles_mappings_once():
+    plan = InputPlan.compile(["pdf_documents -> documents", " query "])
+
+    assert plan.mappings == (("pdf_documents", "documents"), ("query", "query"))
+    assert plan.dest_keys == frozenset({"documents", "query"})
+    with pytest.raises(AttributeError):
+        plan.mappings = ()
+
+
+def test_input_plan_reads_only_needed_keys():
+    plan = InputPlan.compile(["a -> x", "b"])
+    state = StateWithoutCopy(a=1, b=2, c=3)
+
+    assert plan.read(state) == {"x": 1, "b": 2}
+
+
+def test_node_build_compiles_plan_and_validates_with_it():
+    node = FunctionFromLibraryNode(
+        name="split",
+        input_keys=["raw_docs -> documents"],
+        output_key="split_docs",
+        from_library="agentblock.preprocessing.text_splitter:character_text_split",
+    )
+    node_fn = node.build()
+
+    assert node.input_plan.mappings == (("raw_docs", "documents"),)
+    result = node_fn(StateWithoutCopy(raw_docs=[], other=[1] * 1000))
+    assert result == {"split_docs": []}
+
+    with pytest.raises(ValueError, match="Missing required input keys"):
+        node._validate_inputs({})
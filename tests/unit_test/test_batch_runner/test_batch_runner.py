@@ -0,0 +1,141 @@
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from agentblock.batch_runner import BatchRunner
+from agentblock.graph_builder import GraphBuilder
+
+
+@pytest.fixture
+def batch_module(monkeypatch):
+    module = types.ModuleType("batch_module")
+    module.active = 0
+    module.peak = 0
+    module.lock = threading.Lock()
+
+    def work(x):
+        with module.lock:
+            module.active += 1
+            module.peak = max(module.peak, module.active)
+        try:
+            time.sleep(0.02)
+            if x < 0:
+                raise ValueError(f"negative input: {x}")
+            return x * 2
+        finally:
+            with module.lock:
+                module.active -= 1
+
+    module.work = work
+    monkeypatch.setitem(sys.modules, "batch_module", module)
+    return module
+
+
+def _graph(async_mode=False):
+    yaml_data = {
+        "nodes": [
+            {
+                "name": "work",
+                "type": "function_from_library",
+                "input_keys": ["x"],
+                "output_key": "value",
+                "config": {"from_library": "batch_module:work"},
+            }
+        ],
+        "edges": [{"from": "START", "to": "work"}, {"from": "work", "to": "END"}],
+    }
+    return GraphBuilder.from_yaml_data(yaml_data).build(async_mode=async_mode)
+
+
+def test_run_all_returns_results_in_input_order(batch_module):
+    runner = BatchRunner(_graph(), max_concurrency=4)
+    results = runner.run_all({"x": i} for i in range(20))
+
+    assert [r.index for r in results] == list(range(20))
+    assert [r.output["value"] for r in results] == [i * 2 for i in range(20)]
+
+
+def test_concurrency_is_bounded(batch_module):
+    runner = BatchRunner(_graph(), max_concurrency=3)
+    results = list(runner.run({"x": i} for i in range(30)))
+
+    assert len(results) == 30
+    assert batch_module.peak == 3
+
+
+def test_failures_are_isolated(batch_module):
+    runner = BatchRunner(_graph(), max_concurrency=4)
+    results = runner.run_all([{"x": 1}, {"x": -1}, {"x": 2}])
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert results[1].input == {"x": -1}
+    assert results[2].output["value"] == 4
+
+
+def test_inputs_are_consumed_lazily(batch_module):
+    consumed = []
+
+    def inputs():
+        for i in range(1000):
+            consumed.append(i)
+            yield {"x": i}
+
+    runner = BatchRunner(_graph(), max_concurrency=2)
+    stream = runner.run(inputs())
+    next(stream)
+    stream.close()
+
+    # 진행 중인 입력 + 결과를 채우기 위해 읽은 입력만 소비
+    assert len(consumed) <= 4
+
+
+def test_slow_consumer_keeps_workers_busy(batch_module):
+    consumed = []
+
+    def inputs():
+        for i in range(10):
+            consumed.append(i)
+            yield {"x": i}
+
+    runner = BatchRunner(_graph(), max_concurrency=2)
+    stream = runner.run(inputs())
+    next(stream)
+
+    # 첫 결과를 받은 소비자가 멈춰 있는 동안에도 다음 입력이 이미 실행 중이다
+    assert len(consumed) >= 3
+    stream.close()
+
+    async_runner = BatchRunner(_graph(async_mode=True), max_concurrency=2)
+
+    async def first_result():
+        async for _ in async_runner.arun(inputs()):
+            return len(consumed)
+
+    consumed.clear()
+    assert asyncio.run(first_result()) >= 3
+
+
+def test_arun_streams_results(batch_module):
+    runner = BatchRunner(_graph(async_mode=True), max_concurrency=5)
+
+    async def collect():
+        return [r async for r in runner.arun({"x": i} for i in range(-1, 10))]
+
+    results = asyncio.run(collect())
+
+    assert len(results) == 11
+    assert sum(not r.ok for r in results) == 1
+    assert batch_module.peak <= 5
+    assert sorted(r.output["value"] for r in results if r.ok) == [
+        i * 2 for i in range(10)
+    ]
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        BatchRunner(graph=None, max_concurrency=0)
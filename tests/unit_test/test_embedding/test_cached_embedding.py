@@ -0,0 +1,200 @@
+import asyncio
+from typing import List
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from agentblock.embedding.cached_embedding import CachedEmbedding, model_identity
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+
+
+class CountingEmbedding(Embeddings):
+    """텍스트 길이로 벡터를 만들고, provider 호출 내역을 기록하는 테스트용 임베딩"""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+        self.dimension = 2
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls.append([text])
+        return [float(len(text)), 1.5]
+
+
+def make_cache(tmp_path, inner=None, **kwargs):
+    return CachedEmbedding(
+        inner or CountingEmbedding(),
+        model_id="counting:{}",
+        path=str(tmp_path / "cache.sqlite"),
+        **kwargs,
+    )
+
+
+def test_only_misses_go_to_provider_in_one_batch(tmp_path):
+    inner = CountingEmbedding()
+    cache = make_cache(tmp_path, inner)
+
+    assert cache.embed_documents(["a", "bb"]) == [[1.0, 0.5], [2.0, 0.5]]
+    result = cache.embed_documents(["bb", "ccc", "a", "ccc", "dddd"])
+
+    assert result == [[2.0, 0.5], [3.0, 0.5], [1.0, 0.5], [3.0, 0.5], [4.0, 0.5]]
+    # 두 번째 호출에서는 miss(중복 제거)만 한 번에 전달
+    assert inner.calls == [["a", "bb"], ["ccc", "dddd"]]
+
+    stats = cache.stats()
+    assert stats["misses"] == 4
+    assert stats["memory_hits"] == 2
+    assert stats["hit_ratio"] == pytest.approx(2 / 6)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    make_cache(tmp_path).embed_documents(["a", "bb"])
+
+    inner = CountingEmbedding()
+    cache = make_cache(tmp_path, inner)
+    assert cache.embed_documents(["a", "bb"]) == [[1.0, 0.5], [2.0, 0.5]]
+    assert inner.calls == []
+    assert cache.stats()["disk_hits"] == 2
+    assert cache.stats()["disk_items"] == 2
+
+    # 디스크 히트는 메모리로 승격
+    cache.embed_documents(["a"])
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_memory_lru_eviction(tmp_path):
+    cache = CachedEmbedding(
+        CountingEmbedding(), model_id="m", backend="memory", memory_items=2
+    )
+    cache.embed_documents(["a", "b", "c"])
+    assert cache.stats()["memory_items"] == 2
+
+    cache.embed_documents(["a"])
+    assert cache.stats()["misses"] == 4
+
+
+def test_model_identity_separates_entries(tmp_path):
+    inner = CountingEmbedding()
+    path = str(tmp_path / "cache.sqlite")
+    CachedEmbedding(
+        inner, model_identity("openai", {"model": "a"}), path=path
+    ).embed_documents(["x"])
+    CachedEmbedding(
+        inner, model_identity("openai", {"model": "b"}), path=path
+    ).embed_documents(["x"])
+
+    assert inner.calls == [["x"], ["x"]]
+    # 자격 증명은 identity에 포함되지 않는다
+    assert model_identity(
+        "openai", {"model": "a", "openai_api_key": "sk-1"}
+    ) == model_identity("openai", {"model": "a"})
+
+
+def test_embed_matrix_uses_cache(tmp_path):
+    hashing = HashingEmbedding(dimension=8, n_features=64)
+    calls = []
+
+    class CountingHashing(Embeddings):
+        def embed_documents(self, texts):
+            return hashing.embed_documents(texts)
+
+        def embed_query(self, text):
+            return hashing.embed_query(text)
+
+        def embed_matrix(self, texts):
+            calls.append(list(texts))
+            return hashing.embed_matrix(texts)
+
+    cache = make_cache(tmp_path, CountingHashing())
+    first = cache.embed_matrix(["a b", "c d", "a b"])
+    second = cache.embed_matrix(["c d", "e f"])
+
+    assert first.dtype == np.float32 and first.shape == (3, 8)
+    np.testing.assert_array_equal(first, hashing.embed_matrix(["a b", "c d", "a b"]))
+    np.testing.assert_array_equal(second, hashing.embed_matrix(["c d", "e f"]))
+    # 두 번째 호출에서는 miss만 원본 embed_matrix로 전달
+    assert calls == [["a b", "c d"], ["e f"]]
+    # embed_documents와 같은 캐시 항목을 공유
+    assert cache.embed_documents(["e f"]) == second[1:].tolist()
+    assert len(calls) == 2
+
+
+def test_embed_matrix_falls_back_to_embed_documents(tmp_path):
+    inner = CountingEmbedding()
+    cache = make_cache(tmp_path, inner)
+
+    matrix = cache.embed_matrix(["a", "bb"])
+    assert matrix.tolist() == [[1.0, 0.5], [2.0, 0.5]]
+    assert cache.embed_matrix(["bb"]).tolist() == [[2.0, 0.5]]
+    assert inner.calls == [["a", "bb"]]
+
+
+def test_query_and_documents_are_cached_separately(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.embed_query("abc") == [3.0, 1.5]
+    assert cache.embed_documents(["abc"]) == [[3.0, 0.5]]
+    assert cache.embed_query("abc") == [3.0, 1.5]
+    assert cache.stats()["misses"] == 2
+
+
+def test_async_interface(tmp_path):
+    inner = CountingEmbedding()
+    cache = make_cache(tmp_path, inner)
+    cache.embed_documents(["a"])
+
+    result = asyncio.run(cache.aembed_documents(["a", "bb"]))
+    assert result == [[1.0, 0.5], [2.0, 0.5]]
+    assert inner.calls == [["a"], ["bb"]]
+
+
+def test_embedding_reference_cache_config(tmp_path):
+    ref = EmbeddingReference.from_yaml(
+        {
+            "name": "cached",
+            "type": "embedding",
+            "config": {
+                "provider": "dummy",
+                "param": {"dimension": 3},
+                "cache": {"path": "cache.sqlite", "memory_items": 10},
+            },
+        },
+        base_dir=str(tmp_path),
+        references_map={},
+    )
+    embedding = ref.build()
+
+    assert isinstance(embedding, CachedEmbedding)
+    assert embedding.dimension == 3
+    assert embedding.embed_documents(["x"]) == [[0.1, 0.1, 0.1]]
+    assert (tmp_path / "cache.sqlite").exists()
+
+
+def test_cache_namespace_keeps_model_identity(tmp_path):
+    config = {"provider": "dummy", "param": {"dimension": 3}}
+    plain = EmbeddingReference("plain", "dummy", dict(config)).build()
+    cached = EmbeddingReference(
+        "cached",
+        "dummy",
+        dict(config, cache={"backend": "memory", "namespace": "dummy-v2"}),
+    ).build()
+
+    # namespace는 캐시 key에만 쓰이고, 벡터 스토어가 비교하는 identity는 provider + param
+    assert (
+        plain.model_id == cached.model_id == model_identity("dummy", {"dimension": 3})
+    )
+    assert cached._key("document", "x") != CachedEmbedding(
+        plain, model_id=cached.model_id, backend="memory"
+    )._key("document", "x")
+
+
+def test_embedding_reference_rejects_unknown_cache_option(tmp_path):
+    ref = EmbeddingReference(
+        "cached", "dummy", {"param": {}, "cache": {"backend": "memory", "ttl": 3}}
+    )
+    with pytest.raises(ValueError, match="ttl"):
+        ref.build()
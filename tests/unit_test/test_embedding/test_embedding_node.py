@@ -1,7 +1,14 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import numpy as np
 import pytest
 from langchain.schema import Document
 from agentblock.embedding.embedding_node import EmbeddingNode
 from agentblock.embedding.dummy_embedding import DummyEmbedding
+from agentblock.embedding.hashing_embedding import HashingEmbedding
 from agentblock.tools.load_config import load_config
 from agentblock.sample_data.tools import get_sample_data
 
@@ -70,6 +77,19 @@ def test_embedding_node_with_single_document():
     assert result["embedded_docs"][1][0] == [0.1, 0.1, 0.1, 0.1, 0.1]
 
 
+@pytest.mark.parametrize("method", ["embed_documents", "embed_query"])
+def test_embedding_node_async_matches_sync(method):
+    node, embedding_reference = setup_embedding_node_from_yaml(method=method)
+    docs = [Document(page_content="Document 1"), Document(page_content="Document 2")]
+    state = {"raw_docs": docs}
+
+    sync_result = node.build()(state)
+    async_result = asyncio.run(node.abuild()(state))
+
+    assert async_result["embedded_docs"][0] == docs
+    assert async_result["embedded_docs"][1] == sync_result["embedded_docs"][1]
+
+
 def test_invalid_method():
     node, embedding_reference = setup_embedding_node_from_yaml()
 
@@ -94,3 +114,260 @@ def test_invalid_method():
     )
     with pytest.raises(ValueError):
         node.build()
+
+
+class SlowBatchEmbedding(DummyEmbedding):
+    """배치 크기와 동시 실행 수를 기록하는 테스트용 임베딩"""
+
+    def __init__(self):
+        super().__init__(dimension=1)
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self.lock:
+            self.batches.append(list(texts))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return [[float(t)] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def make_batch_node(method, embedding, **param):
+    return EmbeddingNode.from_yaml(
+        {
+            "name": "batched",
+            "input_keys": ["docs"],
+            "output_key": "embedded",
+            "config": {
+                "param": {"method": method, **param},
+                "reference": {"embedding": "emb"},
+            },
+        },
+        base_dir="",
+        references_map={"emb": embedding},
+    )
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_embedding_node_batches_in_parallel_and_keeps_order(async_mode):
+    embedding = SlowBatchEmbedding()
+    node = make_batch_node(
+        "embed_documents", embedding, batch_size=2, max_concurrency=3
+    )
+    docs = [Document(page_content=str(i)) for i in range(5)]
+
+    if async_mode:
+        result = asyncio.run(node.abuild()({"docs": docs}))
+    else:
+        result = node.build()({"docs": docs})
+
+    assert result["embedded"][1] == [[float(i)] for i in range(5)]
+    assert sorted(map(len, embedding.batches)) == [1, 2, 2]
+    assert embedding.peak == 3
+
+
+def test_embedding_node_single_text_method_concurrency():
+    embedding = SlowBatchEmbedding()
+    node = make_batch_node("embed_query", embedding, max_concurrency=4)
+    docs = [Document(page_content=str(i)) for i in range(8)]
+
+    result = node.build()({"docs": docs})
+
+    assert result["embedded"][1] == [[float(i)] for i in range(8)]
+    assert embedding.peak == 4
+
+
+def test_method_signature_resolved_once(monkeypatch):
+    calls = []
+    original = EmbeddingNode._get_method_signature
+
+    def counting(self):
+        calls.append(1)
+        return original(self)
+
+    monkeypatch.setattr(EmbeddingNode, "_get_method_signature", counting)
+    node, _ = setup_embedding_node_from_yaml(method="embed_documents")
+    node_fn = node.build()
+    for _ in range(3):
+        node_fn({"raw_docs": [Document(page_content="a")]})
+
+    assert len(calls) == 1
+
+
+def test_invalid_batch_options():
+    with pytest.raises(ValueError):
+        make_batch_node("embed_documents", DummyEmbedding(), batch_size=0)
+    with pytest.raises(ValueError):
+        make_batch_node("embed_documents", DummyEmbedding(), max_concurrency=0)
+
+
+def test_embedding_node_in_graph():
+    from agentblock.graph_builder import GraphBuilder
+
+    graph = GraphBuilder(
+        get_sample_data("yaml/embedding/node/dummy_embedding.yaml")
+    ).build()
+    docs = [Document(page_content="a"), Document(page_content="b")]
+    result = graph.invoke({"raw_docs": docs})
+
+    assert result["embedded_docs"][1] == [[0.1] * 5, [0.1] * 5]
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_embedding_node_dedup_scatters_vectors(async_mode):
+    embedding = SlowBatchEmbedding()
+    node = make_batch_node("embed_documents", embedding, dedup=True, batch_size=2)
+    node.metadata_key = "embedding_stats"
+    contents = ["1", "2", "1", "3", "2", "1"]
+    docs = [Document(page_content=c) for c in contents]
+
+    if async_mode:
+        result = asyncio.run(node.abuild()({"docs": docs}))
+    else:
+        result = node.build()({"docs": docs})
+
+    out_docs, vectors = result["embedded"]
+    assert out_docs == docs
+    assert vectors == [[float(c)] for c in contents]
+    # 고유 텍스트 3개만 provider에 전달
+    assert sorted(t for batch in embedding.batches for t in batch) == ["1", "2", "3"]
+    assert result["embedding_stats"]["num_texts"] == 6
+    assert result["embedding_stats"]["num_embedded"] == 3
+    assert result["embedding_stats"]["dedup_ratio"] == pytest.approx(0.5)
+
+
+def test_embedding_node_dedup_disabled_by_default():
+    embedding = SlowBatchEmbedding()
+    node = make_batch_node("embed_documents", embedding)
+    docs = [Document(page_content="1") for _ in range(3)]
+
+    result = node.build()({"docs": docs})
+
+    assert embedding.batches == [["1", "1", "1"]]
+    assert "embedding_stats" not in result
+
+
+def test_embedding_node_metadata_key_in_graph():
+    from agentblock.graph_builder import GraphBuilder
+
+    yaml_data = load_config(get_sample_data("yaml/embedding/node/dummy_embedding.yaml"))
+    node_cfg = yaml_data["nodes"][0]
+    node_cfg["metadata_key"] = "embedding_stats"
+    node_cfg["config"]["param"]["dedup"] = True
+
+    graph = GraphBuilder.from_yaml_data(yaml_data).build()
+    docs = [Document(page_content="a"), Document(page_content="a")]
+    result = graph.invoke({"raw_docs": docs})
+
+    assert result["embedded_docs"][1] == [[0.1] * 5, [0.1] * 5]
+    assert result["embedding_stats"]["dedup_ratio"] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+@pytest.mark.parametrize("method", ["embed_documents", "embed_query"])
+def test_embedding_node_numpy_output(async_mode, method):
+    embedding = SlowBatchEmbedding()
+    node = make_batch_node(
+        method,
+        embedding,
+        output_format="numpy",
+        batch_size=2,
+        max_concurrency=2,
+        dedup=True,
+    )
+    contents = ["1", "2", "3", "1", "4"]
+    docs = [Document(page_content=c) for c in contents]
+
+    if async_mode:
+        result = asyncio.run(node.abuild()({"docs": docs}))
+    else:
+        result = node.build()({"docs": docs})
+
+    out_docs, matrix = result["embedded"]
+    assert out_docs == docs
+    assert isinstance(matrix, np.ndarray)
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(
+        matrix, np.array([[float(c)] for c in contents], np.float32)
+    )
+
+
+class MatrixOnlyEmbedding(HashingEmbedding):
+    """embed_documents(리스트 변환) 경로가 호출되면 실패하는 임베딩"""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise AssertionError("embed_documents should not be called")
+
+
+def test_embedding_node_numpy_output_uses_embed_matrix():
+    embedding = MatrixOnlyEmbedding(dimension=8)
+    contents = ["a b", "c", "a b", "d e f"]
+    expected = embedding.embed_matrix(contents)
+
+    node = make_batch_node(
+        "embed_documents", embedding, output_format="numpy", batch_size=3
+    )
+    docs = [Document(page_content=c) for c in contents]
+    _, matrix = node.build()({"docs": docs})["embedded"]
+
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(matrix, expected)
+
+
+def test_embedding_node_invalid_output_format():
+    with pytest.raises(ValueError, match="output_format"):
+        make_batch_node("embed_documents", DummyEmbedding(), output_format="arrow")
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_embedding_node_stream_is_lazy(async_mode):
+    embedding = SlowBatchEmbedding()
+    node = make_batch_node(
+        "embed_documents",
+        embedding,
+        stream_batch_size=3,
+        batch_size=2,
+        output_format="numpy",
+    )
+    node.metadata_key = "embedding_stats"
+    produced = []
+
+    def document_stream():
+        for i in range(7):
+            produced.append(i)
+            yield Document(page_content=str(i))
+
+    if async_mode:
+        result = asyncio.run(node.abuild()({"docs": document_stream()}))
+    else:
+        result = node.build()({"docs": document_stream()})
+
+    # generator를 소비하기 전에는 문서를 읽지도, 임베딩하지도 않는다
+    assert produced == [] and embedding.batches == []
+    batches = list(result["embedded"])
+
+    assert [len(docs) for docs, _ in batches] == [3, 3, 1]
+    assert [d.page_content for docs, _ in batches for d in docs] == [
+        str(i) for i in range(7)
+    ]
+    np.testing.assert_array_equal(
+        np.concatenate([vectors for _, vectors in batches]),
+        np.arange(7, dtype=np.float32)[:, None],
+    )
+    assert sorted(map(len, embedding.batches)) == [1, 1, 1, 2, 2]
+    assert result["embedding_stats"]["num_texts"] == 7
+
+
+def test_invalid_stream_batch_size():
+    with pytest.raises(ValueError, match="stream_batch_size"):
+        make_batch_node("embed_documents", DummyEmbedding(), stream_batch_size=0)
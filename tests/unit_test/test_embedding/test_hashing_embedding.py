@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.embedding.hashing_embedding import HashingEmbedding, hash_tokens
+from agentblock.sample_data.tools import get_sample_data
+from agentblock.tools.load_config import load_config
+
+
+def test_hash_tokens_deterministic():
+    tokens = ["hello", "world", "안녕", "hello", "a" * 300]
+    hashes = hash_tokens(tokens)
+
+    assert hashes.dtype == np.uint64
+    assert hashes[0] == hashes[3]
+    assert len(set(hashes.tolist())) == 4
+    np.testing.assert_array_equal(hashes, hash_tokens(tokens))
+    assert not np.array_equal(hashes, hash_tokens(tokens, seed=1))
+
+
+def test_embed_matrix_shape_and_norm():
+    embedding = HashingEmbedding(dimension=32, n_features=1024)
+    matrix = embedding.embed_matrix(["alpha beta", "gamma", "", "!!!"])
+
+    assert matrix.shape == (4, 32)
+    assert matrix.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(matrix[:2], axis=1), 1.0, rtol=1e-5)
+    # 토큰이 없는 텍스트는 0 벡터
+    assert not matrix[2:].any()
+
+
+def test_content_dependent_and_reproducible():
+    texts = [
+        "the cat sat on the mat",
+        "the cat sat on a mat",
+        "quarterly earnings report",
+    ]
+    a, b, c = HashingEmbedding(dimension=256, seed=3).embed_matrix(texts)
+
+    assert a @ b > 0.7
+    assert abs(a @ c) < 0.3
+    np.testing.assert_array_equal(
+        HashingEmbedding(dimension=256, seed=3).embed_matrix(texts[:1])[0], a
+    )
+    assert not np.allclose(
+        HashingEmbedding(dimension=256, seed=4).embed_matrix(texts[:1])[0], a
+    )
+
+
+def test_batch_matches_single_calls():
+    # 토큰 chunk 경계를 넘는 큰 배치에서도 텍스트별 결과가 같아야 함
+    embedding = HashingEmbedding(dimension=16, n_features=512)
+    texts = [" ".join(f"w{i * 7 + j}" for j in range(50)) for i in range(400)]
+
+    batch = embedding.embed_matrix(texts)
+    for i in (0, 199, 399):
+        np.testing.assert_allclose(
+            batch[i], embedding.embed_query(texts[i]), rtol=1e-5, atol=1e-6
+        )
+    assert embedding.embed_documents(texts[:2]) == batch[:2].tolist()
+
+
+def test_ngram_range():
+    unigram = HashingEmbedding(dimension=64, ngram_range=(1, 1))
+    bigram = HashingEmbedding(dimension=64, ngram_range=(1, 2))
+
+    assert bigram._tokenize("A b c") == ["a", "b", "c", "a b", "b c"]
+    assert HashingEmbedding(ngram_range=(2, 2))._tokenize("a b c") == ["a b", "b c"]
+    # 단어 순서만 다른 텍스트는 unigram에서는 같고 bigram에서는 다르다
+    np.testing.assert_allclose(*unigram.embed_matrix(["a b c", "c b a"]), rtol=1e-5)
+    assert not np.allclose(*bigram.embed_matrix(["a b c", "c b a"]))
+
+
+def test_invalid_params():
+    with pytest.raises(ValueError):
+        HashingEmbedding(dimension=0)
+    with pytest.raises(ValueError):
+        HashingEmbedding(ngram_range=(2, 1))
+
+
+def test_hashing_embedding_reference():
+    data = load_config(
+        get_sample_data("yaml/embedding/reference/hashing_embedding.yaml")
+    )
+    embedding = EmbeddingReference.from_yaml(data["references"][0], ".", {}).build()
+
+    assert isinstance(embedding, HashingEmbedding)
+    assert embedding.dimension == 64
+    assert embedding.ngram_range == (1, 2)
+    assert len(embedding.embed_query("hello world")) == 64
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from agentblock.embedding.cached_embedding import model_identity
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.embedding.process_pool_embedding import ProcessPoolEmbedding
+from agentblock.vector_store.faiss_utils import (
+    create_faiss_vector_store,
+    embedding_identity,
+)
+
+PARAM = {"dimension": 16, "n_features": 256, "seed": 3}
+TEXTS = [f"document number {i} about topic {i % 4}" for i in range(23)]
+
+
+def test_process_pool_matches_single_process():
+    embedding = ProcessPoolEmbedding("hashing", PARAM, workers=2, batch_size=5)
+    try:
+        vectors = embedding.embed_matrix(TEXTS)
+        query = embedding.embed_query(TEXTS[0])
+    finally:
+        embedding.close()
+
+    expected = HashingEmbedding(**PARAM).embed_matrix(TEXTS)
+    assert vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors, expected)
+    assert query == expected[0].tolist()
+    assert embedding.embed_matrix([]).shape == (0, 16)
+
+
+def test_process_pool_identity_and_dimension():
+    embedding = ProcessPoolEmbedding("hashing", {"n_features": 64}, workers=1)
+    try:
+        # param에 dimension이 없으면 워커에 로드된 모델에서 가져온다
+        assert embedding.dimension == 256
+    finally:
+        embedding.close()
+
+    assert embedding_identity(embedding) == model_identity(
+        "hashing", {"n_features": 64}
+    )
+
+    with pytest.raises(ValueError, match="batch_size"):
+        ProcessPoolEmbedding("hashing", PARAM, batch_size=0)
+
+
+def test_embedding_reference_process_pool():
+    config = {
+        "name": "pooled",
+        "config": {
+            "provider": "hashing",
+            "param": PARAM,
+            "process_pool": {"workers": 2, "batch_size": 8},
+        },
+    }
+    embedding = EmbeddingReference.from_yaml(config, ".", {}).build()
+    assert isinstance(embedding, ProcessPoolEmbedding)
+    assert (embedding.workers, embedding.batch_size) == (2, 8)
+
+    config["config"]["process_pool"] = {"processes": 2}
+    with pytest.raises(ValueError, match="unsupported process_pool options"):
+        EmbeddingReference.from_yaml(config, ".", {}).build()
+
+
+@pytest.mark.parametrize("cache", [None, {"backend": "memory"}])
+def test_loading_store_does_not_start_workers(tmp_path, cache):
+    # param에 dimension이 없으면 차원은 워커에서만 알 수 있다
+    param = {"n_features": 256, "seed": 3}
+    path = str(tmp_path / "store")
+    plain = EmbeddingReference("plain", "hashing", {"param": param}).build()
+    store = create_faiss_vector_store(plain, path=path)
+    store.add_texts(TEXTS)
+    store.save()
+
+    config = {"param": param, "process_pool": {"workers": 1}}
+    if cache:
+        config["cache"] = cache
+    embedding = EmbeddingReference("pooled", "hashing", config).build()
+    loaded = create_faiss_vector_store(embedding, path=path)
+
+    pool = embedding.embedding if cache else embedding
+    assert pool._executor is None
+    assert loaded.index.ntotal == len(TEXTS)
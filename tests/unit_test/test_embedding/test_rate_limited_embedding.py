@@ -0,0 +1,228 @@
+import json
+import time
+import asyncio
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from agentblock.embedding.dummy_embedding import DummyEmbedding
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.embedding.rate_limited_embedding import (
+    RateLimitedEmbedding,
+    TokenBucket,
+    is_throttled,
+)
+
+
+class StubServer:
+    """
+    /embeddings 요청을 받는 로컬 stub 서버.
+    처음 throttle_first개의 요청에는 429(Retry-After: 0)를, 이후에는 텍스트 길이 기반 벡터를 응답한다.
+    """
+
+    def __init__(
+        self, throttle_first: int = 0, error_status: int = 429, delay: float = 0.0
+    ):
+        self.throttle_first = throttle_first
+        self.error_status = error_status
+        self.delay = delay
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests.append(body["input"])
+                    throttled = len(stub.requests) <= stub.throttle_first
+                    stub.active += 1
+                    stub.peak = max(stub.peak, stub.active)
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.active -= 1
+
+                if throttled:
+                    self.send_response(stub.error_status)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+                payload = json.dumps(
+                    {
+                        "data": [
+                            {"embedding": [float(len(t)), 1.0]} for t in body["input"]
+                        ]
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/embeddings"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubHTTPEmbedding(Embeddings):
+    """stub 서버를 호출하는 최소 HTTP 임베딩 클라이언트 (실패 시 urllib HTTPError)"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"input": texts}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            return [item["embedding"] for item in json.loads(response.read())["data"]]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+TEXTS = [f"text {'x' * i}" for i in range(10)]
+EXPECTED = [[float(len(t)), 1.0] for t in TEXTS]
+
+
+def test_batches_keep_order():
+    with StubServer() as stub:
+        embedding = RateLimitedEmbedding(StubHTTPEmbedding(stub.url), max_batch_size=3)
+        assert embedding.embed_documents(TEXTS) == EXPECTED
+
+    # 배치는 동시에 전송되므로 도착 순서는 정해져 있지 않다
+    assert sorted(len(batch) for batch in stub.requests) == [1, 3, 3, 3]
+    assert embedding.stats() == {"requests": 4, "retries": 0}
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttled_requests_are_retried(status):
+    with StubServer(throttle_first=2, error_status=status) as stub:
+        embedding = RateLimitedEmbedding(
+            StubHTTPEmbedding(stub.url), max_concurrency=1, initial_backoff=0.01
+        )
+        assert embedding.embed_documents(TEXTS) == EXPECTED
+
+    assert len(stub.requests) == 3
+    assert embedding.stats()["retries"] == 2
+
+
+def test_retries_exhausted():
+    with StubServer(throttle_first=10) as stub:
+        embedding = RateLimitedEmbedding(
+            StubHTTPEmbedding(stub.url), max_retries=2, initial_backoff=0.01
+        )
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            embedding.embed_documents(TEXTS)
+
+    assert exc_info.value.code == 429
+    assert len(stub.requests) == 3
+
+
+def test_non_throttle_error_not_retried():
+    with StubServer(throttle_first=1, error_status=500) as stub:
+        embedding = RateLimitedEmbedding(
+            StubHTTPEmbedding(stub.url), initial_backoff=0.01
+        )
+        with pytest.raises(urllib.error.HTTPError):
+            embedding.embed_documents(TEXTS)
+
+    assert len(stub.requests) == 1
+
+
+def test_async_concurrent_batches():
+    with StubServer(throttle_first=1, delay=0.05) as stub:
+        embedding = RateLimitedEmbedding(
+            StubHTTPEmbedding(stub.url),
+            max_batch_size=2,
+            max_concurrency=3,
+            initial_backoff=0.01,
+        )
+        result = asyncio.run(embedding.aembed_documents(TEXTS))
+
+    assert result == EXPECTED
+    assert stub.peak == 3
+    assert len(stub.requests) == 6  # 5 batches + 1 retry
+
+
+def test_requests_per_minute_budget():
+    # 초당 1회(RPM 60), 용량 60 -> 처음 60건은 대기 없음, 이후 1초씩 밀린다
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+
+    waits = [bucket.reserve(1) for _ in range(62)]
+    assert waits[:60] == [0.0] * 60
+    assert waits[60:] == pytest.approx([1.0, 2.0])
+
+    now[0] = 10.0
+    assert bucket.reserve(1) == 0.0
+
+
+def test_pause_blocks_all_callers():
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+    bucket.pause(5.0)
+
+    assert bucket.reserve(1) == pytest.approx(6.0)
+
+
+def test_tokens_per_minute_splits_batches():
+    embedding = RateLimitedEmbedding(
+        DummyEmbedding(), tokens_per_minute=10, token_counter=len, max_batch_size=100
+    )
+
+    assert embedding._batches(["aaaa", "bbbb", "cc", "dddddddddddd", "e"]) == [
+        ["aaaa", "bbbb", "cc"],
+        ["dddddddddddd"],
+        ["e"],
+    ]
+
+
+def test_is_throttled_by_class_name():
+    class RateLimitError(Exception):
+        pass
+
+    assert is_throttled(RateLimitError())
+    assert not is_throttled(ValueError())
+
+
+def test_embedding_reference_rate_limit():
+    config = {
+        "name": "limited",
+        "config": {
+            "provider": "dummy",
+            "param": {"dimension": 4},
+            "rate_limit": {"requests_per_minute": 600, "max_batch_size": 2},
+        },
+    }
+    embedding = EmbeddingReference.from_yaml(config, ".", {}).build()
+
+    assert isinstance(embedding, RateLimitedEmbedding)
+    assert embedding.dimension == 4
+    assert embedding.embed_documents(["a", "b", "c"]) == [[0.1] * 4] * 3
+
+    config["config"]["rate_limit"] = {"rpm": 10}
+    with pytest.raises(ValueError, match="unsupported rate_limit options"):
+        EmbeddingReference.from_yaml(config, ".", {}).build()
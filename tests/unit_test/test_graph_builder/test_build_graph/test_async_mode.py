@@ -0,0 +1,160 @@
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import pytest
+from langchain.schema import Document
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.graph_cache import GRAPH_CACHE
+from agentblock.sample_data.tools import get_sample_data
+
+path_fan_out = get_sample_data(
+    "yaml/function/function_from_file/test_yaml/test_fan_out.yaml"
+)
+
+
+def _library_graph(node_names, output_key="value"):
+    """async_module의 함수들을 순서대로 잇는 그래프 dict"""
+    nodes = [
+        {
+            "name": name,
+            "type": "function_from_library",
+            "input_keys": ["x"],
+            "output_key": output_key,
+            "config": {"from_library": f"async_module:{name}"},
+        }
+        for name in node_names
+    ]
+    edges = [{"from": "START", "to": node_names[0]}]
+    edges += [{"from": a, "to": b} for a, b in zip(node_names, node_names[1:])]
+    edges.append({"from": node_names[-1], "to": "END"})
+    return {"nodes": nodes, "edges": edges}
+
+
+@pytest.fixture
+def async_module(monkeypatch):
+    module = types.ModuleType("async_module")
+    monkeypatch.setitem(sys.modules, "async_module", module)
+    return module
+
+
+def test_async_mode_runs_with_ainvoke():
+    graph = GraphBuilder(path_fan_out).build(async_mode=True)
+    result = asyncio.run(graph.ainvoke({"x": 1}))
+
+    assert result["joined"] == "a:1,b:1"
+
+
+def test_blocking_function_is_offloaded(async_module):
+    threads = {}
+
+    async def native(x):
+        threads["native"] = threading.current_thread()
+        return x
+
+    def blocking(x):
+        threads["blocking"] = threading.current_thread()
+        return x + 1
+
+    async_module.native, async_module.blocking = native, blocking
+
+    graph = GraphBuilder.from_yaml_data(_library_graph(["native", "blocking"])).build(
+        async_mode=True
+    )
+
+    async def run():
+        loop_thread = threading.current_thread()
+        result = await graph.ainvoke({"x": 1})
+        return loop_thread, result
+
+    loop_thread, result = asyncio.run(run())
+    assert result["value"] == 2
+    # async 함수는 이벤트 루프 스레드에서, 동기 함수는 스레드 풀에서 실행
+    assert threads["native"] is loop_thread
+    assert threads["blocking"] is not loop_thread
+
+
+def test_many_concurrent_runs_share_one_loop(async_module):
+    async def wait(x):
+        await asyncio.sleep(0.2)
+        return x * 2
+
+    async_module.wait = wait
+    graph = GraphBuilder.from_yaml_data(_library_graph(["wait"])).build(async_mode=True)
+
+    async def run():
+        return await asyncio.gather(*(graph.ainvoke({"x": i}) for i in range(200)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert [r["value"] for r in results] == [i * 2 for i in range(200)]
+    # 직렬이라면 40초, 스레드 풀 크기에 묶였다면 수 초가 걸린다
+    assert elapsed < 5
+
+
+def test_async_embedding_saver_and_retriever(tmp_path):
+    yaml_data = {
+        "references": [
+            {
+                "name": "dummy_emb",
+                "type": "embedding",
+                "config": {"provider": "dummy", "param": {"dimension": 5}},
+            },
+            {
+                "name": "my_faiss",
+                "type": "vector_store",
+                "config": {
+                    "provider": "faiss",
+                    "param": {"path": str(tmp_path / "test.faiss")},
+                    "reference": {"embedding": "dummy_emb"},
+                },
+            },
+        ],
+        "nodes": [
+            {
+                "name": "saver",
+                "type": "data_saver",
+                "input_keys": ["documents"],
+                "output_key": "result",
+                "config": {"reference": {"vector_store": "my_faiss"}},
+            },
+            {
+                "name": "retriever",
+                "type": "retriever",
+                "input_keys": ["query"],
+                "output_key": "retrieved",
+                "config": {
+                    "search_kwargs": {"k": 1},
+                    "reference": {"vector_store": "my_faiss"},
+                },
+            },
+        ],
+        "edges": [
+            {"from": "START", "to": "saver"},
+            {"from": "saver", "to": "retriever"},
+            {"from": "retriever", "to": "END"},
+        ],
+    }
+
+    graph = GraphBuilder.from_yaml_data(yaml_data).build(async_mode=True)
+    state = {"documents": [Document(page_content="doc1")], "query": "doc"}
+    result = asyncio.run(graph.ainvoke(state))
+
+    assert result["result"]["num_docs"] == 1
+    assert (tmp_path / "test.faiss").exists()
+    assert [d.page_content for d in result["retrieved"]] == ["doc1"]
+
+
+def test_async_mode_is_part_of_cache_key():
+    GRAPH_CACHE.clear()
+    sync_graph = GraphBuilder.build_cached(path_fan_out)
+    async_graph = GraphBuilder.build_cached(path_fan_out, async_mode=True)
+
+    assert sync_graph is not async_graph
+    assert GraphBuilder.build_cached(path_fan_out, async_mode=True) is async_graph
+    GRAPH_CACHE.clear()
@@ -0,0 +1,98 @@
+import copy
+import sys
+import threading
+import types
+
+import pytest
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.graph_cache import GRAPH_CACHE
+from agentblock.reducers import append_reducer, merge_reducer
+from agentblock.sample_data.tools import get_sample_data
+from agentblock.schema.tools import validate_yaml_data
+from agentblock.tools.load_config import load_config
+
+path_fan_out = get_sample_data(
+    "yaml/function/function_from_file/test_yaml/test_fan_out.yaml"
+)
+
+
+def test_fan_out_results_are_merged_by_reducer():
+    graph = GraphBuilder(path_fan_out).build()
+    result = graph.invoke({"x": 1})
+
+    assert result["tags"] == ["a:1", "b:1"]
+    assert result["joined"] == "a:1,b:1"
+
+
+def test_fan_out_branches_run_concurrently(monkeypatch):
+    """두 branch가 같은 step에서 동시에 실행되지 않으면 Barrier가 깨진다"""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def left(x):
+        barrier.wait()
+        return {"left": x}
+
+    def right(x):
+        barrier.wait()
+        return {"right": x}
+
+    module = types.ModuleType("fan_out_branches")
+    module.left, module.right = left, right
+    monkeypatch.setitem(sys.modules, "fan_out_branches", module)
+
+    yaml_data = {
+        "state": {"parts": {"reducer": "merge"}},
+        "nodes": [
+            {
+                "name": name,
+                "type": "function_from_library",
+                "input_keys": ["x"],
+                "output_key": "parts",
+                "config": {"from_library": f"fan_out_branches:{name}"},
+            }
+            for name in ("left", "right")
+        ],
+        "edges": [
+            {"from": "START", "to": "left"},
+            {"from": "START", "to": "right"},
+            {"from": ["left", "right"], "to": "END"},
+        ],
+    }
+
+    graph = GraphBuilder.from_yaml_data(yaml_data).build()
+    assert graph.invoke({"x": 7})["parts"] == {"left": 7, "right": 7}
+
+
+def test_state_reducers_restored_from_cache():
+    GRAPH_CACHE.clear()
+    builder = GraphBuilder(path_fan_out)
+    builder.build(use_cache=True)
+
+    cached = GraphBuilder(path_fan_out)
+    cached.build(use_cache=True)
+    assert cached.state_reducers == {"tags": append_reducer}
+    GRAPH_CACHE.clear()
+
+
+def test_reducers():
+    assert append_reducer(None, "a") == ["a"]
+    assert append_reducer(["a"], ["b", "c"]) == ["a", "b", "c"]
+    assert merge_reducer({"a": 1}, {"a": 2, "b": 3}) == {"a": 2, "b": 3}
+
+
+@pytest.mark.parametrize(
+    "mutate, err_msg_regex",
+    [
+        (lambda d: d["state"]["tags"].update(reducer="concat"), "reducer 'concat'"),
+        (lambda d: d.update(state=["tags"]), "'state' 필드는 dict"),
+        (lambda d: d["edges"][2].update({"from": ["START", "tag_a_node"]}), "START"),
+        (lambda d: d["edges"][2].update({"from": ["tag_a_node", "nope"]}), "nope"),
+        (lambda d: d["edges"][2].update({"from": []}), "비었거나"),
+    ],
+)
+def test_fan_out_validation_errors(mutate, err_msg_regex):
+    data = copy.deepcopy(load_config(path_fan_out))
+    mutate(data)
+    with pytest.raises(ValueError, match=err_msg_regex):
+        validate_yaml_data(data)
@@ -0,0 +1,97 @@
+import os
+import tempfile
+
+import pytest
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.graph_cache import GRAPH_CACHE
+from agentblock.sample_data.tools import get_sample_data
+from agentblock.tools.load_config import load_config
+
+path_single_value = get_sample_data(
+    "yaml/function/function_from_file/test_yaml/test_single_value.yaml"
+)
+base_dir = os.path.dirname(path_single_value)
+
+
+@pytest.fixture
+def no_temp_files(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("dict 기반 빌드는 임시 파일을 만들면 안 됩니다.")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", fail)
+
+
+def test_from_yaml_data_builds_without_files(no_temp_files):
+    yaml_data = load_config(path_single_value)
+
+    builder = GraphBuilder.from_yaml_data(yaml_data, base_dir=base_dir)
+    assert builder.yaml_path is None
+    assert builder.yaml_dir == base_dir
+
+    graph = builder.build()
+    assert graph.invoke({"x": 10})["value"] == 20
+
+
+def test_from_yaml_data_resolves_sub_graph_relative_to_base_dir(no_temp_files):
+    yaml_data = {
+        "nodes": [
+            {
+                "name": "sub",
+                "type": "from_yaml",
+                "config": {"from_file": "test_single_value.yaml"},
+            }
+        ],
+        "edges": [{"from": "START", "to": "sub"}, {"from": "sub", "to": "END"}],
+    }
+
+    builder = GraphBuilder.from_yaml_data(yaml_data, base_dir=base_dir)
+    graph = builder.build()
+
+    assert builder.used_keys == {"x", "value"}
+    assert graph.invoke({"x": 3})["value"] == 6
+
+
+def test_from_yaml_data_is_validated():
+    with pytest.raises(ValueError, match="END로 가는 edge가 없습니다"):
+        GraphBuilder.from_yaml_data(
+            {
+                "nodes": [
+                    {
+                        "name": "n",
+                        "type": "function_from_library",
+                        "output_key": "y",
+                        "config": {"from_library": "math:sqrt"},
+                    }
+                ],
+                "edges": [{"from": "START", "to": "n"}],
+            }
+        )
+
+
+def test_path_and_yaml_data_are_exclusive():
+    with pytest.raises(ValueError):
+        GraphBuilder()
+    with pytest.raises(ValueError):
+        GraphBuilder(path_single_value, yaml_data={})
+
+
+def test_from_yaml_data_uses_graph_cache():
+    GRAPH_CACHE.clear()
+    yaml_data = load_config(path_single_value)
+
+    graph1 = GraphBuilder.from_yaml_data(yaml_data, base_dir=base_dir).build(
+        use_cache=True
+    )
+    graph2 = GraphBuilder.from_yaml_data(yaml_data, base_dir=base_dir).build(
+        use_cache=True
+    )
+    assert graph1 is graph2
+
+    yaml_data["nodes"][0]["config"]["param"]["scale"] = 5
+    graph3 = GraphBuilder.from_yaml_data(yaml_data, base_dir=base_dir).build(
+        use_cache=True
+    )
+    assert graph3 is not graph1
+    assert graph3.invoke({"x": 2})["value"] == 10
+    GRAPH_CACHE.clear()
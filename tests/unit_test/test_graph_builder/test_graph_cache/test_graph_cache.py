@@ -0,0 +1,161 @@
+import os
+import shutil
+
+import pytest
+import yaml
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.graph_cache import (
+    GRAPH_CACHE,
+    GraphCache,
+    collect_graph_dependencies,
+)
+from agentblock.reference_registry import REFERENCE_REGISTRY
+from agentblock.sample_data.tools import get_sample_data
+
+path_main_graph = get_sample_data("graph/graph_for_test/main_graph.yaml")
+path_function_dir = os.path.dirname(
+    get_sample_data("yaml/function/function_from_file/test_yaml/test_single_value.yaml")
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    GRAPH_CACHE.clear()
+    yield
+    GRAPH_CACHE.clear()
+
+
+@pytest.fixture
+def function_graph(tmp_path):
+    """
+    test_single_value.yaml + test_funcs를 임시 디렉토리로 복사
+    (파일 수정이 캐시 무효화로 이어지는지 확인하기 위함)
+    """
+    base = os.path.dirname(path_function_dir)
+    shutil.copytree(os.path.join(base, "test_yaml"), tmp_path / "test_yaml")
+    shutil.copytree(os.path.join(base, "test_funcs"), tmp_path / "test_funcs")
+    return tmp_path / "test_yaml" / "test_single_value.yaml"
+
+
+def test_collect_dependencies_recursive():
+    deps = collect_graph_dependencies(path_main_graph)
+    names = {os.path.basename(p) for p in deps}
+
+    assert deps[0] == os.path.abspath(path_main_graph)
+    assert {
+        "main_graph.yaml",
+        "law_graph.yaml",
+        "llm_legal.yaml",
+        "summarizer.yaml",
+        "merge.py",
+    } == names
+
+
+def test_build_cached_returns_same_graph(function_graph):
+    graph1 = GraphBuilder.build_cached(str(function_graph))
+    graph2 = GraphBuilder.build_cached(str(function_graph))
+
+    assert graph1 is graph2
+    assert len(GRAPH_CACHE) == 1
+    assert graph1.invoke({"x": 10})["value"] == 20
+
+
+def test_instance_build_with_cache_restores_state(function_graph):
+    builder1 = GraphBuilder(str(function_graph))
+    graph1 = builder1.build(use_cache=True)
+
+    builder2 = GraphBuilder(str(function_graph))
+    graph2 = builder2.build(use_cache=True)
+
+    assert graph1 is graph2
+    assert builder2.used_keys == builder1.used_keys == {"x", "value"}
+
+
+def test_function_file_change_invalidates_cache(function_graph, tmp_path):
+    graph1 = GraphBuilder.build_cached(str(function_graph))
+
+    func_file = tmp_path / "test_funcs" / "single_value.py"
+    func_file.write_text(
+        "def single_value_func(x: int, scale: int = 1):\n    return x * scale + 1\n",
+        encoding="utf-8",
+    )
+
+    graph2 = GraphBuilder.build_cached(str(function_graph))
+    assert graph2 is not graph1
+    assert graph2.invoke({"x": 10})["value"] == 21
+
+
+def test_yaml_change_invalidates_cache(function_graph):
+    graph1 = GraphBuilder.build_cached(str(function_graph))
+
+    content = function_graph.read_text(encoding="utf-8")
+    function_graph.write_text(content.replace("scale: 2", "scale: 3"), encoding="utf-8")
+
+    graph2 = GraphBuilder.build_cached(str(function_graph))
+    assert graph2 is not graph1
+    assert graph2.invoke({"x": 10})["value"] == 30
+
+
+def write_shared_reference_graph(path, dimension):
+    data = {
+        "references": [
+            {
+                "name": "emb",
+                "type": "embedding",
+                "config": {"provider": "dummy", "param": {"dimension": dimension}},
+            }
+        ],
+        "nodes": [
+            {
+                "name": "embedder",
+                "type": "embedding_node",
+                "input_keys": ["documents"],
+                "output_key": "embedded",
+                "config": {
+                    "param": {"method": "embed_documents"},
+                    "reference": {"embedding": "emb"},
+                },
+            }
+        ],
+        "edges": [
+            {"from": "START", "to": "embedder"},
+            {"from": "embedder", "to": "END"},
+        ],
+    }
+    path.write_text(yaml.safe_dump(data))
+    return str(path)
+
+
+def test_cached_graph_releases_shared_references(tmp_path, monkeypatch):
+    REFERENCE_REGISTRY.clear()
+    monkeypatch.setattr(GRAPH_CACHE, "maxsize", 1)
+    path_a = write_shared_reference_graph(tmp_path / "a.yaml", 3)
+    path_b = write_shared_reference_graph(tmp_path / "b.yaml", 4)
+
+    GraphBuilder.build_cached(path_a, share_references=True)
+    GraphBuilder.build_cached(path_a, share_references=True)
+    assert len(REFERENCE_REGISTRY) == 1
+    (fp_a,) = REFERENCE_REGISTRY._entries
+    assert REFERENCE_REGISTRY.refcount(fp_a) == 1
+
+    # LRU에서 밀려난 그래프의 reference는 반납된다
+    GraphBuilder.build_cached(path_b, share_references=True)
+    assert fp_a not in REFERENCE_REGISTRY
+    assert len(REFERENCE_REGISTRY) == 1
+
+    GRAPH_CACHE.clear()
+    assert len(REFERENCE_REGISTRY) == 0
+
+
+def test_dependency_memo_is_bounded(tmp_path):
+    cache = GraphCache(maxsize=2)
+    for i in range(5):
+        cache.fingerprint_data({"nodes": [], "edges": [], "id": i}, str(tmp_path))
+
+    # 생성된 dict config가 계속 바뀌어도 의존 목록 memo는 maxsize를 넘지 않는다 (LRU)
+    assert len(cache._dependencies) == 2
+    latest = cache.fingerprint_data({"nodes": [], "edges": [], "id": 4}, str(tmp_path))
+    assert latest == cache.fingerprint_data(
+        {"nodes": [], "edges": [], "id": 4}, str(tmp_path)
+    )
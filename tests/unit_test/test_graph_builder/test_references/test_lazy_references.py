@@ -0,0 +1,221 @@
+import threading
+
+import pytest
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.lazy_reference import LazyEmbeddings, LazyVectorStore
+from agentblock.vector_store.vector_store_reference import VectorStoreReference
+
+
+def make_graph_data(tmp_path, lazy=None):
+    vector_store_ref = {
+        "name": "my_faiss",
+        "type": "vector_store",
+        "config": {
+            "provider": "faiss",
+            "param": {"path": str(tmp_path / "test.faiss")},
+            "reference": {"embedding": "dummy_emb"},
+        },
+    }
+    if lazy is not None:
+        vector_store_ref["lazy"] = lazy
+
+    return {
+        "references": [
+            {
+                "name": "dummy_emb",
+                "type": "embedding",
+                "config": {"provider": "dummy", "param": {"dimension": 5}},
+            },
+            vector_store_ref,
+        ],
+        "nodes": [
+            {
+                "name": "saver",
+                "type": "data_saver",
+                "input_keys": ["documents"],
+                "output_key": "result",
+                "config": {"reference": {"vector_store": "my_faiss"}},
+            }
+        ],
+        "edges": [
+            {"from": "START", "to": "saver"},
+            {"from": "saver", "to": "END"},
+        ],
+    }
+
+
+def count_vector_store_builds(monkeypatch):
+    calls = []
+    original_build = VectorStoreReference.build
+
+    def counting_build(self):
+        calls.append(self.name)
+        return original_build(self)
+
+    monkeypatch.setattr(VectorStoreReference, "build", counting_build)
+    return calls
+
+
+def test_lazy_reference_is_not_built_until_used(tmp_path, monkeypatch):
+    calls = count_vector_store_builds(monkeypatch)
+
+    builder = GraphBuilder.from_yaml_data(make_graph_data(tmp_path, lazy=True))
+    graph = builder.build()
+
+    proxy = builder.references_map["my_faiss"]
+    assert isinstance(proxy, LazyVectorStore)
+    assert isinstance(proxy, VectorStore)
+    assert not proxy.is_materialized
+    assert calls == []
+
+    result = graph.invoke({"documents": [Document(page_content="doc1")]})
+
+    assert result["result"]["status"] == "saved"
+    assert result["result"]["path_save"] == str(tmp_path / "test.faiss")
+    assert proxy.is_materialized
+    assert calls == ["my_faiss"]
+    assert proxy.similarity_search("doc1", k=1)[0].page_content == "doc1"
+    assert calls == ["my_faiss"]
+
+
+def test_lazy_reference_materializes_exactly_once_across_threads(tmp_path, monkeypatch):
+    calls = count_vector_store_builds(monkeypatch)
+
+    builder = GraphBuilder.from_yaml_data(make_graph_data(tmp_path, lazy=True))
+    builder.load_references_topo()
+    proxy = builder.references_map["my_faiss"]
+
+    barrier = threading.Barrier(8)
+
+    def search():
+        barrier.wait()
+        proxy.similarity_search("anything", k=1)
+
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["my_faiss"]
+
+
+def test_default_policy_switch_and_per_reference_override(tmp_path):
+    builder = GraphBuilder(
+        yaml_data=make_graph_data(tmp_path, lazy=False),
+        base_dir=".",
+        lazy_references=True,
+    )
+    builder.load_references_topo()
+
+    embedding = builder.references_map["dummy_emb"]
+    assert isinstance(embedding, LazyEmbeddings)
+    assert isinstance(embedding, Embeddings)
+    # vector store는 lazy: false로 즉시 빌드되며, 그 과정에서 embedding이 사용됨
+    assert not isinstance(builder.references_map["my_faiss"], LazyVectorStore)
+    assert embedding.is_materialized
+    assert embedding.embed_query("hello") == [0.1] * 5
+
+
+def test_retriever_graph_compiles_without_materializing(tmp_path):
+    data = make_graph_data(tmp_path, lazy=True)
+    data["nodes"] = [
+        {
+            "name": "retriever",
+            "type": "retriever",
+            "input_keys": ["query"],
+            "output_key": "retrieved_docs",
+            "config": {"reference": {"vector_store": "my_faiss"}},
+        }
+    ]
+    data["edges"] = [
+        {"from": "START", "to": "retriever"},
+        {"from": "retriever", "to": "END"},
+    ]
+
+    builder = GraphBuilder.from_yaml_data(data)
+    graph = builder.build()
+
+    proxy = builder.references_map["my_faiss"]
+    assert not proxy.is_materialized
+
+    result = graph.invoke({"query": "hello"})
+    assert result["retrieved_docs"] == []
+    assert proxy.is_materialized
+
+
+@pytest.mark.parametrize("method", ["embed_documents", "embed_query"])
+def test_embedding_node_over_lazy_embedding(tmp_path, method):
+    data = make_graph_data(tmp_path, lazy=True)
+    data["references"][0]["lazy"] = True
+    data["nodes"] = [
+        {
+            "name": "embedder",
+            "type": "embedding_node",
+            "input_keys": ["documents"],
+            "output_key": "embedded",
+            "config": {
+                "param": {"method": method},
+                "reference": {"embedding": "dummy_emb"},
+            },
+        }
+    ]
+    data["edges"] = [
+        {"from": "START", "to": "embedder"},
+        {"from": "embedder", "to": "END"},
+    ]
+
+    builder = GraphBuilder.from_yaml_data(data)
+    graph = builder.build()
+
+    # 노드 build()는 프록시의 시그니처만 보고 호출 방식을 정한다
+    proxy = builder.references_map["dummy_emb"]
+    assert isinstance(proxy, LazyEmbeddings)
+    assert not proxy.is_materialized
+
+    docs = [Document(page_content="a"), Document(page_content="b")]
+    _, vectors = graph.invoke({"documents": docs})["embedded"]
+    assert vectors == [[0.1] * 5, [0.1] * 5]
+    assert proxy.is_materialized
+
+
+def test_lazy_vector_store_from_texts_is_rejected():
+    with pytest.raises(TypeError, match="cannot be created with from_texts"):
+        LazyVectorStore.from_texts(["doc"], embedding=None)
+
+
+@pytest.mark.parametrize(
+    "embedding_options",
+    [
+        {"config": {"cache": {"backend": "memory"}}},
+        {"lazy": True},
+        {"lazy": True, "config": {"cache": {"backend": "memory"}}},
+    ],
+    ids=["cache", "lazy", "lazy_cache"],
+)
+def test_store_saved_with_plain_embedding_reloads_with_wrappers(
+    tmp_path, embedding_options
+):
+    graph = GraphBuilder.from_yaml_data(make_graph_data(tmp_path)).build()
+    graph.invoke({"documents": [Document(page_content="doc1")]})
+
+    # 저장 후 임베딩에 cache / lazy를 추가해도 모델 identity는 provider + param 그대로다
+    data = make_graph_data(tmp_path)
+    embedding_ref = data["references"][0]
+    embedding_ref.update({k: v for k, v in embedding_options.items() if k != "config"})
+    embedding_ref["config"].update(embedding_options.get("config", {}))
+
+    builder = GraphBuilder.from_yaml_data(data)
+    builder.load_references_topo()
+
+    embedding = builder.references_map["dummy_emb"]
+    if embedding_options.get("lazy"):
+        # 저장된 인덱스를 로드할 때 identity / 차원 확인만으로 임베딩 모델을 만들지 않는다
+        assert isinstance(embedding, LazyEmbeddings)
+        assert not embedding.is_materialized
+    results = builder.references_map["my_faiss"].similarity_search("doc1", k=1)
+    assert results[0].page_content == "doc1"
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.graph_builder import GraphBuilder, ReferenceBuildError
+
+
+def make_references(*names, vector_store_on=None):
+    refs = [
+        {
+            "name": name,
+            "type": "embedding",
+            "config": {"provider": "dummy", "param": {"dimension": 3}},
+        }
+        for name in names
+    ]
+    if vector_store_on:
+        refs.append(
+            {
+                "name": "my_faiss",
+                "type": "vector_store",
+                "config": {
+                    "provider": "faiss",
+                    "param": {},
+                    "reference": {"embedding": vector_store_on},
+                },
+            }
+        )
+    return {"references": refs}
+
+
+def test_same_level_references_are_built_concurrently(monkeypatch):
+    """
+    같은 레벨의 두 embedding이 동시에 build되지 않으면 Barrier가 timeout으로 실패한다.
+    """
+    barrier = threading.Barrier(2, timeout=5)
+    original_build = EmbeddingReference.build
+
+    def build_with_barrier(self):
+        barrier.wait()
+        return original_build(self)
+
+    monkeypatch.setattr(EmbeddingReference, "build", build_with_barrier)
+
+    builder = GraphBuilder.from_yaml_data(
+        make_references("emb_a", "emb_b"), base_dir="."
+    )
+    builder.load_references_topo()
+
+    assert set(builder.references_map) == {"emb_a", "emb_b"}
+
+
+def test_dependent_reference_is_built_after_its_level():
+    builder = GraphBuilder.from_yaml_data(
+        make_references("emb_a", "emb_b", vector_store_on="emb_a"), base_dir="."
+    )
+    builder.load_references_topo()
+
+    vector_store = builder.references_map["my_faiss"]
+    assert vector_store.embedding_function is builder.references_map["emb_a"]
+
+
+def test_failures_are_reported_per_reference():
+    data = make_references("ok_emb")
+    for name in ("bad_a", "bad_b"):
+        data["references"].append(
+            {"name": name, "type": "embedding", "config": {"provider": "unknown"}}
+        )
+
+    builder = GraphBuilder.from_yaml_data(data, base_dir=".")
+    with pytest.raises(ReferenceBuildError) as exc_info:
+        builder.load_references_topo()
+
+    errors = exc_info.value.errors
+    assert set(errors) == {"bad_a", "bad_b"}
+    assert all(isinstance(e, ValueError) for e in errors.values())
+    assert "Unsupported embedding provider" in str(exc_info.value)
+
+
+def test_serial_mode_with_single_worker():
+    builder = GraphBuilder(
+        yaml_data=make_references("emb_a", "emb_b", vector_store_on="emb_b"),
+        base_dir=".",
+        max_reference_workers=1,
+    )
+    builder.load_references_topo()
+
+    assert set(builder.references_map) == {"emb_a", "emb_b", "my_faiss"}
+
+
+def test_cyclic_references_are_rejected():
+    data = {
+        "references": [
+            {
+                "name": "a",
+                "type": "vector_store",
+                "config": {"provider": "faiss", "reference": {"embedding": "b"}},
+            },
+            {
+                "name": "b",
+                "type": "vector_store",
+                "config": {"provider": "faiss", "reference": {"embedding": "a"}},
+            },
+        ]
+    }
+    builder = GraphBuilder.from_yaml_data(data, base_dir=".")
+    with pytest.raises(ValueError, match="cyclic dependency"):
+        builder.load_references_topo()
@@ -0,0 +1,172 @@
+import yaml
+import pytest
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.reference_registry import (
+    REFERENCE_REGISTRY,
+    ReferenceRegistry,
+    reference_fingerprint,
+)
+from agentblock.vector_store.vector_store_reference import VectorStoreReference
+
+EMBEDDING_REF = {
+    "name": "emb",
+    "type": "embedding",
+    "config": {"provider": "dummy", "param": {"dimension": 5}},
+}
+
+
+def make_graph(faiss_path, embedding_name="emb"):
+    embedding = dict(EMBEDDING_REF, name=embedding_name)
+    return {
+        "references": [
+            embedding,
+            {
+                "name": "store",
+                "type": "vector_store",
+                "config": {
+                    "provider": "faiss",
+                    "param": {"path": faiss_path},
+                    "reference": {"embedding": embedding_name},
+                },
+            },
+        ],
+        "nodes": [
+            {
+                "name": "saver",
+                "type": "data_saver",
+                "input_keys": ["documents"],
+                "output_key": "result",
+                "config": {"reference": {"vector_store": "store"}},
+            }
+        ],
+        "edges": [
+            {"from": "START", "to": "saver"},
+            {"from": "saver", "to": "END"},
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    REFERENCE_REGISTRY.clear()
+    yield
+    REFERENCE_REGISTRY.clear()
+
+
+def test_fingerprint_ignores_name_but_tracks_config_and_dependencies():
+    fp = reference_fingerprint(EMBEDDING_REF)
+    assert fp == reference_fingerprint(dict(EMBEDDING_REF, name="other"))
+    assert fp != reference_fingerprint(
+        dict(EMBEDDING_REF, config={"provider": "dummy", "param": {"dimension": 6}})
+    )
+
+    store = make_graph("a.faiss")["references"][1]
+    fp_store_1 = reference_fingerprint(store, {"emb": "fingerprint-1"})
+    fp_store_2 = reference_fingerprint(store, {"emb": "fingerprint-2"})
+    assert fp_store_1 != fp_store_2
+
+
+def test_registry_refcount_and_release():
+    registry = ReferenceRegistry()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return object()
+
+    obj1 = registry.acquire("fp", factory)
+    obj2 = registry.acquire("fp", factory)
+    assert obj1 is obj2
+    assert calls == [1]
+    assert registry.refcount("fp") == 2
+
+    assert registry.release("fp") is False
+    assert registry.release("fp") is True
+    assert "fp" not in registry
+
+    assert registry.acquire("fp", factory) is not obj1
+    assert len(calls) == 2
+
+    with pytest.raises(KeyError):
+        registry.release("unknown")
+
+
+def test_sub_graphs_share_identical_references(tmp_path, monkeypatch):
+    calls = []
+    original_build = VectorStoreReference.build
+
+    def counting_build(self):
+        calls.append(self.name)
+        return original_build(self)
+
+    monkeypatch.setattr(VectorStoreReference, "build", counting_build)
+
+    faiss_path = str(tmp_path / "shared.faiss")
+    # 하위 그래프는 embedding 이름이 다르지만 설정은 동일
+    with open(tmp_path / "sub.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump(make_graph(faiss_path, embedding_name="sub_emb"), f)
+
+    root = make_graph(faiss_path)
+    root["nodes"].append(
+        {"name": "sub", "type": "from_yaml", "config": {"from_file": "sub.yaml"}}
+    )
+    root["edges"] = [
+        {"from": "START", "to": "saver"},
+        {"from": "saver", "to": "sub"},
+        {"from": "sub", "to": "END"},
+    ]
+
+    builder = GraphBuilder(
+        yaml_data=root, base_dir=str(tmp_path), share_references=True
+    )
+    builder.build()
+
+    assert calls == ["store"]
+    fp_store = builder.reference_fingerprints["store"]
+    assert REFERENCE_REGISTRY.refcount(fp_store) == 2
+
+    other = GraphBuilder(yaml_data=make_graph(faiss_path), share_references=True)
+    other.build()
+    assert other.references_map["store"] is builder.references_map["store"]
+    assert REFERENCE_REGISTRY.refcount(fp_store) == 3
+    assert calls == ["store"]
+
+    builder.release_references()
+    assert REFERENCE_REGISTRY.refcount(fp_store) == 1
+    other.release_references()
+    assert len(REFERENCE_REGISTRY) == 0
+
+
+def test_references_are_not_shared_by_default(tmp_path):
+    faiss_path = str(tmp_path / "store.faiss")
+    builder1 = GraphBuilder.from_yaml_data(make_graph(faiss_path))
+    builder2 = GraphBuilder.from_yaml_data(make_graph(faiss_path))
+    builder1.build()
+    builder2.build()
+
+    assert builder1.references_map["store"] is not builder2.references_map["store"]
+    assert len(REFERENCE_REGISTRY) == 0
+
+
+def test_relative_cache_paths_in_different_directories_are_not_shared(tmp_path):
+    builders = []
+    for directory in ("a", "b"):
+        data = make_graph(str(tmp_path / directory / "store.faiss"))
+        data["references"][0]["config"]["cache"] = {"path": "emb.sqlite"}
+        (tmp_path / directory).mkdir()
+        path_yaml = tmp_path / directory / "graph.yaml"
+        path_yaml.write_text(yaml.safe_dump(data))
+        builder = GraphBuilder(str(path_yaml), share_references=True)
+        builder.build()
+        builders.append(builder)
+
+    # 같은 상대경로라도 YAML 위치 기준으로 다른 파일이므로 공유하지 않는다
+    emb_a, emb_b = (builder.references_map["emb"] for builder in builders)
+    assert emb_a is not emb_b
+    assert emb_a.path == str(tmp_path / "a" / "emb.sqlite")
+    assert emb_b.path == str(tmp_path / "b" / "emb.sqlite")
+    assert len(REFERENCE_REGISTRY) == 4
+
+    for builder in builders:
+        builder.release_references()
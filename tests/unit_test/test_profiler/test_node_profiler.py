@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+import sys
+import types
+
+import pytest
+
+from agentblock.graph_builder import GraphBuilder
+from agentblock.profiler import NodeProfiler, payload_size
+from agentblock.sample_data.tools import get_sample_data
+
+path_single_value = get_sample_data(
+    "yaml/function/function_from_file/test_yaml/test_single_value.yaml"
+)
+base_dir = os.path.dirname(path_single_value)
+
+nested_graph = {
+    "nodes": [
+        {
+            "name": "sub",
+            "type": "from_yaml",
+            "config": {"from_file": "test_single_value.yaml"},
+        }
+    ],
+    "edges": [{"from": "START", "to": "sub"}, {"from": "sub", "to": "END"}],
+}
+
+
+@pytest.fixture
+def failing_module(monkeypatch):
+    module = types.ModuleType("profiler_module")
+
+    def check(x):
+        if x < 0:
+            raise ValueError("negative")
+        return "ok"
+
+    module.check = check
+    monkeypatch.setitem(sys.modules, "profiler_module", module)
+    return module
+
+
+def _check_graph():
+    return {
+        "nodes": [
+            {
+                "name": "check",
+                "type": "function_from_library",
+                "input_keys": ["x"],
+                "output_key": "value",
+                "config": {"from_library": "profiler_module:check"},
+            }
+        ],
+        "edges": [{"from": "START", "to": "check"}, {"from": "check", "to": "END"}],
+    }
+
+
+def test_records_calls_latency_and_payload():
+    profiler = NodeProfiler()
+    graph = GraphBuilder(path_single_value, profiler=profiler).build()
+
+    for x in range(3):
+        graph.invoke({"x": x})
+
+    stats = profiler.snapshot()["single_val_node"]
+    assert stats["calls"] == 3
+    assert stats["errors"] == 0
+    assert stats["latency_histogram"][-1] == {"le": "+Inf", "count": 3}
+    assert stats["min_seconds"] <= stats["mean_seconds"] <= stats["max_seconds"]
+    # 입력은 x(int)만, 출력은 {"value": int}
+    assert stats["input_bytes"] == 3 * payload_size(0)
+    assert stats["output_bytes"] > 0
+
+
+def test_nested_sub_graph_nodes_are_prefixed():
+    profiler = NodeProfiler()
+    graph = GraphBuilder.from_yaml_data(
+        nested_graph, base_dir=base_dir, profiler=profiler
+    ).build()
+
+    assert graph.invoke({"x": 2})["value"] == 4
+    snapshot = profiler.snapshot()
+    assert set(snapshot) == {"sub", "sub/single_val_node"}
+    assert snapshot["sub"]["calls"] == snapshot["sub/single_val_node"]["calls"] == 1
+
+
+def test_nested_sub_graph_async():
+    profiler = NodeProfiler()
+    graph = GraphBuilder.from_yaml_data(
+        nested_graph, base_dir=base_dir, profiler=profiler
+    ).build(async_mode=True)
+
+    assert asyncio.run(graph.ainvoke({"x": 2}))["value"] == 4
+    assert profiler.snapshot()["sub/single_val_node"]["calls"] == 1
+
+
+def test_errors_are_counted_and_reraised(failing_module):
+    profiler = NodeProfiler()
+    graph = GraphBuilder.from_yaml_data(_check_graph(), profiler=profiler).build()
+
+    graph.invoke({"x": 1})
+    with pytest.raises(ValueError):
+        graph.invoke({"x": -1})
+
+    stats = profiler.snapshot()["check"]
+    assert (stats["calls"], stats["errors"]) == (2, 1)
+
+
+def test_prometheus_and_json_dumps(tmp_path, failing_module):
+    profiler = NodeProfiler(buckets=[0.1, 1.0])
+    graph = GraphBuilder.from_yaml_data(_check_graph(), profiler=profiler).build()
+    graph.invoke({"x": 1})
+
+    prom_path = tmp_path / "metrics.prom"
+    profiler.dump_prometheus(str(prom_path))
+    text = prom_path.read_text(encoding="utf-8")
+    assert "# TYPE agentblock_node_latency_seconds histogram" in text
+    assert 'agentblock_node_calls_total{node="check"} 1' in text
+    assert 'agentblock_node_latency_seconds_bucket{node="check",le="+Inf"} 1' in text
+    assert 'agentblock_node_latency_seconds_count{node="check"} 1' in text
+
+    json_path = tmp_path / "metrics.json"
+    profiler.dump_json(str(json_path))
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    assert data["check"]["calls"] == 1
+    assert [b["le"] for b in data["check"]["latency_histogram"]] == [0.1, 1.0, "+Inf"]
+
+
+def test_reset():
+    profiler = NodeProfiler()
+    profiler.record("n", 0.01)
+    profiler.child("sub").record("m", 0.01)
+    assert set(profiler.snapshot()) == {"n", "sub/m"}
+
+    profiler.reset()
+    assert profiler.snapshot() == {}
@@ -6,7 +6,11 @@ from agentblock.sample_data.tools import get_sample_data
 base_path_valid = "yaml/schema/valid_case"
 base_path_invalid = "yaml/schema/invalid_case"
 
-list_filename_valid = ["good_schema.yaml", "references_only.yaml"]
+list_filename_valid = [
+    "good_schema.yaml",
+    "references_only.yaml",
+    "fan_out_fan_in.yaml",
+]
 
 
 def get_path_invalid(filename):
@@ -1,9 +1,13 @@
+import sys
+
+import numpy as np
 import pytest
 from langchain.docstore.document import Document
 from langchain_core.vectorstores import VectorStore
 from src.agentblock.vector_store.data_saver_node import DataSaverNode
 from agentblock.vector_store.vector_store_reference import VectorStoreReference
 from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.lazy_reference import LazyVectorStore
 
 from agentblock.tools.load_config import load_config
 from agentblock.sample_data.tools import get_sample_data
@@ -140,3 +144,107 @@ def test_data_saver_node_with_missing_documents_key(setup_data_saver_node):
 
     with pytest.raises(ValueError, match="No documents to save."):
         node.call_target_function(inputs)
+
+
+@pytest.mark.parametrize("output_format", ["list", "numpy"])
+def test_data_saver_node_with_precomputed_embeddings(output_format):
+    """
+    EmbeddingNode 출력 (docs, vectors)을 받으면 임베딩을 다시 계산하지 않고 저장합니다.
+    """
+    references_map = create_references_map()
+    vector_store = references_map["my_faiss"]
+    config = create_data_saver_yaml_config()
+    node = DataSaverNode.from_yaml(config, base_dir=".", references_map=references_map)
+    vector_store.embedding_function = MagicMock(wraps=vector_store.embedding_function)
+
+    docs = [Document(page_content="doc1"), Document(page_content="doc2")]
+    vectors = [[1.0, 0.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0, 0.0]]
+    if output_format == "numpy":
+        vectors = np.asarray(vectors, dtype=np.float32)
+    start = vector_store.index.ntotal
+
+    result = node.call_target_function({"documents": (docs, vectors)})
+
+    assert result.value["num_docs"] == 2
+    assert vector_store.index.ntotal == start + 2
+    vector_store.embedding_function.embed_documents.assert_not_called()
+    np.testing.assert_array_equal(vector_store.index.reconstruct(start + 1), vectors[1])
+
+
+def test_data_saver_node_with_lazy_vector_store(monkeypatch):
+    """
+    lazy 프록시로 감싼 FAISS에도 float32 행렬이 add_embeddings(.tolist()) 대신
+    add_embedding_matrix로 복사 없이 저장됩니다.
+    """
+    references_map = create_references_map()
+    vector_store = references_map["my_faiss"]
+    references_map["my_faiss"] = LazyVectorStore("my_faiss", lambda: vector_store)
+    node = DataSaverNode.from_yaml(
+        create_data_saver_yaml_config(), base_dir=".", references_map=references_map
+    )
+    module = sys.modules[DataSaverNode.__module__]
+    spy = MagicMock(wraps=module.add_embedding_matrix)
+    monkeypatch.setattr(module, "add_embedding_matrix", spy)
+    monkeypatch.setattr(
+        type(vector_store), "add_embeddings", MagicMock(side_effect=AssertionError)
+    )
+
+    docs = [Document(page_content="doc1"), Document(page_content="doc2")]
+    vectors = np.eye(2, 5, dtype=np.float32)
+    start = vector_store.index.ntotal
+
+    result = node.call_target_function({"documents": (docs, vectors)})
+
+    assert result.value["num_docs"] == 2
+    spy.assert_called_once_with(vector_store, docs, vectors)
+    np.testing.assert_array_equal(vector_store.index.reconstruct(start + 1), vectors[1])
+
+
+def test_data_saver_node_consumes_stream_and_saves_once(setup_data_saver_node):
+    node, mock_vector_store = setup_data_saver_node
+    docs = [Document(page_content=f"doc{i}") for i in range(5)]
+
+    def stream():
+        yield docs[:2]
+        yield docs[2]
+        yield docs[3:]
+
+    result = node.call_target_function({"documents": stream()})
+
+    assert result.value["num_docs"] == 5
+    assert mock_vector_store.add_documents.call_count == 3
+    mock_vector_store.save.assert_called_once()
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_data_saver_node_with_embedded_stream(async_mode):
+    import asyncio
+
+    references_map = create_references_map()
+    vector_store = references_map["my_faiss"]
+    node = DataSaverNode.from_yaml(
+        create_data_saver_yaml_config(), base_dir=".", references_map=references_map
+    )
+    start = vector_store.index.ntotal
+
+    def stream():
+        for i in range(3):
+            vectors = np.full((2, 5), i, dtype=np.float32)
+            yield [Document(page_content=f"doc{i}-{j}") for j in range(2)], vectors
+
+    if async_mode:
+        result = asyncio.run(node.acall_target_function({"documents": stream()}))
+    else:
+        result = node.call_target_function({"documents": stream()})
+
+    assert result.value["num_docs"] == 6
+    assert vector_store.index.ntotal == start + 6
+    np.testing.assert_array_equal(vector_store.index.reconstruct(start + 5), [2.0] * 5)
+
+
+def test_data_saver_node_empty_stream(setup_data_saver_node):
+    node, mock_vector_store = setup_data_saver_node
+
+    with pytest.raises(ValueError, match="No documents to save."):
+        node.call_target_function({"documents": iter([])})
+    mock_vector_store.save.assert_not_called()
@@ -29,3 +29,36 @@ def test_graph_builder_integration(tmp_path):
     saver_result = result_state["result"]
     assert saver_result["status"] == "saved", "저장 상태가 'saved'여야 합니다."
     assert saver_result["num_docs"] == 1, "저장된 문서 수가 1이어야 합니다."
+
+
+def test_embedding_numpy_to_data_saver_graph():
+    """
+    embedding_node(output_format: numpy) -> data_saver 파이프라인:
+    float32 행렬이 그대로 FAISS에 저장되는지 확인합니다.
+    """
+    path_yaml = get_sample_data("yaml/vector_store/node/embedding_numpy_to_faiss.yaml")
+    builder = GraphBuilder(path_yaml)
+    graph = builder.build()
+
+    docs = [Document(page_content=f"doc{i}") for i in range(3)]
+    result_state = graph.invoke({"documents": docs})
+
+    _, matrix = result_state["embedded"]
+    assert matrix.shape == (3, 5)
+    assert result_state["result"]["status"] == "saved"
+    assert result_state["result"]["num_docs"] == 3
+
+
+def test_embedding_stream_to_data_saver_graph():
+    """
+    embedding_node(stream_batch_size) -> data_saver 파이프라인:
+    문서 generator가 배치 단위로 임베딩 / 저장되는지 확인합니다.
+    """
+    path_yaml = get_sample_data("yaml/vector_store/node/embedding_stream_to_faiss.yaml")
+    graph = GraphBuilder(path_yaml).build()
+
+    docs = (Document(page_content=f"doc{i}") for i in range(10))
+    result_state = graph.invoke({"documents": docs})
+
+    assert result_state["result"]["num_docs"] == 10
+    assert result_state["embedding_stats"]["num_texts"] == 10
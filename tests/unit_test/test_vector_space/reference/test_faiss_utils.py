@@ -1,10 +1,20 @@
 import os
 import pytest
 import tempfile
+import faiss
+import numpy as np
+from langchain_core.documents import Document
 from langchain_core.embeddings.embeddings import Embeddings
 from agentblock.embedding.dummy_embedding import DummyEmbedding
 
-from agentblock.vector_store.faiss_utils import create_faiss_vector_store
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.vector_store.faiss_utils import (
+    add_embedding_matrix,
+    create_faiss_vector_store,
+    index_factory_string,
+    read_meta,
+)
+from agentblock.vector_store.index_report import compare_index_configs, format_report
 from langchain_community.vectorstores import FAISS
 
 from dotenv import load_dotenv
@@ -107,3 +117,289 @@ def test_faiss_save_and_load(embedding_model):
         assert (
             set1 == set2
         ), "Loaded store should return the same documents as original store"
+
+
+def test_add_embedding_matrix(embedding_model):
+    """
+    5) 미리 계산된 float32 행렬을 임베딩 재계산 없이 추가하는지 확인
+    """
+    vector_store = create_faiss_vector_store(embedding_model=embedding_model, path=None)
+    docs = [Document(page_content=f"doc{i}", metadata={"i": i}) for i in range(3)]
+    matrix = np.eye(3, dtype=np.float32)
+
+    ids = add_embedding_matrix(vector_store, docs, matrix)
+
+    assert vector_store.index.ntotal == 3
+    np.testing.assert_array_equal(vector_store.index.reconstruct(1), matrix[1])
+    results = vector_store.similarity_search_by_vector([0.0, 0.0, 1.0], k=1)
+    assert results[0].page_content == "doc2"
+    assert results[0].metadata == {"i": 2}
+    assert vector_store.docstore.search(ids[0]).page_content == "doc0"
+
+
+def test_add_embedding_matrix_shape_mismatch(embedding_model):
+    vector_store = create_faiss_vector_store(embedding_model=embedding_model, path=None)
+    docs = [Document(page_content="a"), Document(page_content="b")]
+
+    with pytest.raises(ValueError, match="does not match number of documents"):
+        add_embedding_matrix(vector_store, docs, np.zeros((3, 3), dtype=np.float32))
+    with pytest.raises(ValueError, match="does not match index dimension"):
+        add_embedding_matrix(vector_store, docs, np.zeros((2, 4), dtype=np.float32))
+
+
+@pytest.mark.parametrize(
+    "index_cfg, factory",
+    [
+        (None, "Flat"),
+        ({"type": "sq_fp16"}, "SQfp16"),
+        ({"type": "sq8"}, "SQ8"),
+        ({"type": "pq", "m": 4, "nbits": 4}, "PQ4x4"),
+        ({"type": "ivf_pq", "nlist": 8, "m": 4, "nbits": 4}, "IVF8,PQ4x4"),
+        ({"type": "ivf_flat", "nlist": 8}, "IVF8,Flat"),
+        ({"type": "hnsw", "hnsw_m": 16}, "HNSW16"),
+        ({"type": "sq8", "factory": " IVF8,SQ8 "}, "IVF8,SQ8"),
+    ],
+)
+def test_index_factory_string(index_cfg, factory):
+    assert index_factory_string(16, index_cfg) == factory
+
+
+def test_index_factory_string_invalid():
+    with pytest.raises(ValueError, match="Unsupported FAISS index type"):
+        index_factory_string(16, {"type": "lsh"})
+    with pytest.raises(ValueError, match="must divide"):
+        index_factory_string(16, {"type": "pq", "m": 5})
+    with pytest.raises(ValueError, match="non-empty string"):
+        index_factory_string(16, {"factory": ""})
+    with pytest.raises(ValueError, match="Invalid FAISS index factory"):
+        create_faiss_vector_store(
+            DummyEmbedding(dimension=16), index={"factory": "NotAnIndex"}
+        )
+
+
+def test_search_params_applied():
+    embedding = HashingEmbedding(dimension=16, n_features=1024)
+    hnsw_store = create_faiss_vector_store(
+        embedding,
+        index={"type": "hnsw", "hnsw_m": 8, "efSearch": 48, "efConstruction": 20},
+    )
+    hnsw = faiss.downcast_index(hnsw_store.index).hnsw
+    assert (hnsw.efSearch, hnsw.efConstruction) == (48, 20)
+
+    # IVF quantizer 안의 HNSW에도 적용된다
+    nested = create_faiss_vector_store(
+        embedding, index={"factory": "IVF8_HNSW4,Flat", "nprobe": 3, "efSearch": 24}
+    )
+    assert faiss.extract_index_ivf(nested.index).nprobe == 3
+
+    with pytest.raises(ValueError, match="does not support 'efSearch'"):
+        create_faiss_vector_store(
+            embedding, index={"type": "ivf_flat", "nlist": 8, "efSearch": 8}
+        )
+    with pytest.raises(ValueError, match="positive int"):
+        create_faiss_vector_store(embedding, index={"type": "hnsw", "efSearch": 0})
+
+
+def test_ivf_index_persisted_with_search_params(tmp_path):
+    """
+    IVF 인덱스: add로 학습 -> 저장 -> 로드 시 학습된 인덱스와 nprobe를 그대로 사용
+    """
+    embedding = HashingEmbedding(dimension=16, n_features=1024)
+    path = str(tmp_path / "ivf_store")
+    index_cfg = {"type": "ivf_flat", "nlist": 8, "nprobe": 8}
+    vector_store = create_faiss_vector_store(embedding, path=path, index=index_cfg)
+    texts = [f"w{i} w{i + 1} w{i * 3}" for i in range(400)]
+    vector_store.add_texts(texts)
+    vector_store.save()
+
+    # 설정 없이 로드해도 저장된 검색 파라미터가 적용된다
+    loaded = create_faiss_vector_store(embedding, path=path)
+    assert loaded.index.is_trained
+    assert faiss.extract_index_ivf(loaded.index).nprobe == 8
+    assert loaded.similarity_search(texts[5], k=1)[0].page_content == texts[5]
+
+    # 현재 설정의 검색 파라미터가 우선
+    tuned = create_faiss_vector_store(embedding, path=path, index={"nprobe": 2})
+    assert faiss.extract_index_ivf(tuned.index).nprobe == 2
+    assert tuned.meta["index"]["type"] == "ivf_flat"
+
+    with pytest.raises(ValueError, match="was built with index 'IVF8,Flat'"):
+        create_faiss_vector_store(embedding, path=path, index={"type": "hnsw"})
+
+
+@pytest.mark.parametrize(
+    "index_cfg",
+    [
+        {"type": "sq8"},
+        {"type": "pq", "m": 4, "nbits": 4, "train_size": 300},
+        {"type": "ivf_pq", "nlist": 4, "m": 4, "nbits": 4, "nprobe": 4},
+    ],
+)
+def test_compressed_index_trained_on_first_add(index_cfg):
+    """
+    6) 학습이 필요한 압축 인덱스는 첫 add 때 학습되고, 검색 결과가 정확한 검색과 대체로 일치하는지 확인
+    """
+    embedding = HashingEmbedding(dimension=16, n_features=1024)
+    vector_store = create_faiss_vector_store(embedding, path=None, index=index_cfg)
+    assert not vector_store.index.is_trained
+    assert vector_store.similarity_search("w1", k=1) == []
+
+    texts = [f"w{i} w{i + 1} w{i * 3}" for i in range(700)]
+    vector_store.add_texts(texts)
+
+    assert vector_store.index.is_trained
+    assert vector_store.index.ntotal == 700
+    hits = vector_store.similarity_search(texts[10], k=5)
+    assert texts[10] in [doc.page_content for doc in hits]
+
+
+@pytest.mark.parametrize("persistence", ["full", "segments"])
+def test_small_batches_are_buffered_until_enough_to_train(tmp_path, persistence):
+    """
+    학습이 필요한 인덱스는 작은 batch 하나로 학습하지 않고,
+    min_training_points(IVF4 -> 4 x 39 = 156)개가 모일 때까지 buffer에 둔다 (save / load 포함)
+    """
+    embedding = HashingEmbedding(dimension=16, n_features=1024)
+    path = str(tmp_path / "ivf_store")
+    index_cfg = {"type": "ivf_flat", "nlist": 4, "nprobe": 4}
+    texts = [f"w{i} w{i + 1} w{i * 3}" for i in range(200)]
+
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, index=index_cfg, persistence=persistence
+    )
+    ids = vector_store.add_texts(texts[:50])
+    vector_store.add_texts(texts[50:100])
+    assert not vector_store.index.is_trained
+    assert vector_store.num_buffered() == 100
+    with pytest.raises(ValueError, match="training needs at least 156"):
+        vector_store.similarity_search(texts[0], k=1)
+    vector_store.delete([ids[0]])
+    vector_store.save()
+
+    loaded = create_faiss_vector_store(
+        embedding, path=path, index=index_cfg, persistence=persistence
+    )
+    assert loaded.num_buffered() == 99
+    loaded.add_texts(texts[100:])
+    assert loaded.index.is_trained
+    assert loaded.index.ntotal == 199 and loaded.num_buffered() == 0
+    assert loaded.similarity_search(texts[7], k=1)[0].page_content == texts[7]
+    loaded.save()
+
+    reloaded = create_faiss_vector_store(embedding, path=path, read_only=True)
+    assert reloaded.index.ntotal == 199
+
+
+def test_compressed_index_save_and_load(tmp_path):
+    embedding = HashingEmbedding(dimension=16, n_features=1024)
+    path = str(tmp_path / "sq8_store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, index={"type": "sq8"}
+    )
+    vector_store.add_texts([f"w{i} w{i + 1}" for i in range(50)])
+    vector_store.save()
+
+    loaded = create_faiss_vector_store(embedding, path=path, index={"type": "sq8"})
+    assert loaded.index.ntotal == 50
+    assert isinstance(loaded.index, faiss.IndexScalarQuantizer)
+    assert loaded.similarity_search("w3 w4", k=1)[0].page_content == "w3 w4"
+
+
+def test_index_report():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 16)).astype(np.float32)
+    queries = rng.standard_normal((20, 16)).astype(np.float32)
+
+    rows = compare_index_configs(
+        vectors,
+        queries,
+        {
+            "flat": None,
+            "sq8": {"type": "sq8"},
+            "pq": {"type": "pq", "m": 4, "nbits": 4},
+        },
+        k=5,
+    )
+    by_name = {row["name"]: row for row in rows}
+
+    assert by_name["flat"]["recall_at_k"] == 1.0
+    assert by_name["sq8"]["recall_at_k"] > 0.8
+    assert by_name["sq8"]["memory_bytes"] < by_name["flat"]["memory_bytes"]
+    assert by_name["pq"]["compression"] > by_name["sq8"]["compression"] > 1.0
+    assert "recall@k" in format_report(rows)
+
+
+class ProbeCountingEmbedding(DummyEmbedding):
+    """embed_query / embed_documents 호출 수를 세는 임베딩 (dimension 속성 없음)"""
+
+    def __init__(self, dimension: int = 3, model: str = "probe-model"):
+        self._dimension = dimension
+        self.model = model
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [[0.1] * self._dimension for _ in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [0.1] * self._dimension
+
+
+def test_load_existing_store_without_embedding_calls(tmp_path):
+    """
+    7) 저장된 인덱스를 로드할 때는 임베딩 모델을 호출하지 않고 메타데이터로 차원을 확인
+    """
+    path = str(tmp_path / "store")
+    embedding = ProbeCountingEmbedding(dimension=4)
+    vector_store = create_faiss_vector_store(embedding, path=path)
+    vector_store.add_texts(["a", "b"])
+    vector_store.save()
+
+    meta = read_meta(path)
+    assert meta["dimension"] == 4
+    assert meta["model_id"] == "ProbeCountingEmbedding:probe-model"
+
+    fresh = ProbeCountingEmbedding(dimension=4)
+    loaded = create_faiss_vector_store(fresh, path=path)
+    assert fresh.calls == 0
+    assert loaded.index.ntotal == 2
+
+
+def test_new_store_dimension_without_probe():
+    embedding = ProbeCountingEmbedding(dimension=4)
+    vector_store = create_faiss_vector_store(embedding, path=None, dimension=4)
+    assert embedding.calls == 0
+    assert vector_store.index.d == 4
+
+    # dimension 속성이 있는 임베딩도 호출하지 않는다
+    hashing = HashingEmbedding(dimension=8)
+    assert create_faiss_vector_store(hashing, path=None).index.d == 8
+
+
+def test_load_mismatch_fails_fast(tmp_path):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(DummyEmbedding(dimension=4), path=path)
+    vector_store.add_texts(["a"])
+    vector_store.save()
+
+    with pytest.raises(ValueError, match="dimension 4, but the config dimension is 8"):
+        create_faiss_vector_store(DummyEmbedding(dimension=4), path=path, dimension=8)
+    with pytest.raises(ValueError, match="but the embedding dimension is 6"):
+        create_faiss_vector_store(DummyEmbedding(dimension=6), path=path)
+    with pytest.raises(ValueError, match="was built with embedding model"):
+        create_faiss_vector_store(ProbeCountingEmbedding(dimension=4), path=path)
+
+
+def test_load_legacy_store_without_meta(tmp_path):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(DummyEmbedding(dimension=4), path=path)
+    vector_store.add_texts(["a"])
+    vector_store.save_local(path)  # 메타데이터 없이 저장된 기존 형식
+    assert read_meta(path) is None
+
+    fresh = ProbeCountingEmbedding(dimension=4)
+    loaded = create_faiss_vector_store(fresh, path=path)
+    assert fresh.calls == 0
+    loaded.save()
+    assert read_meta(path)["dimension"] == 4
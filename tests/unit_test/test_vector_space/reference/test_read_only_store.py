@@ -0,0 +1,96 @@
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.vector_store.data_saver_node import DataSaverNode
+from agentblock.vector_store.faiss_utils import create_faiss_vector_store
+from agentblock.vector_store.mmap_docstore import MmapDocstore
+
+TEXTS = [f"w{i} w{i + 1}" for i in range(50)]
+
+
+@pytest.fixture
+def embedding():
+    return HashingEmbedding(dimension=8, n_features=256)
+
+
+def make_store(path, embedding, **kwargs):
+    vector_store = create_faiss_vector_store(embedding, path=path, **kwargs)
+    vector_store.add_texts(TEXTS, metadatas=[{"row": i} for i in range(len(TEXTS))])
+    vector_store.save()
+    return vector_store
+
+
+def test_mmap_store_search(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    make_store(path, embedding, index={"type": "sq8"})
+
+    replica = create_faiss_vector_store(embedding, path=path, mmap=True)
+
+    assert isinstance(replica.docstore, MmapDocstore)
+    # 인덱스 파일이 프로세스 주소 공간에 매핑되어 있다
+    with open("/proc/self/maps") as f:
+        assert os.path.join(path, "index.faiss") in f.read()
+    hit = replica.similarity_search("w7 w8", k=1)[0]
+    assert (hit.page_content, hit.metadata) == ("w7 w8", {"row": 7})
+    assert replica.docstore.search("missing") == "ID missing not found."
+
+
+def test_mmap_docstore_rebuilt_after_writer_save(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    writer = make_store(path, embedding)
+    create_faiss_vector_store(embedding, path=path, mmap=True)
+    header = os.path.join(path, "index.docs.json")
+    built = os.stat(header).st_mtime_ns
+
+    # 변경이 없으면 다시 만들지 않는다
+    create_faiss_vector_store(embedding, path=path, mmap=True)
+    assert os.stat(header).st_mtime_ns == built
+
+    writer.add_texts(["fresh text"])
+    writer.save()
+    replica = create_faiss_vector_store(embedding, path=path, mmap=True)
+    assert len(replica.docstore) == len(TEXTS) + 1
+    assert replica.similarity_search("fresh text", k=1)[0].page_content == "fresh text"
+
+
+@pytest.mark.parametrize("mode", [{"read_only": True}, {"mmap": True}])
+def test_read_only_refuses_writes(tmp_path, embedding, mode):
+    path = str(tmp_path / "store")
+    make_store(path, embedding)
+    replica = create_faiss_vector_store(embedding, path=path, **mode)
+
+    with pytest.raises(ValueError, match="is read-only"):
+        replica.add_texts(["new"])
+    with pytest.raises(ValueError, match="is read-only"):
+        replica.delete([replica.index_to_docstore_id[0]])
+    with pytest.raises(ValueError, match="is read-only"):
+        replica.save()
+
+    node = DataSaverNode("saver", replica, ["documents"], "result")
+    with pytest.raises(ValueError, match="is read-only"):
+        node.call_target_function({"documents": [Document(page_content="new")]})
+    assert replica.index.ntotal == len(TEXTS)
+
+
+def test_read_only_segments_require_compaction(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    writer = make_store(path, embedding, persistence="segments")
+    writer.add_texts(["more"])
+    writer.save()
+
+    with pytest.raises(ValueError, match="run compact"):
+        create_faiss_vector_store(embedding, path=path, mmap=True)
+
+    writer.compact()
+    replica = create_faiss_vector_store(embedding, path=path, mmap=True)
+    assert replica.index.ntotal == len(TEXTS) + 1
+
+
+def test_read_only_requires_existing_store(tmp_path, embedding):
+    with pytest.raises(ValueError, match="requires an existing vector store"):
+        create_faiss_vector_store(
+            embedding, path=str(tmp_path / "missing"), read_only=True
+        )
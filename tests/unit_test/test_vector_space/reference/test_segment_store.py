@@ -0,0 +1,169 @@
+import os
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.vector_store.data_saver_node import DataSaverNode
+from agentblock.vector_store.faiss_utils import create_faiss_vector_store
+from agentblock.vector_store.segment_store import parse_persistence, read_manifest
+
+
+@pytest.fixture
+def embedding():
+    return HashingEmbedding(dimension=8, n_features=256)
+
+
+def texts(start, stop):
+    return [f"w{i} w{i + 1}" for i in range(start, stop)]
+
+
+def segment_names(path):
+    return [segment["name"] for segment in read_manifest(path)["segments"]]
+
+
+def test_save_appends_segments(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, persistence="segments"
+    )
+    vector_store.add_texts(texts(0, 100))
+    vector_store.save()
+    base = read_manifest(path)["base"]
+    base_mtime = os.stat(os.path.join(path, f"{base}.faiss")).st_mtime_ns
+
+    for start in (100, 110):
+        vector_store.add_texts(texts(start, start + 10))
+        vector_store.save()
+    vector_store.save()  # 추가된 것이 없으면 segment를 만들지 않는다
+
+    manifest = read_manifest(path)
+    assert manifest["base"] == base
+    assert [segment["count"] for segment in manifest["segments"]] == [10, 10]
+    # base는 다시 쓰지 않고, segment 크기는 batch 크기에 비례한다
+    assert os.stat(os.path.join(path, f"{base}.faiss")).st_mtime_ns == base_mtime
+    segment = np.load(os.path.join(path, f"{manifest['segments'][0]['name']}.npy"))
+    assert segment.shape == (10, 8)
+
+    loaded = create_faiss_vector_store(embedding, path=path)
+    assert loaded.index.ntotal == 120
+    assert loaded.similarity_search("w115 w116", k=1)[0].page_content == "w115 w116"
+    np.testing.assert_array_equal(
+        loaded.index.reconstruct_n(0, 120), vector_store.index.reconstruct_n(0, 120)
+    )
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_auto_compaction(tmp_path, embedding, background):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding,
+        path=path,
+        persistence={"mode": "segments", "max_segments": 3, "background": background},
+    )
+    for start in range(0, 50, 10):
+        vector_store.add_texts(texts(start, start + 10))
+        vector_store.save()
+    vector_store.wait_for_compaction()
+
+    # base(1) + segment 3개에서 compaction -> 이후 segment 1개
+    assert len(segment_names(path)) == 1
+    files = os.listdir(path)
+    assert sum(name.endswith(".faiss") for name in files) == 1
+    assert sum(name.endswith(".npy") for name in files) == 1
+
+    loaded = create_faiss_vector_store(embedding, path=path, persistence="segments")
+    assert loaded.index.ntotal == 50
+    assert sorted(doc.page_content for doc in loaded.docstore._dict.values()) == sorted(
+        texts(0, 50)
+    )
+
+
+def test_background_compaction_keeps_new_segments(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, persistence="segments"
+    )
+    vector_store.add_texts(texts(0, 10))
+    vector_store.save()
+    vector_store.add_texts(texts(10, 20))
+    vector_store.compact(wait=False)
+    vector_store.add_texts(texts(20, 30))
+    vector_store.save()
+    vector_store.wait_for_compaction()
+
+    loaded = create_faiss_vector_store(embedding, path=path)
+    assert loaded.index.ntotal == 30
+    assert len(set(loaded.index_to_docstore_id.values())) == 30
+
+
+def test_delete_rewrites_base(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, persistence="segments"
+    )
+    ids = vector_store.add_texts(texts(0, 5))
+    vector_store.save()
+    vector_store.add_texts(texts(5, 8))
+    vector_store.save()
+
+    vector_store.delete([ids[0]])
+    vector_store.save()
+
+    assert segment_names(path) == []
+    loaded = create_faiss_vector_store(embedding, path=path)
+    assert loaded.index.ntotal == 7
+    assert ids[0] not in loaded.docstore._dict
+
+
+def test_switch_back_to_full_format(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, persistence="segments"
+    )
+    vector_store.add_texts(texts(0, 5))
+    vector_store.save()
+    vector_store.add_texts(texts(5, 8))
+    vector_store.save()
+
+    loaded = create_faiss_vector_store(embedding, path=path)
+    loaded.save()
+    assert read_manifest(path) is None
+    assert sorted(os.listdir(path)) == [
+        "agentblock_meta.json",
+        "index.faiss",
+        "index.pkl",
+    ]
+    assert create_faiss_vector_store(embedding, path=path).index.ntotal == 8
+
+
+def test_data_saver_appends_per_call(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, persistence="segments"
+    )
+    node = DataSaverNode("saver", vector_store, ["documents"], "result")
+    for start in range(0, 30, 10):
+        docs = [Document(page_content=text) for text in texts(start, start + 10)]
+        node.call_target_function({"documents": docs})
+
+    assert len(segment_names(path)) == 2
+    assert create_faiss_vector_store(embedding, path=path).index.ntotal == 30
+
+
+def test_parse_persistence():
+    assert parse_persistence(None)["mode"] == "full"
+    assert parse_persistence("segments") == {
+        "mode": "segments",
+        "max_segments": None,
+        "background": False,
+    }
+    with pytest.raises(ValueError, match="Unsupported persistence mode"):
+        parse_persistence("append")
+    with pytest.raises(ValueError, match="Unsupported persistence options"):
+        parse_persistence({"mode": "segments", "segments": 3})
+    with pytest.raises(ValueError, match="requires persistence mode 'segments'"):
+        create_faiss_vector_store(
+            HashingEmbedding(dimension=8), path="unused"
+        ).compact()
@@ -0,0 +1,173 @@
+import asyncio
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.vector_store.data_saver_node import DataSaverNode
+from agentblock.vector_store.faiss_utils import create_faiss_vector_store
+from agentblock.vector_store.sharded_faiss import (
+    ShardedFAISS,
+    create_sharded_faiss_store,
+)
+from agentblock.vector_store.vector_store_reference import VectorStoreReference
+
+TEXTS = [f"w{i} w{i + 1} w{i % 7}" for i in range(60)]
+
+
+@pytest.fixture
+def embedding():
+    return HashingEmbedding(dimension=8, n_features=256)
+
+
+def test_hash_routing_spreads_documents(embedding):
+    vector_store = create_sharded_faiss_store(embedding, num_shards=4)
+    ids = vector_store.add_texts(TEXTS)
+
+    sizes = vector_store.shard_sizes()
+    assert sum(sizes) == len(TEXTS) and all(size > 0 for size in sizes)
+    # 같은 id는 항상 같은 샤드로 간다
+    assert all(vector_store.route(id_) == vector_store.route(id_) for id_ in ids)
+
+
+def test_merged_top_k_matches_single_store(embedding):
+    ids = [f"doc-{i}" for i in range(len(TEXTS))]
+    sharded = create_sharded_faiss_store(embedding, num_shards=3)
+    sharded.add_texts(TEXTS, ids=ids)
+    single = create_faiss_vector_store(embedding)
+    single.add_texts(TEXTS, ids=ids)
+
+    for query in ["w3 w4", "w10 w5", "w42"]:
+        expected = single.similarity_search_with_score(query, k=5)
+        actual = sharded.similarity_search_with_score(query, k=5)
+        assert [doc.id for doc, _ in actual] == [doc.id for doc, _ in expected]
+        np.testing.assert_allclose(
+            [s for _, s in actual], [s for _, s in expected], rtol=1e-5
+        )
+
+
+def test_metadata_routing_colocates_and_narrows_search(embedding):
+    vector_store = create_sharded_faiss_store(
+        embedding, num_shards=4, route_by="metadata", route_key="tenant"
+    )
+    metadatas = [{"tenant": f"t{i % 3}"} for i in range(len(TEXTS))]
+    vector_store.add_texts(TEXTS, metadatas)
+
+    tenant_shard = vector_store._route_value("t1")
+    assert vector_store.shard_sizes()[tenant_shard] >= len(TEXTS) // 3
+    assert vector_store._shards_for({"tenant": "t1"}) == [tenant_shard]
+    hits = vector_store.similarity_search("w4 w5", k=3, filter={"tenant": "t1"})
+    assert hits and all(doc.metadata["tenant"] == "t1" for doc in hits)
+
+    with pytest.raises(ValueError, match="has no metadata field 'tenant'"):
+        vector_store.add_texts(["no tenant"])
+    with pytest.raises(ValueError, match="requires 'route_key'"):
+        create_sharded_faiss_store(embedding, route_by="metadata")
+
+
+def test_save_load_roundtrip_and_layout_check(tmp_path, embedding):
+    path = str(tmp_path / "sharded")
+    vector_store = create_sharded_faiss_store(embedding, path=path, num_shards=2)
+    vector_store.add_texts(TEXTS)
+    vector_store.save()
+
+    loaded = create_sharded_faiss_store(embedding, path=path, num_shards=2)
+    assert loaded.shard_sizes() == vector_store.shard_sizes()
+    assert loaded.similarity_search(TEXTS[17], k=1)[0].page_content == TEXTS[17]
+
+    with pytest.raises(ValueError, match="was saved with"):
+        create_sharded_faiss_store(embedding, path=path, num_shards=3)
+
+
+def test_data_saver_and_delete(tmp_path, embedding):
+    docs = [Document(page_content=t, id=f"doc-{i}") for i, t in enumerate(TEXTS[:20])]
+    vectors = np.asarray(
+        embedding.embed_documents([d.page_content for d in docs]), np.float32
+    )
+    vector_store = create_sharded_faiss_store(
+        embedding, path=str(tmp_path / "s"), num_shards=3
+    )
+
+    node = DataSaverNode("saver", vector_store, ["embedded"], "result")
+    result = node.call_target_function({"embedded": (docs, vectors)})
+    assert result.value["num_docs"] == 20
+    assert sum(vector_store.shard_sizes()) == 20
+
+    vector_store.delete(["doc-3", "doc-11"])
+    assert sum(vector_store.shard_sizes()) == 18
+    with pytest.raises(ValueError, match="do not exist"):
+        vector_store.delete(["doc-3"])
+
+    asyncio.run(vector_store.aadd_texts(["async text"], ids=["doc-async"]))
+    assert vector_store.similarity_search("async text", k=1)[0].id == "doc-async"
+
+
+def test_ids_are_unique_across_shards(embedding):
+    vector_store = create_sharded_faiss_store(
+        embedding, num_shards=4, route_by="metadata", route_key="tenant"
+    )
+    vector_store.add_texts(["a"], [{"tenant": "t0"}], ids=["doc"])
+
+    # metadata 라우팅에서는 같은 id가 다른 샤드로 갈 수 있으므로 샤드에 보내기 전에 거부한다
+    with pytest.raises(ValueError, match="already exist"):
+        vector_store.add_texts(["b", "c"], [{"tenant": "t1"}] * 2, ids=["new", "doc"])
+    with pytest.raises(ValueError, match="Duplicate ids"):
+        vector_store.add_texts(["b", "c"], [{"tenant": "t1"}] * 2, ids=["x", "x"])
+    assert sum(vector_store.shard_sizes()) == 1
+
+    vector_store.add_texts(["b"], [{"tenant": "t1"}], ids=["new"])
+    assert sum(vector_store.shard_sizes()) == 2
+
+
+def test_failed_shard_rolls_back_other_shards(tmp_path, embedding):
+    vector_store = create_sharded_faiss_store(
+        embedding,
+        path=str(tmp_path / "s"),
+        num_shards=4,
+        route_by="metadata",
+        route_key="tenant",
+        docstore="sqlite",
+    )
+    tenant_a = "t0"
+    tenant_b = next(
+        f"t{i}"
+        for i in range(1, 20)
+        if vector_store._route_value(f"t{i}") != vector_store._route_value(tenant_a)
+    )
+
+    # tenant_b 샤드의 sqlite docstore가 JSON이 아닌 metadata를 거부한다
+    metadatas = [{"tenant": tenant_a}, {"tenant": tenant_b, "tags": {"x"}}]
+    with pytest.raises(ValueError, match="cannot be stored"):
+        vector_store.add_texts(["a", "b"], metadatas, ids=["doc-a", "doc-b"])
+    assert vector_store.shard_sizes() == [0, 0, 0, 0]
+
+    # 되돌린 id는 다시 추가할 수 있다
+    vector_store.add_texts(["a"], [{"tenant": tenant_a}], ids=["doc-a"])
+    assert vector_store.similarity_search("a", k=1)[0].id == "doc-a"
+
+
+def test_vector_store_reference_sharded_provider(tmp_path):
+    embedding = EmbeddingReference.from_yaml(
+        {"name": "emb", "config": {"provider": "hashing", "param": {"dimension": 8}}},
+        ".",
+        {},
+    ).build()
+    config = {
+        "name": "store",
+        "config": {
+            "provider": "sharded_faiss",
+            "param": {
+                "path": str(tmp_path / "store"),
+                "num_shards": 2,
+                "max_workers": 2,
+            },
+            "reference": {"embedding": "emb"},
+        },
+    }
+    vector_store = VectorStoreReference.from_yaml(
+        config, ".", {"emb": embedding}
+    ).build()
+    assert isinstance(vector_store, ShardedFAISS)
+    assert len(vector_store.shards) == 2 and vector_store.max_workers == 2
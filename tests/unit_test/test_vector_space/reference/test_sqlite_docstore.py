@@ -0,0 +1,163 @@
+import os
+import shutil
+
+import pytest
+from langchain_core.documents import Document
+
+from agentblock.embedding.hashing_embedding import HashingEmbedding
+from agentblock.embedding.embedding_reference import EmbeddingReference
+from agentblock.vector_store.data_saver_node import DataSaverNode
+from agentblock.vector_store.faiss_utils import create_faiss_vector_store
+from agentblock.vector_store.sqlite_docstore import SQLiteDocstore, parse_docstore
+from agentblock.vector_store.vector_store_reference import VectorStoreReference
+
+TEXTS = [f"w{i} w{i + 1} " + "x" * 200 for i in range(100)]
+
+
+@pytest.fixture
+def embedding():
+    return HashingEmbedding(dimension=8, n_features=256)
+
+
+def test_sqlite_docstore_roundtrip(tmp_path):
+    docstore = SQLiteDocstore(str(tmp_path / "docs.sqlite"))
+    docstore.add(
+        {"a": Document(page_content="alpha", metadata={"page": 1, "tags": ["x"]})}
+    )
+    docstore.add(
+        {"a": Document(page_content="alpha v2"), "b": Document(page_content="beta")}
+    )
+
+    assert len(docstore) == 2
+    assert docstore.search("a") == Document(id="a", page_content="alpha v2")
+    assert docstore.search("zz") == "ID zz not found."
+    docstore.delete(["a"])
+    assert docstore.search("a") == "ID a not found."
+    assert len(docstore) == 1
+    docstore.commit_deletes()
+    assert len(docstore) == 1
+
+
+def test_non_json_metadata_is_rejected(tmp_path, embedding):
+    docstore = SQLiteDocstore(str(tmp_path / "docs.sqlite"))
+    with pytest.raises(ValueError, match="Metadata of document 'a'"):
+        docstore.add({"a": Document(page_content="alpha", metadata={"at": {1, 2}})})
+    assert len(docstore) == 0
+
+    # 인덱스에도 벡터가 남지 않는다
+    vector_store = create_faiss_vector_store(
+        embedding, path=str(tmp_path / "store"), docstore="sqlite"
+    )
+    with pytest.raises(ValueError, match="cannot be stored in the sqlite docstore"):
+        vector_store.add_texts(["alpha"], metadatas=[{"at": object()}])
+    assert vector_store.index.ntotal == 0
+    assert vector_store.index_to_docstore_id == {}
+
+
+def test_store_keeps_text_on_disk(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(embedding, path=path, docstore="sqlite")
+    ids = vector_store.add_texts(
+        TEXTS, metadatas=[{"row": i} for i in range(len(TEXTS))]
+    )
+    vector_store.save()
+
+    # pickle에는 텍스트가 없다 (sqlite 경로 + id 매핑만)
+    assert os.path.getsize(os.path.join(path, "index.pkl")) < sum(map(len, TEXTS)) / 2
+    assert os.path.exists(os.path.join(path, "docstore.sqlite"))
+
+    loaded = create_faiss_vector_store(embedding, path=path)
+    assert isinstance(loaded.docstore, SQLiteDocstore)
+    hit = loaded.similarity_search(TEXTS[42], k=1)[0]
+    assert (hit.page_content, hit.metadata) == (TEXTS[42], {"row": 42})
+
+    loaded.delete([ids[0]])
+    loaded.save()
+    assert (
+        len(create_faiss_vector_store(embedding, path=path).docstore) == len(TEXTS) - 1
+    )
+
+
+@pytest.mark.parametrize("persistence", ["full", "segments"])
+def test_delete_reaches_sqlite_only_on_save(tmp_path, embedding, persistence):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, docstore="sqlite", persistence=persistence
+    )
+    ids = vector_store.add_texts(TEXTS[:5])
+    vector_store.save()
+
+    vector_store.delete([ids[0]])
+    assert vector_store.docstore.search(ids[0]) == f"ID {ids[0]} not found."
+    assert len(vector_store.docstore) == 4
+
+    # save 전에 종료된 경우: 디스크의 인덱스가 가리키는 문서가 모두 남아 있다
+    crashed = create_faiss_vector_store(embedding, path=path)
+    assert crashed.index.ntotal == 5
+    assert crashed.similarity_search(TEXTS[0], k=5)[-1].page_content in TEXTS
+
+    vector_store.save()
+    reloaded = create_faiss_vector_store(embedding, path=path)
+    assert reloaded.index.ntotal == len(reloaded.docstore) == 4
+    assert reloaded.docstore.search(ids[0]) == f"ID {ids[0]} not found."
+
+
+def test_moved_store_uses_its_own_sqlite_file(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(embedding, path=path, docstore="sqlite")
+    vector_store.add_texts(TEXTS[:5])
+    vector_store.save()
+    vector_store.docstore.close()
+
+    moved = str(tmp_path / "moved")
+    shutil.move(path, moved)
+    loaded = create_faiss_vector_store(embedding, path=moved)
+    assert loaded.docstore.path == os.path.join(moved, "docstore.sqlite")
+    assert loaded.similarity_search(TEXTS[3], k=1)[0].page_content == TEXTS[3]
+
+
+def test_sqlite_docstore_with_segments_and_mmap(tmp_path, embedding):
+    path = str(tmp_path / "store")
+    vector_store = create_faiss_vector_store(
+        embedding, path=path, docstore="sqlite", persistence="segments"
+    )
+    for start in range(0, 30, 10):
+        vector_store.add_texts(TEXTS[start : start + 10])
+        vector_store.save()
+    vector_store.compact()
+
+    replica = create_faiss_vector_store(embedding, path=path, read_only=True)
+    assert replica.index.ntotal == 30
+    assert replica.similarity_search(TEXTS[25], k=1)[0].page_content == TEXTS[25]
+
+
+def test_vector_store_reference_docstore_option(tmp_path):
+    embedding = EmbeddingReference.from_yaml(
+        {"name": "emb", "config": {"provider": "hashing", "param": {"dimension": 8}}},
+        ".",
+        {},
+    ).build()
+    config = {
+        "name": "store",
+        "config": {
+            "provider": "faiss",
+            "param": {
+                "path": str(tmp_path / "store"),
+                "docstore": {"type": "sqlite", "path": str(tmp_path / "docs.sqlite")},
+            },
+            "reference": {"embedding": "emb"},
+        },
+    }
+    vector_store = VectorStoreReference.from_yaml(
+        config, ".", {"emb": embedding}
+    ).build()
+    node = DataSaverNode("saver", vector_store, ["documents"], "result")
+    node.call_target_function(
+        {"documents": [Document(page_content=t) for t in TEXTS[:3]]}
+    )
+
+    assert vector_store.docstore.path == str(tmp_path / "docs.sqlite")
+    assert len(vector_store.docstore) == 3
+
+    with pytest.raises(ValueError, match="Unsupported docstore type"):
+        parse_docstore("redis")